@@ -0,0 +1,99 @@
+# benchmarks/bench_audit_log.py
+"""
+감사 로그 기록 비용 비교: 기존 동기 방식 vs 큐 기반 비동기 파이프라인
+
+- sync: 이벤트마다 hostname/cwd/env 조회 + json.dumps 후 FileHandler로 호출 스레드에서 기록 (기존 make_audit_log)
+- async: security_infra.audit_log (정적 컨텍스트 1회, 직렬화/기록은 리스너 스레드)
+- 호출자 기준 events/s, 호출 1건 지연(p50/p99, µs), 큐를 모두 비우는 데 걸린 시간(drain) 출력
+
+실행:
+    python benchmarks/bench_audit_log.py [--count 50000] [--fsync]
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from security_infra import audit_log
+
+
+def legacy_make_audit_log(event, **fields):
+    base = {
+        "event": event,
+        "timestamp": datetime.now().isoformat(),
+        "user": os.getenv("USER", "unknown"),
+        "hostname": socket.gethostname(),
+        "cwd": os.getcwd(),
+        "pid": os.getpid(),
+        "exec_id": os.environ.get("PS_EXEC_UUID", str(uuid.uuid4())),
+    }
+    base.update(fields)
+    return "[AUDIT] " + json.dumps(base, ensure_ascii=False)
+
+
+class FsyncFileHandler(logging.FileHandler):
+    """디스크 동기화까지 기다리는 환경(감사 로그 fsync 정책 등) 재현용"""
+
+    def flush(self):
+        super().flush()
+        if self.stream:
+            os.fsync(self.stream.fileno())
+
+
+def make_logger(name, path, fsync):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = (FsyncFileHandler if fsync else logging.FileHandler)(path)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+
+def run(mode, count, path, fsync):
+    logger = make_logger(f"bench-{mode}", path, fsync)
+    make = legacy_make_audit_log if mode == "sync" else audit_log.make_audit_log
+    if mode == "async":
+        audit_log.start_async(logger)
+    latencies = []
+    started = time.perf_counter()
+    for i in range(count):
+        t0 = time.perf_counter()
+        logger.info(make("set-permissions", service="vault", path=f"/opt/vault/data/{i}", mode="0640"))
+        latencies.append(time.perf_counter() - t0)
+    caller = time.perf_counter() - started
+    audit_log.stop_async()
+    total = time.perf_counter() - started
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+        h.close()
+    latencies.sort()
+    with open(path, encoding="utf-8") as f:
+        lines = sum(1 for _ in f)
+    if lines != count:
+        raise RuntimeError(f"{mode}: 기록된 줄 수 {lines} != {count}")
+    return caller, total, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감사 로그 동기 vs 비동기 기록 비용 비교")
+    parser.add_argument("--count", type=int, default=50_000, help="기록할 이벤트 수")
+    parser.add_argument("--fsync", action="store_true", help="레코드마다 fsync (느린 디스크/엄격한 감사 정책 재현)")
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'events':>9}{'caller s':>10}{'events/s':>12}{'p50 µs':>9}{'p99 µs':>9}{'total s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("sync", "async"):
+            caller, total, p50, p99 = run(mode, args.count, os.path.join(tmp, f"{mode}.log"), args.fsync)
+            print(f"{mode:<8}{args.count:>9}{caller:>10.2f}{args.count / caller:>12,.0f}"
+                  f"{p50 * 1e6:>9.1f}{p99 * 1e6:>9.1f}{total:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
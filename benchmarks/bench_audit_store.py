@@ -0,0 +1,72 @@
+# benchmarks/bench_audit_store.py
+"""
+감사 로그 이력 조회 비용: 전체 스캔(grep 방식) vs 사이드 인덱스 vs 파일 끝 역방향 읽기
+
+- 임시 install.log에 [AUDIT] 레코드 N건 생성 (실행 1건당 이벤트 4개, 50건마다 compose-실패)
+- 최초 인덱스 생성, 1000줄 추가 후 증분 갱신, exec_id/이벤트+기간 조회, --last 20 시간 출력
+
+실행:
+    python benchmarks/bench_audit_store.py [--records 500000]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from security_infra.audit_store import AuditIndex, parse_audit_line, tail_lines
+
+BASE = datetime(2026, 1, 1)
+
+
+def write_log(path, start, count):
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(start, start + count):
+            ts = BASE + timedelta(seconds=i * 10)
+            event = "compose-실패" if i % 50 == 0 else "compose-실행시도"
+            body = {"event": event, "timestamp": ts.isoformat(), "user": "infra", "hostname": "host",
+                    "pid": 1000 + i // 4, "exec_id": f"exec-{i // 4:08d}", "service": "vault"}
+            f.write(f"{ts:%Y-%m-%d %H:%M:%S},000 INFO [AUDIT] {json.dumps(body, ensure_ascii=False)}\n")
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label:<28}{(time.perf_counter() - started) * 1000:>10.1f} ms")
+    return result
+
+
+def scan(path, exec_id):
+    with open(path, encoding="utf-8") as f:
+        return [line for line in f if exec_id in line and (parse_audit_line(line) or {}).get("exec_id") == exec_id]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감사 로그 전체 스캔 vs 인덱스 조회 비교")
+    parser.add_argument("--records", type=int, default=500_000, help="생성할 감사 레코드 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "install.log")
+        write_log(path, 0, args.records)
+        print(f"log: {os.path.getsize(path) / 2 ** 20:.1f} MiB, {args.records:,} records")
+        target = f"exec-{args.records // 8:08d}"
+        week_ago = (BASE + timedelta(seconds=args.records * 10) - timedelta(days=7)).timestamp()
+
+        full = timed("full scan (exec_id)", lambda: scan(path, target))
+        with AuditIndex(path) as index:
+            timed("index build (first run)", index.update)
+            write_log(path, args.records, 1000)
+            timed("index update (+1000 lines)", index.update)
+            hits = timed("indexed query (exec_id)", lambda: index.query(exec_id=target))
+            timed("indexed query (실패, 7d)", lambda: index.query(event="compose-실패", since=week_ago))
+            if [h["line"] + "\n" for h in hits] != full:
+                raise RuntimeError("인덱스 조회 결과가 전체 스캔 결과와 다름")
+            print(f"{'index size':<28}{index.stats()['index_bytes'] / 2 ** 20:>10.1f} MiB")
+        timed("tail --last 20", lambda: tail_lines(path, 20))
+
+
+if __name__ == "__main__":
+    main()
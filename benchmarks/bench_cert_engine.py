@@ -0,0 +1,63 @@
+# benchmarks/bench_cert_engine.py
+"""
+인증서 생성 백엔드 비교: openssl 서브프로세스 vs native(cryptography)
+
+- 키 종류(rsa/ec/ed25519)별로 N개 인증서를 생성해 인증서당 평균 ms 출력
+- 서비스 경로는 건드리지 않고 임시 디렉토리에 생성
+
+실행:
+    python benchmarks/bench_cert_engine.py [--count 10] [--key-types rsa ec ed25519]
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from security_infra.generate_certificates import KEY_TYPES, make_san, openssl_generate_cert
+from security_infra.cert_engine import native_generate_cert
+
+BACKENDS = {
+    "openssl": openssl_generate_cert,
+    "native": native_generate_cert,
+}
+
+
+def bench(backend: str, key_type: str, count: int, workdir: Path):
+    generate = BACKENDS[backend]
+    samples = []
+    for i in range(count):
+        cert_dir = workdir / f"{backend}-{key_type}-{i}"
+        cn = f"bench{i}"
+        started = time.perf_counter()
+        ok = generate(cert_dir, cn, make_san(cn), 30, overwrite=True, service=cn, logger=lambda _: None, key_type=key_type)
+        samples.append(time.perf_counter() - started)
+        if not ok:
+            raise RuntimeError(f"{backend}/{key_type} 인증서 생성 실패")
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="openssl vs native 인증서 생성 비교")
+    parser.add_argument("--count", type=int, default=10, help="백엔드/키 종류별 생성 개수")
+    parser.add_argument("--key-types", nargs="+", default=list(KEY_TYPES), choices=KEY_TYPES)
+    args = parser.parse_args()
+
+    backends = [b for b in BACKENDS if b != "openssl" or shutil.which("openssl")]
+    print(f"{'backend':<10}{'key':<10}{'mean_ms':>10}{'p50_ms':>10}{'max_ms':>10}{'certs/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for key_type in args.key_types:
+            for backend in backends:
+                samples = bench(backend, key_type, args.count, Path(tmp))
+                mean = statistics.mean(samples)
+                print(
+                    f"{backend:<10}{key_type:<10}{mean * 1000:>10.1f}"
+                    f"{statistics.median(samples) * 1000:>10.1f}{max(samples) * 1000:>10.1f}"
+                    f"{1 / mean:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
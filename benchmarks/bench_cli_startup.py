@@ -0,0 +1,150 @@
+# benchmarks/bench_cli_startup.py
+"""
+CLI 서브커맨드별 콜드스타트 측정 (python -X importtime)
+
+- 각 서브커맨드를 `<cmd> --help`로 실행해 CLI 디스패치까지의 import 비용을 측정
+- 서브커맨드가 실제 실행될 때 지연 import되는 모듈 비용도 별도 기록
+- 무거운 모듈(requests/urllib3/dotenv/cryptography)이 디스패치 단계에서 import되거나
+  예산(--budget-ms)을 넘으면 종료코드 1 → 빌드 실패
+
+실행:
+    python benchmarks/bench_cli_startup.py [--budget-ms 400] [--json startup.json]
+"""
+
+import argparse
+import importlib.util
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+CLI_PATH = PROJECT_ROOT / "security-infra-cli.py"
+
+# 디스패치 단계에서 import되면 안 되는 모듈 (최상위 패키지명)
+FORBIDDEN_MODULES = ("requests", "urllib3", "dotenv", "cryptography")
+
+# 서브커맨드 → 실행 시 지연 import되는 모듈
+COMMAND_MODULES = {
+    "create-directories": "security_infra.create_directories",
+    "generate-certificates": "security_infra.generate_certificates",
+    "cert-status": "security_infra.cert_manifest",
+    "sync-templates": "security_infra.sync_templates",
+    "set-permissions": "security_infra.set_permissions",
+    "check-permissions": "security_infra.check_permissions",
+    "compose": "security_infra.compose_manager",
+    "logs": "security_infra.log_stream",
+    "tune-resources": "security_infra.resource_tuning",
+    "pseudonymize": "security_infra.pseudonymize_pipeline",
+    "vault-token-status": "security_infra.debug_vault_token",
+    "show-install-history": "security_infra.audit_store",
+    "auto-unseal": "security_infra.auto_unseal",
+}
+
+
+def load_cli_app():
+    spec = importlib.util.spec_from_file_location("security_infra_cli", CLI_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.app
+
+
+def list_subcommands():
+    """CLI에 등록된 서브커맨드명 목록"""
+    app = load_cli_app()
+    return [c.name or c.callback.__name__.replace("_", "-") for c in app.registered_commands]
+
+
+def parse_importtime(stderr: str):
+    """
+    `-X importtime` 출력 파싱 → (모듈별 self 시간[us] dict, 합계[us])
+    형식: "import time: self [us] | cumulative | imported package"
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, _cumulative, name = line[len("import time:"):].split("|", 2)
+            modules[name.strip()] = int(self_us.strip())
+        except ValueError:
+            continue
+    return modules, sum(modules.values())
+
+
+def measure_dispatch(subcommand: str, logfile: Path):
+    """`<subcommand> --help` 실행까지의 import 비용"""
+    cmd = [
+        sys.executable, "-X", "importtime", str(CLI_PATH),
+        "--project-logfile", str(logfile),
+        "--syslog", "/nonexistent/syslog",
+        subcommand, "--help",
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, cwd=PROJECT_ROOT)
+    modules, total_us = parse_importtime(result.stderr)
+    forbidden = sorted(
+        name for name in modules
+        if name.split(".")[0] in FORBIDDEN_MODULES
+    )
+    return {
+        "subcommand": subcommand,
+        "returncode": result.returncode,
+        "total_ms": round(total_us / 1000, 2),
+        "module_count": len(modules),
+        "forbidden": forbidden,
+    }
+
+
+def measure_module(module: str):
+    """서브커맨드 실행 시 지연 import되는 모듈의 단독 비용"""
+    cmd = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    result = subprocess.run(cmd, capture_output=True, text=True, cwd=PROJECT_ROOT)
+    _modules, total_us = parse_importtime(result.stderr)
+    return round(total_us / 1000, 2) if result.returncode == 0 else None
+
+
+def run(budget_ms: float):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        logfile = Path(tmp) / "install.log"
+        for sub in list_subcommands():
+            row = measure_dispatch(sub, logfile)
+            module = COMMAND_MODULES.get(sub)
+            row["module"] = module
+            row["module_ms"] = measure_module(module) if module else None
+            row["over_budget"] = row["total_ms"] > budget_ms
+            rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI 콜드스타트(import time) 측정")
+    parser.add_argument("--budget-ms", type=float, default=400.0, help="디스패치 import 예산(ms)")
+    parser.add_argument("--json", dest="json_path", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    rows = run(args.budget_ms)
+    print(f"{'subcommand':<24}{'dispatch_ms':>12}{'modules':>9}{'module_ms':>11}  status")
+    failed = False
+    for row in rows:
+        problems = []
+        if row["returncode"] != 0:
+            problems.append(f"exit={row['returncode']}")
+        if row["forbidden"]:
+            problems.append("forbidden=" + ",".join(row["forbidden"]))
+        if row["over_budget"]:
+            problems.append(f"budget>{args.budget_ms}ms")
+        failed = failed or bool(problems)
+        module_ms = "-" if row["module_ms"] is None else f"{row['module_ms']:.1f}"
+        print(
+            f"{row['subcommand']:<24}{row['total_ms']:>12.1f}{row['module_count']:>9}"
+            f"{module_ms:>11}  {'FAIL ' + ' '.join(problems) if problems else 'OK'}"
+        )
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(rows, ensure_ascii=False, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_ff3.py
+"""
+FF3-1 가명화 처리량 비교: 값마다 암호기 생성(기존 소비자 코드 방식) vs 배치 엔진
+
+- 8자리 환자번호 N개를 암호화해 values/s 출력
+- batch는 chunk 크기별로 측정 (라운드당 AES 호출 1번에 넣는 값 개수)
+
+실행:
+    python benchmarks/bench_ff3.py [--count 100000] [--chunks 1 256 4096]
+"""
+
+import argparse
+import random
+import time
+
+from security_infra.ff3_engine import FF3Cipher
+
+KEY = "2DE79D232DF5585D68CE47882AE256D6"
+TWEAK = "CBD09280979564"
+
+
+def per_value(values):
+    # 값마다 키 스케줄 확장 + 1건 처리
+    return [FF3Cipher(KEY, TWEAK).encrypt(v) for v in values]
+
+
+def batch(values, chunk):
+    return FF3Cipher(KEY, TWEAK, chunk_size=chunk).encrypt_batch(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FF3-1 값별 vs 배치 처리량 비교")
+    parser.add_argument("--count", type=int, default=100_000, help="암호화할 값 개수")
+    parser.add_argument("--chunks", type=int, nargs="+", default=[1, 256, 4096], help="배치 chunk 크기")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    values = [f"{rng.randrange(10 ** 8):08d}" for _ in range(args.count)]
+    print(f"{'mode':<16}{'values':>10}{'seconds':>10}{'values/s':>14}")
+
+    naive_n = min(args.count, 20_000)
+    started = time.perf_counter()
+    expected = per_value(values[:naive_n])
+    elapsed = time.perf_counter() - started
+    print(f"{'per-value':<16}{naive_n:>10}{elapsed:>10.2f}{naive_n / elapsed:>14,.0f}")
+
+    for chunk in args.chunks:
+        started = time.perf_counter()
+        out = batch(values, chunk)
+        elapsed = time.perf_counter() - started
+        if out[:naive_n] != expected:
+            raise RuntimeError("배치 결과가 값별 결과와 다름")
+        print(f"{f'batch({chunk})':<16}{args.count:>10}{elapsed:>10.2f}{args.count / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+# Transit 가명화 전용 (키 원문 조회/내보내기 불가, 암호화/HMAC 요청만 가능)
+path "transit/encrypt/pseudonymize" {
+  capabilities = ["update"]
+}
+
+# 단방향 가명 (mode=hmac)
+path "transit/hmac/pseudonymize" {
+  capabilities = ["update"]
+}
+
+# 가명 → 원본 복원은 별도 역할에만 부여 (재식별 권한 분리)
+# path "transit/decrypt/pseudonymize" {
+#   capabilities = ["update"]
+# }
@@ -5,8 +5,6 @@ from pathlib import Path
 import logging
 import logging.handlers
 import os
-import socket
-from datetime import datetime
 import uuid
 import json
 from typing import List
@@ -14,40 +12,30 @@ from typing import List
 
 # config_loader는 기존과 동일하게 유지
 from security_infra.config_loader import load_config, get_mode, get_log_level
-from security_infra.create_directories import create_directories
-from security_infra.generate_certificates import generate_certificates
-from security_infra.sync_templates import sync_templates
-from security_infra.set_permissions import set_permissions
-from security_infra.compose_manager import compose_command
-from security_infra.auto_unseal import auto_unseal
+# 감사 로그: 정적 컨텍스트 1회 계산 + 큐 기반 비동기 기록
+from security_infra.audit_log import AuditQueueHandler, flush_async, make_audit_log, set_exec_id, start_async
+# 명령 모듈(requests/urllib3/dotenv 등 무거운 의존성)은 각 서브커맨드 안에서 지연 import
+# → cron/systemd/헬스체크에서 호출되는 `compose ps` 등의 콜드스타트 최소화
+# (측정: python benchmarks/bench_cli_startup.py)
 
 
 app = typer.Typer()
 
 # [1] 항상 프로젝트 root 기준
 PROJECT_ROOT = Path(__file__).resolve().parent
-
-# 감사/보안 로그 포맷 (구조화, 사용자/호스트/PID 등 포함)
-def make_audit_log(event, **fields):
-    base = {
-        "event": event,
-        "timestamp": datetime.now().isoformat(),
-        "user": os.getenv("USER", "unknown"),
-        "hostname": socket.gethostname(),
-        "cwd": os.getcwd(),
-        "pid": os.getpid(),
-        "exec_id": os.environ.get("PS_EXEC_UUID", str(uuid.uuid4())),
-    }
-    base.update(fields)
-    return "[AUDIT] " + json.dumps(base, ensure_ascii=False)
+# 현재 실행의 감사 로그 파일 (--project-logfile, show-install-history 기본 대상)
+audit_log_path = PROJECT_ROOT / "logs/install.log"
 
 def get_dual_logger(
     project_logfile=PROJECT_ROOT / "logs/install.log",
     syslog_address="/dev/log",
-    logger_name="infra_install"
+    logger_name="infra_install",
+    async_write=True,
 ):
     logger = logging.getLogger(logger_name)
     logger.setLevel(logging.INFO)
+    if any(isinstance(h, AuditQueueHandler) for h in logger.handlers):
+        return logger
     formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
     # 프로젝트 로그 (FileHandler)
     if not any(isinstance(h, logging.FileHandler) for h in logger.handlers):
@@ -63,6 +51,9 @@ def get_dual_logger(
             logger.addHandler(sh)
         except Exception as e:
             logger.error(f"SysLogHandler 등록 실패: {e}")
+    # 파일/syslog 기록과 감사 로그 직렬화는 백그라운드 스레드에서 (종료 시 atexit로 모두 기록)
+    if async_write:
+        start_async(logger)
     return logger
 
 @app.callback()
@@ -77,13 +68,14 @@ def main(
     """
     # 매 실행마다 실행UUID 설정
     exec_id = str(uuid.uuid4())
-    os.environ["PS_EXEC_UUID"] = exec_id
+    set_exec_id(exec_id)
     cfg = load_config()
     effective_mode = mode if mode else get_mode(cfg)
     effective_log_level = log_level if log_level else get_log_level(cfg)
     # 경로 처리 (옵션이 없으면 프로젝트 내 logs/install.log)
     log_path = Path(project_logfile) if project_logfile else (PROJECT_ROOT / "logs/install.log")
-    global logger
+    global logger, audit_log_path
+    audit_log_path = log_path
     logger = get_dual_logger(log_path, syslog)
     logger.setLevel(getattr(logging, effective_log_level, logging.INFO))
     logger.info(make_audit_log(
@@ -93,7 +85,8 @@ def main(
         user=os.getenv("USER"),
         exec_id=exec_id
     ))
-    typer.echo(f"[INFO] 모드={effective_mode}, 로그레벨={effective_log_level}, 실행ID={exec_id}")
+    # 상태 메시지는 stderr → stdout은 JSON 출력 명령(cert-status --json, check-permissions 등)용으로 유지
+    typer.echo(f"[INFO] 모드={effective_mode}, 로그레벨={effective_log_level}, 실행ID={exec_id}", err=True)
 
 @app.command("create-directories")
 def create_directories_cmd(
@@ -101,6 +94,7 @@ def create_directories_cmd(
     force: bool = typer.Option(False, help="강제 삭제 후 재생성"),
 ):
     """필수 인프라 디렉터리 생성"""
+    from security_infra.create_directories import create_directories
     summary = create_directories(base_dir=base_dir, force=force, logger=logger.info)
     typer.echo(summary)
     
@@ -108,22 +102,81 @@ def create_directories_cmd(
 @app.command("generate-certificates")
 def generate_certificates_cmd(
     services: List[str] = typer.Option(
-        ["vault", "elk", "keycloak"],
-        help="인증서 생성할 서비스(여러 개 선택 가능, 기본: 전체)"
+        None,
+        help="인증서 생성할 서비스(여러 개 선택 가능, 기본: vault, elk, keycloak / --ca 모드는 전체)"
     ),
     days: int = typer.Option(730, help="유효기간(일수)"),
     overwrite: bool = typer.Option(False, "--overwrite", help="기존 인증서 강제 덮어쓰기"),
-    extra_san: List[str] = typer.Option(None, help="추가 SAN(DNS:xxx, IP:yyy 형식, 여러개 입력 가능)")
+    extra_san: List[str] = typer.Option(None, help="추가 SAN(DNS:xxx, IP:yyy 형식, 여러개 입력 가능)"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="동시 생성 작업 수(프로세스 풀, 0=CPU 수)"),
+    backend: str = typer.Option("openssl", "--backend", help="openssl(서브프로세스)|native(cryptography)"),
+    key_type: str = typer.Option(None, "--key-type", help="rsa|ec(P-256)|ed25519 (기본: rsa, --ca 모드는 ec)"),
+    ca: bool = typer.Option(False, "--ca", help="로컬 Root/Intermediate CA 생성 후 leaf 인증서 일괄 발급"),
+    ca_days: int = typer.Option(3650, "--ca-days", help="로컬 CA 유효기간(일수, CA 최초 생성 시)"),
+    hosts: List[str] = typer.Option(None, "--host", help="--ca 모드: 호스트별 leaf 추가 발급(docker/ca/hosts/, 여러개 입력 가능)"),
+    renew_before: int = typer.Option(30, "--renew-before", help="만료 N일 이내 인증서 재발급"),
 ):
-    summary = generate_certificates(services, days, overwrite, extra_san, logger=logger.info)
+    from security_infra.generate_certificates import generate_certificates
+    try:
+        summary = generate_certificates(
+            services, days, overwrite, extra_san, logger=logger.info,
+            jobs=jobs, backend=backend, key_type=key_type,
+            ca=ca, ca_days=ca_days, hosts=hosts, renew_before_days=renew_before,
+        )
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(1)
     typer.echo(summary)
     
 
+@app.command("cert-status")
+def cert_status_cmd(
+    renew_before: int = typer.Option(30, "--renew-before", help="만료 N일 이내를 EXPIRING으로 표시"),
+    as_json: bool = typer.Option(False, "--json", help="JSON으로 출력"),
+):
+    """인증서 매니페스트(docker/certs.json) 기준 상태 조회 (PEM 파싱 없음, 이상 시 종료코드 1)"""
+    from security_infra.cert_manifest import cert_status, format_cert_status
+    rows = cert_status(renew_before_days=renew_before)
+    if as_json:
+        typer.echo(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        typer.echo(format_cert_status(rows))
+    if any(row["status"] != "OK" for row in rows):
+        raise typer.Exit(1)
+
 @app.command("sync-templates")
-def sync_templates_cmd():
-    """템플릿(config) 복사만 수행 (권한/퍼미션은 별도 명령)"""
-    summary = sync_templates(logger=logger.info)
-    typer.echo(summary)
+def sync_templates_cmd(
+    force: bool = typer.Option(False, "--force", help="내용 해시와 무관하게 전체 복사"),
+    as_json: bool = typer.Option(False, "--json", help="결과(복사/유지/실패/재시작 대상 서비스)를 JSON으로 출력"),
+    var: List[str] = typer.Option(None, "--var", help="렌더링 변수 덮어쓰기 (이름=값, 여러 번 지정 가능)"),
+    watch: bool = typer.Option(False, "--watch", help="templates/ 변경 감시 후 바뀐 파일만 즉시 반영 (Ctrl+C 종료)"),
+    polling: bool = typer.Option(False, "--polling", help="--watch에서 inotify 대신 stat 폴링 사용"),
+    debounce_ms: int = typer.Option(100, "--debounce-ms", help="--watch 연속 저장 묶음 대기시간(ms)"),
+    reload: bool = typer.Option(False, "--reload", help="--watch 반영 후 해당 컨테이너에 리로드 시그널(SIGHUP) 전송"),
+):
+    """템플릿(config) 렌더링/복사만 수행 (권한/퍼미션은 별도 명령), 결과가 바뀐 파일만 복사"""
+    from security_infra.sync_templates import format_sync_summary, sync_template_files
+    from security_infra.template_engine import parse_var_overrides, template_variables
+    try:
+        variables = {**template_variables(), **parse_var_overrides(var or [])}
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(1)
+    result = sync_template_files(logger=logger.info, force=force, variables=variables)
+    if watch:
+        from security_infra.template_watch import watch_templates
+        typer.echo(format_sync_summary(result))
+        reload_fn = None
+        if reload:
+            from security_infra.compose_manager import reload_service
+            reload_fn = lambda service: reload_service(service, logger=typer.echo)
+        watch_templates(logger=typer.echo, debounce=debounce_ms / 1000, polling=polling,
+                        variables=variables, reload=reload_fn)
+        return
+    if as_json:
+        typer.echo(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        typer.echo(format_sync_summary(result))
     
 @app.command("set-permissions")
 def set_permissions_cmd(
@@ -139,36 +192,286 @@ def set_permissions_cmd(
     서비스별 볼륨/인증서 디렉토리 권한을 일괄 변경
     (ELK, Vault, Bitwarden 등, 필요시 --services로 개별 선택)
     """
-    summary = set_permissions(services, logger=print)
+    from security_infra.set_permissions import set_permissions
+    summary = set_permissions(services=services, logger=print)
     typer.echo(summary) 
 
+@app.command("check-permissions")
+def check_permissions_cmd(
+    services: List[str] = typer.Option(
+        None,
+        "--services",
+        "-s",
+        help="점검할 서비스명(예: vault, elk), 여러 개 반복 지정 가능",
+        show_default=False,
+    ),
+    workers: int = typer.Option(8, "--workers", "-w", help="트리 순회 스레드 수"),
+    recursive: bool = typer.Option(False, "--recursive", "-r", help="recursive 설정이 없는 디렉토리도 하위 전체 점검"),
+):
+    """
+    permissions.yml 대비 소유자/모드 드리프트 점검 (읽기 전용)
+    드리프트 레코드(path, expected, actual)는 stdout에 JSON lines로 스트리밍, 요약은 stderr
+    """
+    from security_infra.check_permissions import check_permissions
+    stats = check_permissions(
+        services=services, workers=workers, recursive=recursive,
+        logger=lambda msg: typer.echo(msg, err=True),
+    )
+    typer.echo(
+        f"[점검 완료] 경로 {stats['scanned']}, 드리프트 {stats['drift']}, 오류 {stats['errors']}",
+        err=True,
+    )
+    if stats["drift"] or stats["errors"]:
+        raise typer.Exit(1)
+
 @app.command("compose")
 def compose_cmd(
-    action: str = typer.Argument(..., help="up|down|restart|logs|ps"),
-    service: str = typer.Option("all", help="all|vault|elk|keycloak|openldap")
+    action: str = typer.Argument(..., help="up|down|restart|reconcile|logs|ps|status|health"),
+    service: str = typer.Option("all", help="all|vault|elk|keycloak|openldap"),
+    as_json: bool = typer.Option(False, "--json", help="ps/status/health/up 결과를 JSON으로 출력"),
+    orchestrate: bool = typer.Option(True, "--orchestrate/--plain", help="up: 의존성 순서 병렬 기동 + 헬스 대기 (--plain: docker compose up -d 1회)"),
+    timeout: float = typer.Option(600.0, "--timeout", help="up: 서비스당 준비(healthy) 대기 한도(초)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="reconcile: 조치 계획만 출력 (재시작/기록 없음)"),
 ):
+    from security_infra.compose_manager import compose_command, format_container_table
     compose_file = PROJECT_ROOT / "docker-compose.yml"
     try:
         result = compose_command(
             action, service, compose_file,
-            logger=logger, make_audit_log=make_audit_log
+            logger=logger, make_audit_log=make_audit_log,
+            orchestrate=orchestrate, timeout=timeout, dry_run=dry_run,
         )
+    except Exception as e:
+        typer.echo(str(e))
+        raise typer.Exit(1)
+    if isinstance(result, list):
+        if as_json:
+            typer.echo(json.dumps(result, ensure_ascii=False, indent=2))
+        elif action == "up":
+            from security_infra.compose_orchestrator import format_timeline
+            typer.echo(format_timeline(result))
+        elif action == "reconcile":
+            from security_infra.compose_reconcile import format_reconcile
+            typer.echo(format_reconcile(result, dry_run=dry_run))
+        else:
+            typer.echo(format_container_table(result))
+        if action in ("up", "reconcile") and any(row["status"] not in ("OK", "") for row in result):
+            raise typer.Exit(1)
+    else:
         typer.echo(result)
+
+@app.command("logs")
+def logs_cmd(
+    service: str = typer.Option("all", help="all|vault|elk|keycloak|openldap"),
+    follow: bool = typer.Option(False, "--follow", "-f", help="새 로그 계속 출력 (Ctrl+C 종료)"),
+    tail: int = typer.Option(None, "--tail", help="컨테이너별 마지막 N줄부터"),
+    since: str = typer.Option(None, "--since", help="시작 시각 (10m, 2h, 1d 또는 ISO-8601)"),
+    until: str = typer.Option(None, "--until", help="종료 시각 (10m, 2h, 1d 또는 ISO-8601)"),
+    grep: str = typer.Option(None, "--grep", "-g", help="메시지 정규식 필터"),
+    level: str = typer.Option(None, "--level", help="최소 레벨 (trace|debug|info|warn|error|fatal)"),
+    as_json: bool = typer.Option(False, "--json", help="JSON lines 출력 (ts/service/container/stream/level/message)"),
+):
+    """서비스 컨테이너 로그를 타임스탬프 순으로 병합해 필터링 출력 (Docker Engine API)"""
+    import re
+    import sys
+    from security_infra import docker_api
+    from security_infra.compose_manager import SERVICE_MAP, service_containers
+    from security_infra.log_stream import (
+        LogFilter, line_emitter, parse_time_arg, record_json, record_text, stream_logs,
+    )
+    if service not in SERVICE_MAP:
+        typer.echo(f"[ERROR] 지원하지 않는 서비스: {service}")
+        raise typer.Exit(1)
+    if follow and until:
+        typer.echo("[ERROR] --follow와 --until은 함께 사용할 수 없습니다 (follow는 종료 시각 없이 계속 출력)")
+        raise typer.Exit(1)
+    if not docker_api.socket_accessible():
+        typer.echo(f"[ERROR] Docker 소켓 접근 불가: {docker_api.default_socket_path()} (docker 그룹 또는 DOCKER_HOST 확인)")
+        raise typer.Exit(1)
+    try:
+        since_ts, until_ts = parse_time_arg(since), parse_time_arg(until)
+        log_filter = LogFilter(grep, level, since_ts, until_ts)
+    except (ValueError, re.error) as e:
+        typer.echo(str(e))
+        raise typer.Exit(1)
+    emit = line_emitter(record_json if as_json else record_text)
+    with docker_api.DockerClient() as client:
+        rows = service_containers(client, service, PROJECT_ROOT / "docker-compose.yml")
+        if not rows:
+            typer.echo("[INFO] 로그를 읽을 컨테이너가 없습니다.", err=True)
+            return
+        try:
+            stats = stream_logs(client, rows, log_filter, emit, follow=follow, tail=tail,
+                                since=since_ts, until=until_ts)
+        except (KeyboardInterrupt, BrokenPipeError):
+            sys.stderr.flush()
+            return
+    typer.echo(f"[INFO] 컨테이너 {len(rows)}개, 읽음 {stats['read']}줄, 출력 {stats['emitted']}줄", err=True)
+
+@app.command("tune-resources")
+def tune_resources_cmd(
+    reserve_mb: int = typer.Option(None, "--reserve-mb", help="OS/기타 프로세스 예약 메모리(MiB, 기본: max(1024, 전체의 10%))"),
+    env_file: Path = typer.Option(PROJECT_ROOT / ".env", "--env-file", help="갱신할 .env 경로"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="산정 결과만 출력 (.env 기록 안 함)"),
+    as_json: bool = typer.Option(False, "--json", help="산정 결과를 JSON으로 출력"),
+):
+    """호스트 메모리/cgroup/CPU 기준 JVM 힙·메모리 한도 산정 후 .env 기록 (compose up 전 실행)"""
+    from security_infra.resource_tuning import format_plan, host_resources, plan_resources, write_env
+    plan = plan_resources(host_resources(), reserve_mib=reserve_mb)
+    typer.echo(json.dumps(plan, ensure_ascii=False, indent=2) if as_json else format_plan(plan))
+    if dry_run:
+        return
+    changed = write_env(env_file, plan["env"])
+    logger.info(make_audit_log("tune-resources", env_file=str(env_file), changed={k: plan["env"][k] for k in changed}))
+    if changed:
+        typer.echo(f"[OK] {env_file} 갱신: {', '.join(changed)}", err=as_json)
+    else:
+        typer.echo(f"[SKIP] {env_file} 변경 없음", err=as_json)
+
+@app.command("pseudonymize")
+def pseudonymize_cmd(
+    input_path: Path = typer.Argument(..., help="입력 CSV/JSONL 파일"),
+    output_path: Path = typer.Argument(..., help="출력 파일 (체크포인트: <출력>.ckpt.json)"),
+    column: List[str] = typer.Option(..., "--column", "-c", help="가명화할 컬럼(CSV 헤더명/JSON 키), 여러 번 지정 가능"),
+    fmt: str = typer.Option(None, "--format", help="csv|jsonl (기본: 확장자로 판단)"),
+    workers: int = typer.Option(None, "--workers", help="워커 프로세스 수 (기본: CPU 수, 0=단일 프로세스)"),
+    chunk_rows: int = typer.Option(10000, "--chunk-rows", help="청크당 레코드 수"),
+    resume: bool = typer.Option(False, "--resume", help="체크포인트 위치부터 이어서 처리"),
+    on_invalid: str = typer.Option("fail", "--on-invalid", help="FF3-1 처리 불가 값: fail|keep|blank"),
+    delimiter: str = typer.Option(",", "--delimiter", help="CSV 구분자"),
+    alphabet: str = typer.Option("0123456789", "--alphabet", help="값 문자 집합 (radix)"),
+    decrypt: bool = typer.Option(False, "--decrypt", help="가명 → 원본 복원 (권한 있는 역할만)"),
+    backend: str = typer.Option("ff3", "--backend", help="ff3(키를 Vault에서 조회해 로컬 암호화) | transit(Vault Transit 배치 요청)"),
+    transit_key: str = typer.Option("pseudonymize", "--transit-key", help="Transit 키 이름"),
+    transit_mode: str = typer.Option("encrypt", "--transit-mode", help="encrypt(수렴 암호화, 복원 가능) | hmac(단방향)"),
+    vault_addr: str = typer.Option("https://127.0.0.1:8200", help="Vault API 주소"),
+    token_path: str = typer.Option("/etc/vault-agent/vault-token", help="Vault Agent 토큰 파일"),
+    as_json: bool = typer.Option(False, "--json", help="처리 결과(rows/s, bytes/s 등)를 JSON으로 출력"),
+):
+    """CSV/JSONL 파일의 지정 컬럼을 FF3-1 또는 Vault Transit으로 가명화 (스트리밍, 순서 유지, 중단 시 --resume)"""
+    import functools
+    import time
+    from security_infra.pseudonymize_pipeline import format_stats, pseudonymize_file
+    try:
+        if backend == "transit":
+            # 키는 Vault 밖으로 나오지 않음, 배치 동시 전송은 엔진 내부 스레드가 담당
+            from security_infra.transit_engine import TransitEngine
+            factory = functools.partial(TransitEngine, vault_addr, token_path, key_name=transit_key, mode=transit_mode)
+            factory().close()
+            if workers is None:
+                workers = 0
+        elif backend == "ff3":
+            from security_infra.ff3_engine import FF3Cipher
+            from security_infra.pseudonymize_vault_reader import PseudonymizeKeyClient
+            # 키는 Vault에서 1회만 조회해 워커 초기화에 전달
+            with PseudonymizeKeyClient(vault_addr, token_path) as client:
+                key, tweak = client.get_keys()
+            factory = functools.partial(FF3Cipher, key, tweak, alphabet)
+            factory()
+        else:
+            raise ValueError(f"[ERROR] 지원하지 않는 backend: {backend} (ff3|transit)")
     except Exception as e:
+        typer.echo(f"[ERROR] 가명화 엔진 준비 실패: {e}")
+        raise typer.Exit(1)
+    last = [time.monotonic()]
+
+    def progress(stats):
+        if time.monotonic() - last[0] >= 5:
+            last[0] = time.monotonic()
+            typer.echo(f"[INFO] 진행: {format_stats(stats)}", err=True)
+
+    try:
+        stats = pseudonymize_file(
+            input_path, output_path, column, factory, fmt=fmt, operation="decrypt" if decrypt else "encrypt",
+            workers=workers, chunk_rows=chunk_rows, resume=resume, on_invalid=on_invalid,
+            delimiter=delimiter, progress=progress,
+        )
+    except (ValueError, RuntimeError) as e:      # RuntimeError: VaultError/TransitError (transit 백엔드)
         typer.echo(str(e))
         raise typer.Exit(1)
+    logger.info(make_audit_log("pseudonymize", input=str(input_path), output=str(output_path),
+                               columns=column, decrypt=decrypt, backend=backend, rows=stats["rows"]))
+    typer.echo(json.dumps(stats, ensure_ascii=False, indent=2) if as_json else f"[OK] {format_stats(stats)}")
 
-    
+@app.command("vault-token-status")
+def vault_token_status_cmd(
+    vault_addr: str = typer.Option("https://127.0.0.1:8200", help="Vault API 주소"),
+    token_path: str = typer.Option("/etc/vault-agent/vault-token", help="Vault Agent 토큰 파일"),
+    min_ttl: int = typer.Option(60, "--min-ttl", help="남은 TTL이 이보다 짧으면 비정상(종료코드 1)"),
+):
+    """Vault Agent 토큰 상태(TTL, renewable, policies)를 JSON으로 출력 (lookup-self 1회, 결과는 실행 간 5초 캐시, 모니터링용)"""
+    from security_infra.debug_vault_token import status_state_file, token_status
+    status = token_status(vault_addr, token_path, min_ttl=min_ttl,
+                          state_file=status_state_file(vault_addr, token_path))
+    typer.echo(json.dumps(status, ensure_ascii=False, indent=2))
+    if not status["healthy"]:
+        raise typer.Exit(1)
+
+@app.command("show-install-history")
+def show_install_history_cmd(
+    project_logfile: str = typer.Option(None, "--project-logfile", help="감사 로그 파일 (기본: 현재 실행의 로그 파일)"),
+    last: int = typer.Option(None, "--last", help="최근 N건 (필터가 없으면 파일 끝에서 N줄, 기본 20)"),
+    exec_id: str = typer.Option(None, "--exec-id", help="실행ID"),
+    event: str = typer.Option(None, "--event", help="이벤트명 (예: compose-실패, 'compose-*')"),
+    since: str = typer.Option(None, "--since", help="시작 시각 (10m, 7d, ISO-8601)"),
+    until: str = typer.Option(None, "--until", help="종료 시각 (10m, 7d, ISO-8601)"),
+    as_json: bool = typer.Option(False, "--json", help="감사 레코드를 JSON Lines로 출력"),
+):
+    """감사 로그 이력 조회 (사이드 인덱스 사용, 전체 파일을 처음부터 읽지 않음)"""
+    from security_infra.audit_store import AuditIndex, parse_audit_line, tail_lines
+    from security_infra.log_stream import parse_time_arg
+    path = Path(project_logfile) if project_logfile else audit_log_path
+    flush_async()
+    if not path.exists():
+        typer.echo(f"[ERROR] 로그 파일이 없습니다. ({path})")
+        raise typer.Exit(1)
+    try:
+        since_ts, until_ts = parse_time_arg(since), parse_time_arg(until)
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(1)
+    if not (exec_id or event or since or until):
+        # 필터 없음: 인덱스 없이 파일 끝에서 N줄
+        lines = tail_lines(path, last or 20)
+        rows = [{"line": line, "record": parse_audit_line(line)} for line in lines]
+    else:
+        with AuditIndex(path) as index:
+            index.update()
+            rows = index.query(exec_id=exec_id, event=event, since=since_ts, until=until_ts, last=last)
+    if as_json:
+        for row in rows:
+            typer.echo(json.dumps(row["record"] or {"line": row["line"]}, ensure_ascii=False))
+        return
+    typer.echo(f"--- {path} ({len(rows)}건) ---")
+    for row in rows:
+        typer.echo(row["line"])
 
 @app.command("auto-unseal")
 def auto_unseal_cmd(
     bw_item: str = typer.Option("vault unseal key - desktop", help="Bitwarden 항목명"),
-    vault_addr: str = typer.Option("https://127.0.0.1:8200", help="Vault API 주소")
+    vault_addr: str = typer.Option("https://127.0.0.1:8200", help="Vault API 주소"),
+    concurrent: bool = typer.Option(False, "--concurrent", help="계정별 격리 환경에서 병렬 조회, 언실 즉시 나머지 취소"),
+    workers: int = typer.Option(0, "--workers", help="동시 조회 계정 수 (0=전체)"),
+    daemon: bool = typer.Option(False, "--daemon", help="seal-status를 주기적으로 확인해 봉인 시 자동 언실 (상주)"),
+    interval: float = typer.Option(5.0, "--interval", help="데몬 기본 폴링 간격(초)"),
+    max_interval: float = typer.Option(60.0, "--max-interval", help="언실 상태 유지 시 최대 폴링 간격(초)"),
+    retry_max_interval: float = typer.Option(600.0, "--retry-max-interval", help="언실 연속 실패 시 최대 재시도 간격(초)"),
 ):
     """
     Bitwarden에서 Unseal Key를 자동으로 추출해 Vault 언실 처리
     """
-    auto_unseal(bw_item=bw_item, vault_addr=vault_addr, logger=print)
+    if daemon:
+        import signal
+        import threading
+        from security_infra.auto_unseal import unseal_daemon
+        stop = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+        unseal_daemon(vault_addr=vault_addr, logger=typer.echo, interval=interval, max_interval=max_interval,
+                      retry_max_interval=retry_max_interval, workers=workers or None, stop=stop, bw_item=bw_item)
+        return
+    from security_infra.auto_unseal import auto_unseal
+    auto_unseal(bw_item=bw_item, vault_addr=vault_addr, logger=print, concurrent=concurrent, workers=workers or None)
 
 if __name__ == "__main__":
     app()
@@ -11,6 +11,7 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "typer>=0.9",
+        "cryptography>=42",
         # 여기에 추가 패키지 기입
     ],
     extras_require={
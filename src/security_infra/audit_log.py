@@ -0,0 +1,155 @@
+# src/security_infra/audit_log.py
+"""
+감사 로그 비동기 파이프라인 (호출 스레드에서는 큐에 넣기만 함)
+- make_audit_log(): 이벤트/필드/시각만 담은 AuditRecord 반환, JSON 직렬화는 핸들러가 str()할 때 1번
+- 정적 컨텍스트(user/hostname/cwd/pid/exec_id)는 프로세스당 1번만 계산 (fork 후 자식에서 재계산)
+- start_async(): 로거의 File/SysLog 핸들러를 QueueListener 백그라운드 스레드로 옮김
+  → 파일 기록/syslog 전송/직렬화가 긴 작업(compose logs, 권한 설정 등)을 막지 않음
+- 종료 시 atexit에서 큐를 끝까지 비우고 핸들러 flush
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+_context: Optional[dict] = None
+_context_lock = threading.Lock()
+_listeners: List[tuple] = []          # (logger, 큐 핸들러, 리스너)
+_atexit_registered = False
+
+def _build_context() -> dict:
+    exec_id = os.environ.get("PS_EXEC_UUID")
+    if not exec_id:
+        # 실행ID가 없으면 프로세스당 1개 생성 (하위 프로세스도 같은 ID 사용)
+        exec_id = os.environ["PS_EXEC_UUID"] = str(uuid.uuid4())
+    return {
+        "user": os.getenv("USER", "unknown"),
+        "hostname": socket.gethostname(),
+        "cwd": os.getcwd(),
+        "pid": os.getpid(),
+        "exec_id": exec_id,
+    }
+
+def audit_context() -> dict:
+    global _context
+    context = _context
+    if context is None:
+        with _context_lock:
+            if _context is None:
+                _context = _build_context()
+            context = _context
+    return context
+
+def reset_context():
+    global _context
+    _context = None
+
+def set_exec_id(exec_id: str):
+    """실행ID 변경 (CLI 시작 시 1회) → 이후 이벤트부터 반영"""
+    os.environ["PS_EXEC_UUID"] = exec_id
+    reset_context()
+
+class AuditRecord:
+    """
+    감사 이벤트 1건 (str() 시 "[AUDIT] {json}", 결과는 캐시 → File/SysLog 핸들러가 같은 문자열 공유)
+    필드 값은 백그라운드에서 직렬화되므로 기록 후 변경하지 않는 값을 넘길 것
+    """
+
+    __slots__ = ("event", "fields", "created", "context", "_text")
+
+    def __init__(self, event, fields: dict):
+        self.event = event
+        self.fields = fields
+        self.created = time.time()
+        self.context = audit_context()
+        self._text: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        base = {"event": self.event, "timestamp": datetime.fromtimestamp(self.created).isoformat()}
+        base.update(self.context)
+        base.update(self.fields)
+        return base
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = "[AUDIT] " + json.dumps(self.to_dict(), ensure_ascii=False, default=str)
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"AuditRecord({self.event!r})"
+
+# 감사/보안 로그 포맷 (구조화, 사용자/호스트/PID 등 포함)
+def make_audit_log(event, **fields) -> AuditRecord:
+    return AuditRecord(event, fields)
+
+class AuditQueueHandler(logging.handlers.QueueHandler):
+    """
+    기본 QueueHandler.prepare()는 호출 스레드에서 메시지를 포맷(=JSON 직렬화)하므로,
+    같은 프로세스 내 큐에서는 레코드를 그대로 넘기고 포맷은 리스너 스레드의 핸들러에 맡김
+    """
+
+    listener: Optional[logging.handlers.QueueListener] = None
+
+    def prepare(self, record):
+        return record
+
+def start_async(logger: logging.Logger) -> logging.handlers.QueueListener:
+    """logger의 기존 핸들러를 백그라운드 리스너로 옮기고 큐 핸들러 1개만 남김 (중복 호출 시 기존 리스너 반환)"""
+    global _atexit_registered
+    for h in logger.handlers:
+        if isinstance(h, AuditQueueHandler):
+            return h.listener
+    handlers = list(logger.handlers)
+    q = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+    qh = AuditQueueHandler(q)
+    qh.listener = listener
+    for h in handlers:
+        logger.removeHandler(h)
+    logger.addHandler(qh)
+    listener.start()
+    _listeners.append((logger, qh, listener))
+    if not _atexit_registered:
+        # logging.shutdown(atexit 등록이 먼저라 나중에 실행)보다 먼저 큐를 비움
+        atexit.register(stop_async)
+        _atexit_registered = True
+    return listener
+
+def flush_async():
+    """지금까지 큐에 들어간 레코드를 모두 기록할 때까지 대기 (리스너는 계속 동작)"""
+    for _, _, listener in list(_listeners):
+        listener.stop()
+        listener.start()
+        for h in listener.handlers:
+            h.flush()
+
+def stop_async():
+    """큐를 끝까지 비우고 리스너 종료, 원래 핸들러를 로거에 되돌림 (이후 기록은 동기 방식)"""
+    while _listeners:
+        logger, qh, listener = _listeners.pop()
+        logger.removeHandler(qh)
+        listener.stop()
+        for h in listener.handlers:
+            h.flush()
+            logger.addHandler(h)
+
+def _after_fork_child():
+    # 자식 프로세스에는 리스너 스레드가 없음 → 원래 핸들러로 동기 기록, 컨텍스트(pid) 재계산
+    reset_context()
+    while _listeners:
+        logger, qh, listener = _listeners.pop()
+        logger.removeHandler(qh)
+        for h in listener.handlers:
+            logger.addHandler(h)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_child)
@@ -0,0 +1,215 @@
+# src/security_infra/audit_store.py
+"""
+감사 로그(logs/install.log) 조회용 사이드 인덱스 (SQLite, 로그 파일은 append-only 그대로 유지)
+- 인덱스: <로그>.idx.sqlite — [AUDIT] 줄의 (파일 offset, 길이, timestamp(초), event id, exec_id id)
+- 조회 시 마지막으로 인덱싱한 위치부터 새로 추가된 부분만 읽어 반영 (처음 1번만 전체 스캔)
+- 로그 교체/절단(inode 변경, 크기 감소, 파일 앞부분 변경)을 감지하면 인덱스를 다시 생성
+- 결과 줄은 인덱스의 offset으로 seek 해서 읽음, 필터 없는 --last N은 파일 끝에서 역방향으로 읽음
+"""
+
+import json
+import math
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+AUDIT_MARKER = "[AUDIT] "
+INDEX_SUFFIX = ".idx.sqlite"
+HEAD_BYTES = 256                 # 로그 교체 감지용으로 기록해 두는 파일 앞부분 크기
+TAIL_BLOCK = 64 * 1024           # 파일 끝에서 역방향으로 읽는 블록 크기
+INSERT_BATCH = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY, name TEXT UNIQUE);
+CREATE TABLE IF NOT EXISTS execs (id INTEGER PRIMARY KEY, exec_id TEXT UNIQUE);
+CREATE TABLE IF NOT EXISTS records (
+    offset INTEGER PRIMARY KEY,
+    length INTEGER NOT NULL,
+    ts INTEGER,
+    event INTEGER,
+    exec INTEGER
+);
+CREATE INDEX IF NOT EXISTS records_exec ON records (exec);
+CREATE INDEX IF NOT EXISTS records_event ON records (event, ts);
+CREATE INDEX IF NOT EXISTS records_ts ON records (ts);
+"""
+# event/exec_id 문자열은 별도 테이블에 1번만 저장하고 레코드에는 정수 id만 (인덱스 크기 최소화)
+
+def index_path(log_path) -> Path:
+    return Path(str(log_path) + INDEX_SUFFIX)
+
+def parse_audit_line(line: str) -> Optional[dict]:
+    """'... [AUDIT] {json}' → dict (감사 로그 줄이 아니거나 JSON 오류면 None)"""
+    pos = line.find(AUDIT_MARKER)
+    if pos < 0:
+        return None
+    try:
+        data = json.loads(line[pos + len(AUDIT_MARKER):])
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def _epoch(value) -> Optional[int]:
+    """ISO 시각 → epoch 초 (정수, 인덱스 조회 단위는 초)"""
+    try:
+        return int(datetime.fromisoformat(str(value)).timestamp())
+    except ValueError:
+        return None
+
+def tail_lines(log_path, n: int, block: int = TAIL_BLOCK) -> List[str]:
+    """파일 끝에서 블록 단위로 거꾸로 읽어 마지막 n줄 (파일 크기와 무관하게 필요한 만큼만 읽음)"""
+    if n <= 0:
+        return []
+    with open(log_path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        # 마지막 줄이 개행으로 끝나므로 n줄을 온전히 얻으려면 개행 n+1개(또는 파일 시작)까지 필요
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    return [line.decode("utf-8", "replace") for line in data.splitlines()[-n:]]
+
+class AuditIndex:
+    """
+    감사 로그 인덱스 (프로세스 간 동시 갱신은 SQLite 쓰기 잠금으로 직렬화)
+    update(): 새로 추가된 [AUDIT] 줄 수, query(): 필터 조건의 최근 레코드
+    """
+
+    def __init__(self, log_path, index_file=None):
+        self.log_path = Path(log_path)
+        self.index_file = Path(index_file) if index_file else index_path(log_path)
+        self.db = sqlite3.connect(str(self.index_file), timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self._ids = {"events": {}, "execs": {}}
+
+    def _id(self, table: str, value) -> Optional[int]:
+        if value is None:
+            return None
+        value = str(value)
+        cache = self._ids[table]
+        ident = cache.get(value)
+        if ident is None:
+            column = "name" if table == "events" else "exec_id"
+            self.db.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+            ident = cache[value] = self.db.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,)).fetchone()[0]
+        return ident
+
+    def _lookup(self, table: str, value: str) -> List[int]:
+        column = "name" if table == "events" else "exec_id"
+        op = "GLOB" if table == "events" and "*" in value else "="
+        return [row[0] for row in self.db.execute(f"SELECT id FROM {table} WHERE {column} {op} ?", (value,))]
+
+    def _meta(self) -> dict:
+        return dict(self.db.execute("SELECT key, value FROM meta"))
+
+    def update(self) -> int:
+        """인덱싱한 위치 이후의 완결된 줄만 읽어 반영 (기록 중인 마지막 줄은 다음 호출에서)"""
+        st = os.stat(self.log_path)
+        added = 0
+        with open(self.log_path, "rb") as f:
+            head = f.read(HEAD_BYTES)
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                meta = self._meta()
+                start = int(meta.get("offset", 0))
+                if (meta.get("inode") != str(st.st_ino) or st.st_size < start
+                        or not head.startswith(bytes.fromhex(meta.get("head", "")))):
+                    # 로그 교체/절단 → 처음부터 다시 인덱싱
+                    for table in ("records", "events", "execs"):
+                        self.db.execute(f"DELETE FROM {table}")
+                    start = 0
+                # 다른 프로세스가 인덱스를 다시 만들었을 수 있으므로 id 캐시는 갱신마다 새로
+                self._ids = {"events": {}, "execs": {}}
+                f.seek(start)
+                offset, rows = start, []
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    if b"[AUDIT] " in line:
+                        data = parse_audit_line(line.decode("utf-8", "replace"))
+                        if data is not None:
+                            rows.append((offset, len(line), _epoch(data.get("timestamp")),
+                                         self._id("events", data.get("event")),
+                                         self._id("execs", data.get("exec_id"))))
+                    offset += len(line)
+                    if len(rows) >= INSERT_BATCH:
+                        added += self._insert(rows)
+                added += self._insert(rows)
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [("offset", str(offset)), ("inode", str(st.st_ino)), ("head", head.hex())],
+                )
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return added
+
+    def _insert(self, rows: list) -> int:
+        n = len(rows)
+        if rows:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO records (offset, length, ts, event, exec) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            rows.clear()
+        return n
+
+    def query(
+        self,
+        exec_id: Optional[str] = None,
+        event: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        last: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        조건에 맞는 레코드를 기록 순서대로 (last: 최근 N건만)
+        event에 '*'가 있으면 패턴 (예: 'compose-*'), since/until은 epoch 초
+        """
+        clauses, params = [], []
+        for table, column, value in (("execs", "exec", exec_id), ("events", "event", event)):
+            if value:
+                ids = self._lookup(table, value)
+                if not ids:
+                    return []
+                clauses.append(f"{column} IN ({', '.join('?' * len(ids))})")
+                params.extend(ids)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(math.floor(since))
+        if until is not None:
+            clauses.append("ts <= ?")
+            params.append(math.floor(until))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.db.execute(
+            f"SELECT offset, length FROM records {where} ORDER BY offset DESC LIMIT ?",
+            params + [last if last else -1],
+        ).fetchall()
+        out = []
+        with open(self.log_path, "rb") as f:
+            for offset, length in reversed(rows):
+                f.seek(offset)
+                line = f.read(length).decode("utf-8", "replace").rstrip("\n")
+                out.append({"offset": offset, "line": line, "record": parse_audit_line(line)})
+        return out
+
+    def stats(self) -> dict:
+        meta = self._meta()
+        count = self.db.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+        return {"records": count, "indexed_bytes": int(meta.get("offset", 0)),
+                "index_bytes": self.index_file.stat().st_size}
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -8,6 +8,9 @@
       logout → login → unlock → unseal key 추출 → vault unseal 자동화
     - vault가 해제되면 루프 즉시 중단 (미래지향적 버전)
     - 디버깅 및 예외 처리 강화
+    - 동시 모드(--concurrent): 계정별 격리된 BITWARDENCLI_APPDATA_DIR에서 병렬로 키를 받아
+      도착 순서대로 제출, sealed=false 응답 즉시 남은 bw 프로세스 종료 + time-to-unseal 보고
+    - 데몬 모드(--daemon): seal-status를 keep-alive 세션으로 폴링, 봉인 시 필요한 키 수만큼만 조회
 
 실행:
     python src/security_infra/auto_unseal.py
@@ -16,22 +19,41 @@
     .env 또는 환경변수로 VAULT_ADDR, BW_SERVER 등 지정 (미지정시 기본값)
 """
 
+import contextlib
+import functools
+import io
 import os
+import queue
+import shutil
 import subprocess
 import json
+import tempfile
+import threading
+import time
 import requests
 import urllib3
 import traceback
 from dotenv import load_dotenv
 
-# .env 환경변수 자동 로딩
-load_dotenv()
+from security_infra.vault_client import VaultError, VaultSession, shares_needed
 
 USB_PATH = "/mnt/usb"
-VAULT_ADDR = os.environ.get("VAULT_ADDR", "https://localhost:8200")
+DEFAULT_VAULT_ADDR = "https://localhost:8200"
 UNSEAL_KEY_FIELD = "unseal key"   # Bitwarden 필드명 (필요시 변경)
+BW_TIMEOUT = 60                   # bw 명령당 제한 시간(초)
+JSON_CHUNK = 64 * 1024            # bw list 출력 증분 파싱 단위(문자)
+DAEMON_INTERVAL = 5.0             # 데몬 seal-status 기본 폴링 간격(초)
+DAEMON_MAX_INTERVAL = 60.0        # 언실 상태 유지 시 최대 폴링 간격(초)
+DAEMON_RETRY_MAX_INTERVAL = 600.0 # 언실 연속 실패 시 최대 재시도 간격(초, Bitwarden 로그인 잠금 방지)
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+def load_runtime_env():
+    """
+    .env 환경변수 로딩 + 자체서명 인증서 경고 억제.
+    import 시점이 아니라 실행 시점에 호출 (CLI 콜드스타트/부작용 최소화)
+    """
+    load_dotenv()
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    return os.environ.get("VAULT_ADDR", DEFAULT_VAULT_ADDR)
 
 def get_bw_accounts_and_passwords(usb_path):
     accounts = []
@@ -72,56 +94,328 @@ def unlock_bw_account(account, password):
             env=env,
             stderr=subprocess.STDOUT
         ).decode().strip()
-        print(f"[SUCCESS] {account} 세션 획득 (앞8글자): {bw_session[:8]}...")
+        print(f"[SUCCESS] {account} 세션 획득")
         return bw_session
     except subprocess.CalledProcessError as e:
         print(f"[ERROR] {account} unlock 실패:\n{e.output.decode()}")
         return None
 
-def extract_unseal_key(bw_session, field_name=UNSEAL_KEY_FIELD):
+def extract_unseal_key(bw_session, field_name=UNSEAL_KEY_FIELD, bw_item=None):
+    """
+    순차 모드용: find_unseal_key 래퍼 (오류는 출력 후 None, 키 값/세션은 출력하지 않음)
+    """
     try:
-        print(f"[DEBUG] bw list items 호출 시작")
-        result = subprocess.check_output(
-            ["bw", "list", "items", "--session", bw_session],
-            stderr=subprocess.STDOUT,
-            timeout=60
-        )
-        try:
-            preview = result.decode(errors="replace")[:500]
-        except Exception:
-            preview = str(result[:200])
-        print(f"[DEBUG] bw list items 결과 미리보기:\n{preview}")
-
-        print(f"[DEBUG] JSON 파싱 시도")
-        items = json.loads(result)
-        print(f"[DEBUG] JSON 파싱 성공, 항목 수: {len(items)}")
-        for item in items:
-            if 'fields' in item:
-                for field in item['fields']:
-                    print(f"[DEBUG] field.name: {field.get('name')}")
-                    if field['name'].lower() == field_name.lower():
-                        print(f"[DEBUG] 언실키 발견: {field['value'][:8]}... (길이 {len(field['value'])})")
-                        return field['value']
-        print("[WARN] 언실키 필드가 없습니다.")
-        return None
+        return find_unseal_key(bw_session, bw_item, field_name, logger=print)
     except subprocess.TimeoutExpired:
-        print("[ERROR] bw list items 명령이 60초 이상 걸려 중단되었습니다. (timeout)")
-        traceback.print_exc()
+        print(f"[ERROR] bw 항목 조회가 {BW_TIMEOUT}초 이상 걸려 중단되었습니다. (timeout)")
         return None
     except KeyboardInterrupt:
         print("[INTERRUPT] 사용자가 Ctrl+C로 중단했습니다.")
-        traceback.print_exc()
         return None
     except subprocess.CalledProcessError as e:
-        print(f"[ERROR] 언실키 추출 실패 (subprocess):\n{e.output.decode()}")
-        traceback.print_exc()
+        print(f"[ERROR] 언실키 추출 실패 (subprocess):\n{e.output.decode(errors='replace')}")
         return None
     except Exception as e:
         print(f"[ERROR] 언실키 추출 실패 (기타): {e}")
         traceback.print_exc()
         return None
 
-def vault_unseal(unseal_key, vault_addr=VAULT_ADDR):
+def find_unseal_field(items, field_name=UNSEAL_KEY_FIELD):
+    """bw 항목 목록 → 첫 번째 언실키 필드 값 (키 값은 출력하지 않음)"""
+    for item in items:
+        for field in item.get("fields") or []:
+            if (field.get("name") or "").lower() == field_name.lower() and field.get("value"):
+                return field["value"]
+    return None
+
+def iter_json_array(stream, chunk_size=JSON_CHUNK):
+    """
+    JSON 배열 텍스트 스트림 → 원소를 하나씩 (전체 목록을 메모리에 올리지 않고 증분 파싱)
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof, started = "", 0, False, False
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buf):
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("JSON 배열이 아님")
+                started, pos = True, pos + 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield item
+                buf, pos = buf[end:], 0
+                continue
+        elif eof:
+            if started:
+                raise ValueError("JSON 배열이 닫히지 않음")
+            return
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+def _item_matches(item, bw_item):
+    return bw_item is None or (item.get("name") or "").lower() == bw_item.lower()
+
+def find_unseal_key(session, bw_item=None, field_name=UNSEAL_KEY_FIELD, env=None, timeout=BW_TIMEOUT,
+                    group=None, logger=None):
+    """
+    언실키 조회 (키 값은 로그에 남기지 않음)
+    1) bw_item 지정 시 `bw get item <이름>`으로 해당 항목만 조회
+    2) 실패하면(이름이 여러 항목과 겹침 등) `bw list items --search 이름` 출력에서 이름이 정확히 같은 항목만 사용
+       (다른 항목의 언실키로 대체하지 않음 → 엉뚱한 키 제출 방지)
+    3) bw_item 미지정 시 `bw list items` 출력을 증분 파싱, 언실키 필드가 있는 첫 항목에서 즉시 중단
+       (전체 목록을 json.loads 하지 않음)
+    """
+    group = group or BwProcessGroup()
+    env = env or os.environ.copy()
+    log = logger or (lambda message: None)
+    if bw_item:
+        try:
+            item = json.loads(group.run(["bw", "get", "item", bw_item, "--session", session], env, timeout))
+            value = find_unseal_field([item], field_name)
+            if value:
+                return value
+            log(f"[WARN] 항목 '{bw_item}'에 '{field_name}' 필드 없음 → 같은 이름의 다른 항목 검색")
+        except subprocess.CalledProcessError as e:
+            log(f"[INFO] bw get item 실패({e.output.decode(errors='replace').strip()[:80]}) → 목록 검색")
+    args = ["bw", "list", "items", "--session", session]
+    if bw_item:
+        args += ["--search", bw_item]
+    with group.stream(args, env, timeout) as proc:
+        text = io.TextIOWrapper(proc.stdout, encoding="utf-8", errors="replace")
+        for item in iter_json_array(text):
+            value = find_unseal_field([item], field_name)
+            if value and _item_matches(item, bw_item):
+                return value
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, args, proc.stderr.read())
+    if bw_item:
+        log(f"[WARN] '{field_name}' 필드가 있는 항목 '{bw_item}'이 없습니다 (다른 항목의 키는 사용하지 않음, --bw-item 확인)")
+    else:
+        log(f"[WARN] '{field_name}' 필드가 있는 항목이 없습니다.")
+    return None
+
+class BwCancelled(RuntimeError):
+    pass
+
+class BwProcessGroup:
+    """
+    동시에 실행 중인 bw 프로세스 추적 → cancel() 시 일괄 종료 (Vault 언실 완료 후 남은 작업 중단)
+    """
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self._procs = set()
+        self._lock = threading.Lock()
+
+    def run(self, args, env, timeout=BW_TIMEOUT) -> bytes:
+        with self._lock:
+            if self.cancelled.is_set():
+                raise BwCancelled("취소됨")
+            proc = subprocess.Popen(args, env=env, stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            self._procs.add(proc)
+        try:
+            output, _ = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+        finally:
+            with self._lock:
+                self._procs.discard(proc)
+        if self.cancelled.is_set():
+            raise BwCancelled("취소됨")
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, args, output)
+        return output
+
+    @contextlib.contextmanager
+    def stream(self, args, env, timeout=BW_TIMEOUT):
+        """
+        stdout을 읽으면서 처리할 때 사용 (필요한 항목을 찾으면 나머지 출력은 읽지 않고 종료)
+        with 블록을 벗어나면 프로세스 종료, timeout 초과 시 강제 종료
+        """
+        with self._lock:
+            if self.cancelled.is_set():
+                raise BwCancelled("취소됨")
+            proc = subprocess.Popen(args, env=env, stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            self._procs.add(proc)
+        expired = threading.Event()
+
+        def expire():
+            expired.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, expire)
+        timer.start()
+        try:
+            try:
+                yield proc
+            finally:
+                # 취소/시간 초과로 종료된 경우 파싱 오류/종료 코드 대신 원인 예외로 보고
+                if self.cancelled.is_set():
+                    raise BwCancelled("취소됨")
+                if expired.is_set():
+                    raise subprocess.TimeoutExpired(args, timeout)
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+            with self._lock:
+                self._procs.discard(proc)
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled.set()
+            for proc in self._procs:
+                proc.terminate()
+
+def bw_env(password, appdata_dir=None):
+    env = os.environ.copy()
+    env["BW_PASSWORD"] = password
+    if appdata_dir:
+        env["BITWARDENCLI_APPDATA_DIR"] = appdata_dir
+    return env
+
+def fetch_account_key(account, password, group, field_name=UNSEAL_KEY_FIELD, timeout=BW_TIMEOUT, bw_item=None):
+    """
+    계정 1개: 임시 BITWARDENCLI_APPDATA_DIR(0700)에서 login → unlock → 항목 조회
+    계정마다 설정/세션 파일이 분리되므로 다른 계정과 동시에 실행 가능 (logout 불필요, 종료 시 디렉토리 삭제)
+    """
+    appdata = tempfile.mkdtemp(prefix="bw-appdata-")
+    try:
+        env = bw_env(password, appdata)
+        server = os.environ.get("BW_SERVER")
+        if server:
+            group.run(["bw", "config", "server", server], env, timeout)
+        group.run(["bw", "login", account, "--passwordenv", "BW_PASSWORD"], env, timeout)
+        session = group.run(["bw", "unlock", "--raw", "--passwordenv", "BW_PASSWORD"], env, timeout)
+        return find_unseal_key(session.decode().strip(), bw_item, field_name, env, timeout, group)
+    finally:
+        shutil.rmtree(appdata, ignore_errors=True)
+
+def submit_unseal_key(unseal_key, vault_addr=DEFAULT_VAULT_ADDR, timeout=5):
+    """PUT /v1/sys/unseal → 응답 dict (sealed/progress/t). 오류 응답은 VaultError"""
+    with VaultSession(vault_addr, timeout=timeout) as vault:
+        return vault.unseal(unseal_key)
+
+def concurrent_unseal(accounts, vault_addr=DEFAULT_VAULT_ADDR, workers=None, logger=print,
+                      fetch=fetch_account_key, submit=submit_unseal_key, needed=None):
+    """
+    계정별 키 조회를 병렬 실행하고 도착하는 순서대로 Vault에 제출
+    sealed=false 응답을 받으면 남은 bw 프로세스를 종료하고 대기 중인 계정은 취소
+    needed: 남은 키 공유 수(threshold - progress) → 조회 슬롯 수
+            (키 제출에 성공한 계정은 슬롯을 반납하지 않음 → 조회 실패/중복/제출 실패일 때만 다음 계정 조회)
+    반환: {"unsealed", "time_to_unseal_s", "elapsed_s", "submitted", "accounts": [...]}
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    t0 = time.perf_counter()
+    group = BwProcessGroup()
+    results = queue.Queue()
+    rows = {account: {"account": account, "status": "CANCELLED", "fetch_s": None, "error": ""}
+            for account, _ in accounts}
+
+    slots = threading.Semaphore(needed or max(1, len(accounts)))
+    acquired = []
+
+    def worker(account, password):
+        try:
+            while not slots.acquire(timeout=0.1):
+                if group.cancelled.is_set():
+                    raise BwCancelled("취소됨")
+            acquired.append(account)
+            results.put((account, fetch(account, password, group), None))
+        except Exception as e:
+            results.put((account, None, e))
+
+    pool = ThreadPoolExecutor(max_workers=workers or max(1, len(accounts)))
+    for account, password in accounts:
+        pool.submit(worker, account, password)
+
+    submitted, unsealed, time_to_unseal, reported = set(), False, None, 0
+    try:
+        for _ in range(len(accounts)):
+            account, key, error = results.get()
+            row = rows[account]
+            reported += 1
+            try:
+                row["fetch_s"] = round(time.perf_counter() - t0, 3)
+                if isinstance(error, BwCancelled):
+                    continue
+                if error is not None:
+                    detail = error.output.decode(errors="replace").strip() if isinstance(
+                        error, subprocess.CalledProcessError) and error.output else str(error)
+                    row.update(status="FAIL", error=detail or type(error).__name__)
+                    logger(f"[FAIL] {account} 언실키 조회 실패: {row['error']}")
+                    continue
+                if not key:
+                    row.update(status="FAIL", error="언실키 필드 없음")
+                    logger(f"[FAIL] {account} 언실키 필드 없음")
+                    continue
+                if key in submitted:
+                    row.update(status="SKIP", error="이미 제출된 키")
+                    continue
+                submitted.add(key)
+                try:
+                    status = submit(key, vault_addr)
+                except Exception as e:
+                    row.update(status="FAIL", error=str(e))
+                    logger(f"[FAIL] {account} 키 제출 실패: {e}")
+                    continue
+                row["status"] = "OK"
+                logger(f"[INFO] {account} 키 제출 ({row['fetch_s']:.1f}s): "
+                       f"진행 {status.get('progress', 0)}/{status.get('t', '?')}, sealed={status.get('sealed')}")
+                if status.get("sealed") is False:
+                    unsealed = True
+                    time_to_unseal = round(time.perf_counter() - t0, 3)
+                    break
+                # 진행이 초기화된 경우 등 남은 필요 수가 조회 중인 계정 수보다 많으면 슬롯 추가
+                fetching = len(acquired) - reported
+                for _ in range(max(0, shares_needed(status) - fetching)):
+                    slots.release()
+            finally:
+                if row["status"] in ("FAIL", "SKIP"):
+                    slots.release()
+    finally:
+        group.cancel()
+        pool.shutdown(wait=True)
+    return {
+        "unsealed": unsealed,
+        "time_to_unseal_s": time_to_unseal,
+        "elapsed_s": round(time.perf_counter() - t0, 3),
+        "submitted": len(submitted),
+        "accounts": list(rows.values()),
+    }
+
+def format_unseal_report(result):
+    if result["unsealed"]:
+        lines = [f"[SUCCESS] Vault 언실 완료: time-to-unseal {result['time_to_unseal_s']:.1f}s "
+                 f"(키 {result['submitted']}개 제출)"]
+    else:
+        lines = [f"[FAIL] Vault 언실 실패: 키 {result['submitted']}개 제출, {result['elapsed_s']:.1f}s 경과"]
+    for row in result["accounts"]:
+        fetched = f"{row['fetch_s']:.1f}s" if row["fetch_s"] is not None else "-"
+        error = f" - {row['error']}" if row["error"] else ""
+        lines.append(f"  [{row['status']}] {row['account']} (조회 {fetched}){error}")
+    return "\n".join(lines)
+
+def vault_unseal(unseal_key, vault_addr=DEFAULT_VAULT_ADDR):
     try:
         url = f"{vault_addr}/v1/sys/unseal"
         resp = requests.put(url, json={"key": unseal_key}, verify=False, timeout=5)
@@ -138,29 +432,128 @@ def vault_unseal(unseal_key, vault_addr=VAULT_ADDR):
         print(f"[ERROR] Vault 언실 요청 실패: {e}")
         return False
 
+def check_seal_status(vault, logger=print):
+    """seal-status 조회 → dict, 연결 실패 시 None (언실 시도는 계속)"""
+    try:
+        return vault.seal_status()
+    except (requests.RequestException, VaultError) as e:
+        logger(f"[WARN] Vault seal-status 조회 실패: {e}")
+        return None
+
+def auto_unseal(bw_item=None, vault_addr=None, usb_path=USB_PATH, logger=print, concurrent=False, workers=None):
+    """
+    CLI(auto-unseal) 진입점: .env 로딩 후 계정별 순차 언실 (concurrent=True면 계정 병렬 조회)
+    - vault_addr 미지정시 환경변수 VAULT_ADDR(.env 포함) 사용
+    - bw_item: Bitwarden 항목명 (bw get item으로 해당 항목만 조회, 없으면 목록에서 필드명 기준 검색)
+    - 먼저 seal-status 확인: 이미 언실 상태면 Bitwarden 로그인 없이 종료
+    """
+    env_vault_addr = load_runtime_env()
+    vault_addr = vault_addr or env_vault_addr
+    with VaultSession(vault_addr) as vault:
+        status = check_seal_status(vault, logger)
+        if status is not None and not status.get("sealed"):
+            logger("[SKIP] Vault가 이미 언실 상태입니다.")
+            return True
+        accounts = get_bw_accounts_and_passwords(usb_path)
+        logger(f"\n[INFO] 감지된 계정/비밀번호 쌍 {len(accounts)}개\n")
+        if concurrent:
+            needed = shares_needed(status) if status else None
+            result = concurrent_unseal(accounts, vault_addr, workers, logger,
+                                       fetch=functools.partial(fetch_account_key, bw_item=bw_item),
+                                       submit=lambda key, _addr: vault.unseal(key), needed=needed)
+            logger(format_unseal_report(result))
+            return result["unsealed"]
+        for account, password in accounts:
+            logger(f"[INFO] Bitwarden login 시도: {account}")
+            login_ok = login_bw_account(account, password)
+            if not login_ok:
+                continue
+            logger(f"[INFO] Bitwarden unlock 시도: {account}")
+            bw_session = unlock_bw_account(account, password)
+            if not bw_session:
+                continue
+            logger(f"[INFO] {account} 언실키 추출 시도")
+            unseal_key = extract_unseal_key(bw_session, bw_item=bw_item)
+            if unseal_key:
+                logger(f"[INFO] {account} 언실키 확보")
+                logger(f"[INFO] {account} 언실 시도")
+                unsealed = vault_unseal(unseal_key, vault_addr)
+                if unsealed:
+                    logger("[SUCCESS] Vault가 언실되었습니다. 루프를 중단합니다.\n")
+                    return True
+            else:
+                logger(f"[FAIL] {account} 언실키 추출 실패\n")
+        return False
+
+def unseal_daemon(
+    vault_addr=None,
+    usb_path=USB_PATH,
+    logger=print,
+    interval=DAEMON_INTERVAL,
+    max_interval=DAEMON_MAX_INTERVAL,
+    retry_max_interval=DAEMON_RETRY_MAX_INTERVAL,
+    workers=None,
+    stop=None,
+    bw_item=None,
+    fetch=None,
+    load_accounts=get_bw_accounts_and_passwords,
+):
+    """
+    seal-status 주기 폴링 (keep-alive 세션 1개 재사용)
+    - 언실 상태: 폴링 간격을 2배씩 늘림 (최대 max_interval)
+    - 봉인 상태: threshold - progress 만큼만 계정 조회/제출 후 간격 초기화
+      언실 실패 시 재시도 간격을 2배씩 늘림 (최대 retry_max_interval, 매 주기 Bitwarden 로그인 반복 방지)
+    - 미초기화(initialized=false): 언실 시도 없이 언실 상태와 같은 간격으로 폴링
+    - 연결 실패: 기본 간격으로 재시도 (상태가 바뀔 때만 로그)
+    stop: threading.Event (set되면 종료). 반환: 언실 수행 횟수
+    """
+    vault_addr = vault_addr or load_runtime_env()
+    stop = stop or threading.Event()
+    fetch = fetch or functools.partial(fetch_account_key, bw_item=bw_item)
+    delay, last_state, unseal_count, failures = interval, None, 0, 0
+    with VaultSession(vault_addr) as vault:
+        logger(f"[INFO] auto-unseal 데몬 시작: {vault_addr} (간격 {interval}s → 최대 {max_interval}s)")
+        while not stop.is_set():
+            try:
+                status = vault.seal_status()
+            except (requests.RequestException, VaultError) as e:
+                if last_state != "unreachable":
+                    logger(f"[WARN] Vault 연결 실패, {interval}s 간격으로 재시도: {e}")
+                last_state, delay = "unreachable", interval
+                stop.wait(delay)
+                continue
+            state = "uninitialized" if status.get("initialized") is False else (
+                "sealed" if status.get("sealed") else "unsealed")
+            if state != "sealed":
+                if last_state != state:
+                    logger("[OK] Vault 언실 상태" if state == "unsealed"
+                           else "[WARN] Vault 미초기화 상태: 언실 건너뜀 (vault operator init 필요)")
+                    delay = interval
+                else:
+                    delay = min(delay * 2, max_interval)
+                last_state, failures = state, 0
+                stop.wait(delay)
+                continue
+            needed = shares_needed(status)
+            logger(f"[INFO] Vault 봉인 감지: 필요 키 {needed}개 (진행 {status.get('progress', 0)}/{status.get('t')})")
+            last_state = "sealed"
+            accounts = load_accounts(usb_path)
+            result = concurrent_unseal(accounts, vault_addr, workers, logger, fetch=fetch,
+                                       submit=lambda key, _addr: vault.unseal(key), needed=needed)
+            logger(format_unseal_report(result))
+            if result["unsealed"]:
+                unseal_count += 1
+                failures, delay = 0, interval
+            else:
+                failures += 1
+                delay = min(interval * 2 ** failures, retry_max_interval)
+                logger(f"[WARN] 언실 실패 {failures}회 연속, {delay:g}s 후 재시도")
+            stop.wait(delay)
+    logger("[INFO] auto-unseal 데몬 종료")
+    return unseal_count
+
 def main():
-    accounts = get_bw_accounts_and_passwords(USB_PATH)
-    print(f"\n[INFO] 감지된 계정/비밀번호 쌍 {len(accounts)}개\n")
-    for account, password in accounts:
-        print(f"[INFO] Bitwarden login 시도: {account}")
-        login_ok = login_bw_account(account, password)
-        if not login_ok:
-            continue
-        print(f"[INFO] Bitwarden unlock 시도: {account}")
-        bw_session = unlock_bw_account(account, password)
-        if not bw_session:
-            continue
-        print(f"[INFO] {account} 언실키 추출 시도")
-        unseal_key = extract_unseal_key(bw_session)
-        if unseal_key:
-            print(f"[UNSEAL KEY] {account}: {unseal_key[:8]}... (길이 {len(unseal_key)})")
-            print(f"[INFO] {account} 언실 시도")
-            unsealed = vault_unseal(unseal_key, VAULT_ADDR)
-            if unsealed:
-                print("[SUCCESS] Vault가 언실되었습니다. 루프를 중단합니다.\n")
-                break
-        else:
-            print(f"[FAIL] {account} 언실키 추출 실패\n")
+    auto_unseal()
 
 if __name__ == "__main__":
     main()
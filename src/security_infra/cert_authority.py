@@ -0,0 +1,218 @@
+# src/security_infra/cert_authority.py
+"""
+로컬 Root/Intermediate CA 생성 및 서비스/호스트 leaf 인증서 일괄 발급
+- 클라이언트는 root-ca.crt 하나만 신뢰하면 됨 (서비스별 자체서명 N개 배포 불필요)
+- CA 키는 실행당 1회만 로딩 (프로세스 풀 사용 시 워커당 1회)
+- leaf 인증서 파일({cn}.crt)은 leaf + intermediate 체인(fullchain)으로 저장
+"""
+
+import ipaddress
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import ExtendedKeyUsageOID, NameOID
+
+from security_infra.cert_engine import (
+    cert_pem,
+    generate_private_key,
+    parse_san,
+    private_key_pem,
+    signing_hash,
+)
+from security_infra.file_utils import atomic_write
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CA_DIR = PROJECT_ROOT / "docker/ca"
+DEFAULT_CA_DAYS = 3650
+CA_KEY_TYPE = "ec"          # CA 서명키 (ECDSA P-256: 서명 비용 최소)
+
+ROOT_CA_NAME = "security-infra Local Root CA"
+INTERMEDIATE_CA_NAME = "security-infra Local Intermediate CA"
+
+# CA 디렉토리 파일명
+ROOT_CERT = "root-ca.crt"
+ROOT_KEY = "root-ca.key"
+INTERMEDIATE_CERT = "intermediate-ca.crt"
+INTERMEDIATE_KEY = "intermediate-ca.key"
+CHAIN_CERT = "ca-chain.crt"
+
+def _name(common_name: str) -> x509.Name:
+    return x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+
+def _ca_cert(subject_key, issuer_key, subject: str, issuer: x509.Name, days: int, path_length: int):
+    now = datetime.now(timezone.utc)
+    public_key = subject_key.public_key()
+    builder = (
+        x509.CertificateBuilder()
+        .subject_name(_name(subject))
+        .issuer_name(issuer)
+        .public_key(public_key)
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + timedelta(days=days))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=path_length), critical=True)
+        .add_extension(
+            x509.KeyUsage(
+                digital_signature=False, content_commitment=False, key_encipherment=False,
+                data_encipherment=False, key_agreement=False, key_cert_sign=True,
+                crl_sign=True, encipher_only=False, decipher_only=False,
+            ),
+            critical=True,
+        )
+        .add_extension(x509.SubjectKeyIdentifier.from_public_key(public_key), critical=False)
+        .add_extension(x509.AuthorityKeyIdentifier.from_issuer_public_key(issuer_key.public_key()), critical=False)
+    )
+    return builder.sign(issuer_key, signing_hash(issuer_key))
+
+class LocalCA:
+    """
+    발급용 Intermediate CA (키/인증서를 메모리에 1회 로딩해 재사용)
+    """
+
+    def __init__(self, key, cert: x509.Certificate, chain_pem: bytes):
+        self.key = key
+        self.cert = cert
+        self.chain_pem = chain_pem      # intermediate (+ root) PEM
+        self._aki = x509.AuthorityKeyIdentifier.from_issuer_public_key(key.public_key())
+        self._hash = signing_hash(key)
+
+    @classmethod
+    def load(cls, ca_dir: Path = CA_DIR) -> "LocalCA":
+        ca_dir = Path(ca_dir)
+        key = serialization.load_pem_private_key((ca_dir / INTERMEDIATE_KEY).read_bytes(), password=None)
+        cert = x509.load_pem_x509_certificate((ca_dir / INTERMEDIATE_CERT).read_bytes())
+        return cls(key, cert, (ca_dir / INTERMEDIATE_CERT).read_bytes())
+
+    def issue(self, common_name: str, san: str, days: int, key_type: str = "ec"):
+        """leaf 키 + 인증서 발급 → (private_key, certificate)"""
+        leaf_key = generate_private_key(key_type)
+        public_key = leaf_key.public_key()
+        now = datetime.now(timezone.utc)
+        not_after = min(now + timedelta(days=days), self.cert.not_valid_after_utc)
+        builder = (
+            x509.CertificateBuilder()
+            .subject_name(_name(common_name))
+            .issuer_name(self.cert.subject)
+            .public_key(public_key)
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now)
+            .not_valid_after(not_after)
+            .add_extension(x509.BasicConstraints(ca=False, path_length=None), critical=True)
+            .add_extension(
+                x509.KeyUsage(
+                    digital_signature=True, content_commitment=False,
+                    key_encipherment=isinstance(leaf_key, rsa.RSAPrivateKey),
+                    data_encipherment=False, key_agreement=False, key_cert_sign=False,
+                    crl_sign=False, encipher_only=False, decipher_only=False,
+                ),
+                critical=True,
+            )
+            .add_extension(
+                x509.ExtendedKeyUsage([ExtendedKeyUsageOID.SERVER_AUTH, ExtendedKeyUsageOID.CLIENT_AUTH]),
+                critical=False,
+            )
+            .add_extension(x509.SubjectKeyIdentifier.from_public_key(public_key), critical=False)
+            .add_extension(self._aki, critical=False)
+            .add_extension(x509.SubjectAlternativeName(parse_san(san)), critical=False)
+        )
+        return leaf_key, builder.sign(self.key, self._hash)
+
+    def write_leaf(self, cert_dir: Path, common_name: str, leaf_key, leaf_cert: x509.Certificate):
+        """키(0600) → fullchain 인증서(leaf + intermediate) 순으로 원자적 교체"""
+        cert_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write(cert_dir / f"{common_name}.key", private_key_pem(leaf_key), mode=0o600)
+        atomic_write(cert_dir / f"{common_name}.crt", cert_pem(leaf_cert) + self.chain_pem, mode=0o644)
+
+def ensure_local_ca(ca_dir: Path = CA_DIR, days: int = DEFAULT_CA_DAYS, logger=print) -> LocalCA:
+    """
+    Root/Intermediate CA가 없으면 생성, 있으면 그대로 로딩
+    - Intermediate만 없으면 기존 Root 키로 Intermediate만 재서명 (클라이언트에 배포된 Root 유지)
+    - Root 인증서/키 중 하나만 남아 있으면 생성하지 않고 오류 (기존 Root는 절대 덮어쓰지 않음)
+    """
+    ca_dir = Path(ca_dir)
+    required = [ROOT_CERT, INTERMEDIATE_CERT, INTERMEDIATE_KEY]
+    if all((ca_dir / name).exists() for name in required):
+        logger(f"[SKIP] 로컬 CA 이미 존재 (재사용): {ca_dir / ROOT_CERT}")
+        return LocalCA.load(ca_dir)
+
+    root_files = [(ca_dir / name).exists() for name in (ROOT_CERT, ROOT_KEY)]
+    if all(root_files):
+        root_key = serialization.load_pem_private_key((ca_dir / ROOT_KEY).read_bytes(), password=None)
+        root_cert = x509.load_pem_x509_certificate((ca_dir / ROOT_CERT).read_bytes())
+        created = False
+    elif any(root_files):
+        raise ValueError(
+            f"[ERROR] 로컬 Root CA 파일 불완전 ({ROOT_CERT}/{ROOT_KEY} 중 하나 없음): {ca_dir} "
+            "- 기존 Root CA를 덮어쓰지 않습니다. Root 키를 복원하거나 CA 디렉토리를 정리한 뒤 다시 실행하세요."
+        )
+    else:
+        ca_dir.mkdir(parents=True, exist_ok=True)
+        root_key = generate_private_key(CA_KEY_TYPE)
+        root_cert = _ca_cert(root_key, root_key, ROOT_CA_NAME, _name(ROOT_CA_NAME), days, path_length=1)
+        atomic_write(ca_dir / ROOT_KEY, private_key_pem(root_key), mode=0o600)
+        atomic_write(ca_dir / ROOT_CERT, cert_pem(root_cert), mode=0o644)
+        created = True
+
+    int_key = generate_private_key(CA_KEY_TYPE)
+    int_cert = _ca_cert(int_key, root_key, INTERMEDIATE_CA_NAME, root_cert.subject, days, path_length=0)
+    atomic_write(ca_dir / INTERMEDIATE_KEY, private_key_pem(int_key), mode=0o600)
+    atomic_write(ca_dir / INTERMEDIATE_CERT, cert_pem(int_cert), mode=0o644)
+    atomic_write(ca_dir / CHAIN_CERT, cert_pem(int_cert) + cert_pem(root_cert), mode=0o644)
+    if created:
+        logger(f"[OK] 로컬 Root/Intermediate CA 생성 완료: {ca_dir} (클라이언트는 {ROOT_CERT}만 신뢰)")
+    else:
+        logger(f"[OK] 기존 Root CA로 Intermediate CA 재발급: {ca_dir / INTERMEDIATE_CERT} ({ROOT_CERT} 유지)")
+    return LocalCA(int_key, int_cert, cert_pem(int_cert))
+
+def host_san(host: str) -> str:
+    """호스트명/IP → make_san() 형식 SAN 문자열"""
+    try:
+        ipaddress.ip_address(host)
+        return f"IP:{host}"
+    except ValueError:
+        return f"DNS:{host}"
+
+# [발급 작업] task = (이름, cert_dir, san, days, overwrite, key_type)
+def issue_leaf(ca: LocalCA, name: str, cert_dir: Path, san: str, days: int, overwrite: bool, key_type: str):
+    """
+    leaf 1개 발급. 반환: (상태 OK|SKIP|FAIL, 로그 목록, 소요시간 초)
+    """
+    started = time.perf_counter()
+    cert_file = cert_dir / f"{name}.crt"
+    if cert_file.exists() and (cert_dir / f"{name}.key").exists() and not overwrite:
+        return "SKIP", [f"[SKIP] {name} 인증서/키 이미 존재 (덮어쓰기 안함): {cert_file}"], time.perf_counter() - started
+    try:
+        leaf_key, leaf_cert = ca.issue(name, san, days, key_type)
+        ca.write_leaf(cert_dir, name, leaf_key, leaf_cert)
+        logs = [f"[OK] {name} leaf 인증서 발급 완료({key_type}, CA 서명): {cert_file}"]
+        return "OK", logs, time.perf_counter() - started
+    except Exception as e:
+        return "FAIL", [f"[FAIL] {name} leaf 인증서 발급 실패\n{e}"], time.perf_counter() - started
+
+# 프로세스 풀 워커: CA는 워커 초기화 시 1회만 로딩
+_WORKER_CA: Optional[LocalCA] = None
+
+def _init_worker(ca_dir: Path):
+    global _WORKER_CA
+    _WORKER_CA = LocalCA.load(ca_dir)
+
+def _issue_in_worker(task):
+    return issue_leaf(_WORKER_CA, *task)
+
+def issue_batch(ca: LocalCA, tasks: List[tuple], jobs: int = 1, ca_dir: Path = CA_DIR) -> List[tuple]:
+    """
+    leaf 일괄 발급 (tasks 순서대로 결과 반환)
+    - jobs > 1: RSA leaf처럼 키 생성이 무거울 때 프로세스 풀 사용
+    """
+    workers = min(jobs, len(tasks))
+    if workers > 1:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(ca_dir,)) as pool:
+            return list(pool.map(_issue_in_worker, tasks, chunksize=chunksize))
+    return [issue_leaf(ca, *task) for task in tasks]
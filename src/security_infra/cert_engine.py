@@ -0,0 +1,118 @@
+# src/security_infra/cert_engine.py
+"""
+openssl 서브프로세스 없이 cryptography 라이브러리로 인증서/키를 생성하는 네이티브 엔진
+- make_san()과 동일한 CN/SAN 구성 ("DNS:xxx, IP:yyy" 문자열 그대로 사용)
+- RSA / ECDSA P-256 / Ed25519 키 지원
+- PEM 파일은 임시파일 작성 후 os.replace로 원자적 교체
+"""
+
+import ipaddress
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.x509.oid import NameOID
+
+from security_infra.file_utils import atomic_write
+from security_infra.generate_certificates import KEY_TYPES
+
+RSA_KEY_SIZE = 2048
+
+# [1] 키 생성
+def generate_private_key(key_type: str = "rsa"):
+    if key_type == "rsa":
+        return rsa.generate_private_key(public_exponent=65537, key_size=RSA_KEY_SIZE)
+    if key_type == "ec":
+        return ec.generate_private_key(ec.SECP256R1())
+    if key_type == "ed25519":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"[ERROR] 지원하지 않는 키 종류: {key_type} (지원: {', '.join(KEY_TYPES)})")
+
+def signing_hash(private_key):
+    """Ed25519는 해시 알고리즘 지정 불가(None), 나머지는 SHA-256"""
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return None
+    return hashes.SHA256()
+
+# [2] make_san() 문자열 → x509 GeneralName 목록
+def parse_san(san: str) -> List[x509.GeneralName]:
+    names = []
+    for entry in san.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        kind, _, value = entry.partition(":")
+        kind, value = kind.strip().upper(), value.strip()
+        if kind == "DNS":
+            names.append(x509.DNSName(value))
+        elif kind == "IP":
+            names.append(x509.IPAddress(ipaddress.ip_address(value)))
+        else:
+            raise ValueError(f"[ERROR] 지원하지 않는 SAN 형식: {entry} (DNS:xxx, IP:yyy)")
+    return names
+
+# [3] 자체서명 인증서 (openssl req -x509 기본 확장과 동일한 구성)
+def build_self_signed_cert(private_key, common_name: str, san: str, days: int) -> x509.Certificate:
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    now = datetime.now(timezone.utc)
+    public_key = private_key.public_key()
+    builder = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(public_key)
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + timedelta(days=days))
+        .add_extension(x509.SubjectKeyIdentifier.from_public_key(public_key), critical=False)
+        .add_extension(x509.AuthorityKeyIdentifier.from_issuer_public_key(public_key), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .add_extension(x509.SubjectAlternativeName(parse_san(san)), critical=False)
+    )
+    return builder.sign(private_key, signing_hash(private_key))
+
+def private_key_pem(private_key) -> bytes:
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+def cert_pem(cert: x509.Certificate) -> bytes:
+    return cert.public_bytes(serialization.Encoding.PEM)
+
+# [4] 키/인증서 원자적 저장
+def write_key_and_cert(cert_dir: Path, common_name: str, private_key, cert: x509.Certificate):
+    """키(0600) → 인증서(0644) 순으로 원자적 교체"""
+    cert_dir.mkdir(parents=True, exist_ok=True)
+    atomic_write(cert_dir / f"{common_name}.key", private_key_pem(private_key), mode=0o600)
+    atomic_write(cert_dir / f"{common_name}.crt", cert_pem(cert), mode=0o644)
+
+# [5] openssl_generate_cert()와 같은 시그니처/로그 형식의 네이티브 버전
+def native_generate_cert(
+    cert_dir: Path,
+    common_name: str,
+    san: str,
+    days: int,
+    overwrite: bool = False,
+    service: str = "",
+    logger=print,
+    key_type: str = "rsa",
+):
+    cert_file = cert_dir / f"{common_name}.crt"
+    key_file = cert_dir / f"{common_name}.key"
+    if cert_file.exists() and key_file.exists() and not overwrite:
+        logger(f"[SKIP] {service} 인증서/키 이미 존재 (덮어쓰기 안함): {cert_file}")
+        return False
+    try:
+        private_key = generate_private_key(key_type)
+        cert = build_self_signed_cert(private_key, common_name, san, days)
+        write_key_and_cert(cert_dir, common_name, private_key, cert)
+        logger(f"[OK] {service} 인증서/키 생성 완료({key_type}, native): {cert_file}")
+        return True
+    except Exception as e:
+        logger(f"[FAIL] {service} 인증서 생성 실패 (native)\n{e}")
+        return False
@@ -0,0 +1,201 @@
+# src/security_infra/cert_manifest.py
+"""
+인증서 매니페스트(docker/certs.json): 서비스별 지문/SAN/만료일/키 해시 인덱스
+- generate-certificates: 만료임박/SAN 불일치/키 불일치/발급자 불일치인 인증서만 재발급
+- cert-status: PEM 파싱 없이 매니페스트 + 파일 stat만으로 상태 응답
+- PEM 파싱(cryptography)은 파일이 바뀌었거나 새로 기록할 때만 수행
+"""
+
+import importlib.util
+import ipaddress
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from security_infra.file_utils import atomic_write, file_signature
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+MANIFEST_PATH = PROJECT_ROOT / "docker/certs.json"
+MANIFEST_VERSION = 1
+DEFAULT_RENEW_BEFORE_DAYS = 30
+
+# 재발급 사유
+REISSUE_REASONS = {
+    "missing": "인증서/키 파일 없음",
+    "unreadable": "인증서/키 파싱 실패",
+    "key-mismatch": "인증서와 키 불일치",
+    "san-mismatch": "SAN 구성 변경",
+    "issuer-mismatch": "발급자(자체서명/로컬 CA) 변경",
+    "expired": "만료됨",
+    "expiring": "만료 임박",
+}
+
+def manifest_supported() -> bool:
+    """PEM 파싱용 cryptography 설치 여부 (openssl 백엔드는 없어도 동작, 매니페스트만 비활성)"""
+    return importlib.util.find_spec("cryptography") is not None
+
+def load_manifest(path: Optional[Path] = None) -> dict:
+    path = Path(path or MANIFEST_PATH)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (FileNotFoundError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "certs": {}}
+
+def save_manifest(manifest: dict, path: Optional[Path] = None):
+    """임시파일 작성 후 os.replace (동시 실행 중 cert-status가 깨진 JSON을 읽지 않도록)"""
+    path = Path(path or MANIFEST_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    manifest["updated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    data = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+    atomic_write(path, data, mode=0o644)
+
+def normalize_san(san: str) -> List[str]:
+    """make_san() 문자열 → 정렬된 SAN 목록 (IP 표기 정규화)"""
+    names = set()
+    for entry in san.split(","):
+        kind, _, value = entry.strip().partition(":")
+        if not value:
+            continue
+        kind, value = kind.strip().upper(), value.strip()
+        if kind == "IP":
+            value = str(ipaddress.ip_address(value))
+        names.add(f"{kind}:{value}")
+    return sorted(names)
+
+def inspect_cert(cert_file: Path, key_file: Path) -> dict:
+    """PEM 파싱 → 매니페스트 항목 (fullchain이면 첫 번째 인증서 기준)"""
+    import hashlib
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.x509.oid import NameOID
+
+    cert = x509.load_pem_x509_certificates(Path(cert_file).read_bytes())[0]
+    key = serialization.load_pem_private_key(Path(key_file).read_bytes(), password=None)
+    spki = serialization.PublicFormat.SubjectPublicKeyInfo
+    der = serialization.Encoding.DER
+    try:
+        sans = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+        san = [f"DNS:{v}" for v in sans.get_values_for_type(x509.DNSName)]
+        san += [f"IP:{v}" for v in sans.get_values_for_type(x509.IPAddress)]
+    except x509.ExtensionNotFound:
+        san = []
+    cn = cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)
+    return {
+        "cert_path": str(cert_file),
+        "key_path": str(key_file),
+        "subject_cn": cn[0].value if cn else "",
+        "issuer": cert.issuer.rfc4514_string(),
+        "fingerprint_sha256": cert.fingerprint(hashes.SHA256()).hex(":").upper(),
+        "san": sorted(san),
+        "not_after": cert.not_valid_after_utc.isoformat(),
+        "key_hash": hashlib.sha256(key.public_key().public_bytes(der, spki)).hexdigest(),
+        "cert_key_hash": hashlib.sha256(cert.public_key().public_bytes(der, spki)).hexdigest(),
+        "cert_sig": file_signature(cert_file),
+        "key_sig": file_signature(key_file),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+def days_left(entry: dict, now: Optional[datetime] = None) -> float:
+    now = now or datetime.now(timezone.utc)
+    return (datetime.fromisoformat(entry["not_after"]) - now).total_seconds() / 86400
+
+def stale_reason(
+    entry: dict,
+    expected_san: Optional[str] = None,
+    renew_before_days: int = DEFAULT_RENEW_BEFORE_DAYS,
+    expected_issuer: Optional[str] = None,
+) -> Optional[str]:
+    """매니페스트 항목 기준 재발급 사유 (없으면 None)"""
+    if entry["key_hash"] != entry["cert_key_hash"]:
+        return "key-mismatch"
+    if expected_san is not None and normalize_san(expected_san) != entry["san"]:
+        return "san-mismatch"
+    if expected_issuer is not None and expected_issuer != entry["issuer"]:
+        return "issuer-mismatch"
+    remaining = days_left(entry)
+    if remaining <= 0:
+        return "expired"
+    if remaining < renew_before_days:
+        return "expiring"
+    return None
+
+def plan_reissue(
+    manifest: dict,
+    name: str,
+    cert_file: Path,
+    key_file: Path,
+    expected_san: Optional[str] = None,
+    renew_before_days: int = DEFAULT_RENEW_BEFORE_DAYS,
+    expected_issuer: Optional[str] = None,
+) -> Optional[str]:
+    """
+    재발급 필요 여부 판단. 파일 stat이 매니페스트와 같으면 PEM을 다시 읽지 않음
+    (외부에서 교체된 파일은 다시 파싱해 매니페스트 항목 갱신)
+    """
+    cert_sig, key_sig = file_signature(cert_file), file_signature(key_file)
+    if cert_sig is None or key_sig is None:
+        return "missing"
+    entry = manifest["certs"].get(name)
+    if not entry or entry.get("cert_sig") != cert_sig or entry.get("key_sig") != key_sig:
+        try:
+            entry = inspect_cert(cert_file, key_file)
+        except Exception:
+            return "unreadable"
+        manifest["certs"][name] = entry
+    return stale_reason(entry, expected_san, renew_before_days, expected_issuer)
+
+def cert_status(
+    manifest_path: Optional[Path] = None,
+    renew_before_days: int = DEFAULT_RENEW_BEFORE_DAYS,
+) -> List[dict]:
+    """
+    매니페스트 + stat만으로 인증서 상태 목록 반환 (PEM 파싱 없음)
+    status: OK | EXPIRING | EXPIRED | KEY-MISMATCH | CHANGED(기록 이후 파일 변경) | MISSING
+    """
+    manifest = load_manifest(manifest_path)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for name, entry in sorted(manifest["certs"].items()):
+        cert_sig = file_signature(Path(entry["cert_path"]))
+        key_sig = file_signature(Path(entry["key_path"]))
+        remaining = days_left(entry, now)
+        if cert_sig is None or key_sig is None:
+            status = "MISSING"
+        elif cert_sig != entry.get("cert_sig") or key_sig != entry.get("key_sig"):
+            status = "CHANGED"
+        elif entry["key_hash"] != entry["cert_key_hash"]:
+            status = "KEY-MISMATCH"
+        elif remaining <= 0:
+            status = "EXPIRED"
+        elif remaining < renew_before_days:
+            status = "EXPIRING"
+        else:
+            status = "OK"
+        rows.append({
+            "name": name,
+            "status": status,
+            "days_left": int(remaining),
+            "not_after": entry["not_after"],
+            "issuer": entry["issuer"],
+            "san": entry["san"],
+            "fingerprint_sha256": entry["fingerprint_sha256"],
+            "cert_path": entry["cert_path"],
+        })
+    return rows
+
+def format_cert_status(rows: List[dict]) -> str:
+    if not rows:
+        return "[WARN] 인증서 매니페스트가 비어 있습니다. generate-certificates를 먼저 실행하세요."
+    lines = ["인증서 상태 (매니페스트 기준):"]
+    for row in rows:
+        lines.append(
+            f"  [{row['status']}] {row['name']}: 만료 {row['not_after'][:10]} ({row['days_left']}일 남음), "
+            f"발급자 {row['issuer']}, SAN {', '.join(row['san'])}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,166 @@
+# src/security_infra/check_permissions.py
+"""
+permissions.yml 대비 실제 소유자/모드 드리프트 점검 (읽기 전용, 변경 없음)
+- set_permissions와 같은 spec(build_permission_specs)을 사용
+- 하위 트리 순회는 적용 설정과 별개: recursive 또는 audit_recursive 항목, recursive=True(--recursive)면 모든 디렉토리
+- 디렉토리 단위 작업 큐 + 스레드 풀로 트리 병렬 순회 (os.scandir/lstat은 GIL 해제)
+- 항목을 모아두지 않고 드리프트 발견 즉시 emit → 수백만 파일 트리에서도 메모리 일정
+"""
+
+import json
+import os
+import queue
+import stat
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+DEFAULT_WORKERS = 8
+
+def format_mode(mode: int) -> str:
+    return f"{mode:04o}"
+
+def drift_record(spec: dict, path: str, st: os.stat_result, is_dir: bool) -> Optional[dict]:
+    """기대값과 다르면 드리프트 레코드, 같으면 None"""
+    mode = spec["mode"] if is_dir or spec.get("file_mode") is None else spec["file_mode"]
+    actual_mode = stat.S_IMODE(st.st_mode)
+    drift = []
+    if (st.st_uid, st.st_gid) != (spec["uid"], spec["gid"]):
+        drift.append("owner")
+    if actual_mode != mode:
+        drift.append("mode")
+    if not drift:
+        return None
+    return {
+        "name": spec["name"],
+        "path": path,
+        "type": "dir" if is_dir else "file",
+        "drift": drift,
+        "expected": {"owner": f"{spec['uid']}:{spec['gid']}", "mode": format_mode(mode)},
+        "actual": {"owner": f"{st.st_uid}:{st.st_gid}", "mode": format_mode(actual_mode)},
+    }
+
+def scan_drift(specs, emit: Callable[[dict], None], workers: int = DEFAULT_WORKERS, recursive: bool = False) -> dict:
+    """
+    spec 목록의 경로(재귀 포함)를 병렬 점검, 드리프트/오류 레코드를 emit으로 스트리밍
+    recursive=True: 적용은 디렉토리 자체뿐인 항목도 하위 전체 점검 (file_mode 없으면 파일도 mode 기준)
+    반환: {"scanned": 점검 경로 수, "drift": 드리프트 수, "errors": 오류 수}
+    """
+    emit_lock = threading.Lock()
+    pending = queue.Queue()
+    thread_stats = []
+
+    def report(record, stats, key):
+        stats[key] += 1
+        with emit_lock:
+            emit(record)
+
+    def check(spec, path, st, is_dir, stats):
+        stats["scanned"] += 1
+        record = drift_record(spec, path, st, is_dir)
+        if record:
+            report(record, stats, "drift")
+
+    def error(spec, path, e, stats):
+        report({"name": spec["name"], "path": path, "error": str(e)}, stats, "errors")
+
+    def scan_dir(spec, exclude, path, stats):
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_symlink() or entry.path in exclude:
+                        continue
+                    try:
+                        entry_st = entry.stat(follow_symlinks=False)
+                    except OSError as e:
+                        error(spec, entry.path, e, stats)
+                        continue
+                    is_dir = stat.S_ISDIR(entry_st.st_mode)
+                    check(spec, entry.path, entry_st, is_dir, stats)
+                    if is_dir:
+                        pending.put((spec, exclude, entry.path))
+        except OSError as e:
+            error(spec, path, e, stats)
+
+    failures = []
+
+    def worker():
+        stats = {"scanned": 0, "drift": 0, "errors": 0}
+        thread_stats.append(stats)
+        while True:
+            item = pending.get()
+            if item is None:
+                pending.task_done()
+                return
+            try:
+                # emit 실패(파이프 끊김 등) 이후에는 남은 큐만 비우고 종료
+                if not failures:
+                    scan_dir(*item, stats)
+            except BaseException as e:
+                failures.append(e)
+            finally:
+                pending.task_done()
+
+    root_stats = {"scanned": 0, "drift": 0, "errors": 0}
+    thread_stats.append(root_stats)
+    for spec in specs:
+        try:
+            st = os.lstat(spec["path"])
+        except OSError as e:
+            error(spec, spec["path"], e, root_stats)
+            continue
+        if stat.S_ISLNK(st.st_mode):
+            continue
+        is_dir = stat.S_ISDIR(st.st_mode)
+        check(spec, spec["path"], st, is_dir, root_stats)
+        if is_dir and (recursive or spec.get("recursive") or spec.get("audit_recursive")):
+            pending.put((spec, frozenset(spec.get("exclude", ())), spec["path"]))
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(workers, 1))]
+    for t in threads:
+        t.start()
+    pending.join()
+    for _ in threads:
+        pending.put(None)
+    for t in threads:
+        t.join()
+    if failures:
+        raise failures[0]
+
+    totals = {"scanned": 0, "drift": 0, "errors": 0}
+    for stats in thread_stats:
+        for key in totals:
+            totals[key] += stats[key]
+    return totals
+
+def jsonl_emitter(stream=None):
+    """레코드 → JSON lines (한 줄씩 즉시 flush)"""
+    stream = stream or sys.stdout
+
+    def emit(record):
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        stream.flush()
+    return emit
+
+def check_permissions(
+    project_root: Path = None,
+    config_file: Path = None,
+    services=None,
+    emit: Optional[Callable[[dict], None]] = None,
+    workers: int = DEFAULT_WORKERS,
+    logger=print,
+    recursive: bool = False,
+) -> dict:
+    """
+    permissions.yml 기준 드리프트 점검 (변경 없음). 반환: 점검/드리프트/오류 건수
+    """
+    from security_infra.set_permissions import build_permission_specs, load_permission_config
+
+    if project_root is None:
+        project_root = Path(__file__).resolve().parents[2]
+    if config_file is None:
+        config_file = project_root / "config/permissions.yml"
+    perm_cfg = load_permission_config(config_file)
+    specs = build_permission_specs(project_root, perm_cfg, services, logger=logger)
+    return scan_drift(specs, emit or jsonl_emitter(), workers=workers, recursive=recursive)
@@ -1,9 +1,63 @@
 # src/security_infra/compose_manager.py
 
+import os
+import re
+import stat
 import subprocess
+import time
 from pathlib import Path
 
+from security_infra import docker_api
+from security_infra.file_utils import USER_STATE_DIR, private_dir
+
+SERVICE_MAP = {
+    "all": [],
+    "vault": ["vault"],
+    "elk": ["elasticsearch", "logstash", "kibana"],
+    "keycloak": ["keycloak"],
+    "openldap": ["openldap"],
+}
+
+# Engine API로 직접 처리하는 조회 action (docker compose 서브프로세스 없음)
+QUERY_ACTIONS = ("ps", "status", "health")
+
+# sudoers 점검 결과 (프로세스 단위 캐시, 매 명령마다 sudo -n docker ps를 fork하지 않음)
+_SUDOERS_CACHE = {}
+# 성공 결과는 사용자 전용(0700) 디렉토리의 상태 파일(mtime)로 짧게 공유 → 연속 CLI 실행에서도 점검 1회
+SUDOERS_STATE_TTL = 60.0
+SUDOERS_STATE_FILE = USER_STATE_DIR / "sudoers-ok"
+
+def _sudoers_recently_ok() -> bool:
+    if not private_dir(SUDOERS_STATE_FILE.parent):
+        return False
+    try:
+        st = os.lstat(SUDOERS_STATE_FILE)
+    except OSError:
+        return False
+    # 심볼릭 링크/다른 사용자의 파일은 신뢰하지 않음
+    return (stat.S_ISREG(st.st_mode) and st.st_uid == os.getuid()
+            and 0 <= time.time() - st.st_mtime < SUDOERS_STATE_TTL)
+
+def _mark_sudoers_ok():
+    """상태 파일을 새로 생성 (O_EXCL|O_NOFOLLOW: 미리 만들어 둔 링크/파일을 따라가지 않음)"""
+    if not private_dir(SUDOERS_STATE_FILE.parent, create=True):
+        return
+    try:
+        try:
+            os.unlink(SUDOERS_STATE_FILE)
+        except FileNotFoundError:
+            pass
+        fd = os.open(SUDOERS_STATE_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW, 0o600)
+        os.close(fd)
+    except OSError:
+        pass
+
 def check_sudoers_for_docker(logger):
+    if "ok" in _SUDOERS_CACHE:
+        return _SUDOERS_CACHE["ok"]
+    if _sudoers_recently_ok():
+        _SUDOERS_CACHE["ok"] = True
+        return True
     test_cmd = ["sudo", "-n", "docker", "ps"]
     result = subprocess.run(test_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     if result.returncode != 0:
@@ -14,47 +68,196 @@ def check_sudoers_for_docker(logger):
             "오류 메시지: " + result.stderr.decode().strip()
         )
         logger.error(msg)
+        _SUDOERS_CACHE["ok"] = False
         return False
+    _SUDOERS_CACHE["ok"] = True
+    _mark_sudoers_ok()
     return True
 
-def compose_command(action, service, compose_file, logger, make_audit_log):
-    service_map = {
-        "all": [],
-        "vault": ["vault"],
-        "elk": ["elasticsearch", "logstash", "kibana"],
-        "keycloak": ["keycloak"],
-        "openldap": ["openldap"],
-    }
-    if service not in service_map:
+def docker_cli_prefix(logger):
+    """
+    docker CLI 실행 접두어: 소켓 접근 가능하면 ["docker"], 아니면 sudoers 확인(캐시) 후 ["sudo", "docker"]
+    sudo도 불가하면 None
+    """
+    if docker_api.socket_accessible():
+        return ["docker"]
+    if check_sudoers_for_docker(logger):
+        return ["sudo", "docker"]
+    return None
+
+def compose_project_name(compose_file):
+    """docker compose 기본 프로젝트명 (COMPOSE_PROJECT_NAME > compose 파일 디렉토리명)"""
+    name = os.environ.get("COMPOSE_PROJECT_NAME") or Path(compose_file).resolve().parent.name
+    return re.sub(r"[^a-z0-9_-]", "", name.lower())
+
+def service_containers(client, service, compose_file):
+    """
+    서비스 그룹의 컨테이너 상태 목록 (compose 라벨 기준, API 요청 1회)
+    반환: [{"service", "container", "id", "image", "state", "status", "health", "ports"}, ...]
+    """
+    labels = [f"com.docker.compose.project={compose_project_name(compose_file)}"]
+    wanted = set(SERVICE_MAP[service])
+    rows = [docker_api.container_row(item) for item in client.containers(labels)]
+    if wanted:
+        rows = [row for row in rows if row["service"] in wanted]
+    return sorted(rows, key=lambda row: (row["service"], row["container"]))
+
+def format_container_table(rows):
+    if not rows:
+        return "[INFO] 실행 중인(또는 생성된) 컨테이너가 없습니다."
+    header = f"{'SERVICE':<16}{'CONTAINER':<28}{'STATE':<10}{'HEALTH':<11}STATUS"
+    lines = [header]
+    for row in rows:
+        lines.append(
+            f"{row['service']:<16}{row['container']:<28}{row['state']:<10}{row['health']:<11}{row['status']}"
+        )
+    return "\n".join(lines)
+
+# sync-templates --watch --reload: 설정 변경 시 재시작 대신 보낼 리로드 시그널
+# (vault: SIGHUP으로 설정 재로딩, logstash: SIGHUP으로 파이프라인 재로딩)
+RELOAD_TARGETS = {
+    "vault": [("vault", "HUP")],
+    "elk": [("logstash", "HUP")],
+}
+
+def reload_service(service, logger=print, client=None):
+    """
+    서비스 컨테이너에 리로드 시그널 전송. 반환: 성공한 컨테이너 목록
+    Engine API 우선, 소켓 접근 불가 시 sudo -n docker kill --signal
+    """
+    targets = RELOAD_TARGETS.get(service)
+    if not targets:
+        logger(f"[SKIP] {service}: 리로드 시그널 미지원 (필요 시 compose restart)")
+        return []
+    owned = client is None and docker_api.socket_accessible()
+    if owned:
+        client = docker_api.DockerClient()
+    reloaded = []
+    for container, signal in targets:
+        if client is not None:
+            try:
+                client.kill(container, signal)
+                error = None
+            except (OSError, docker_api.DockerAPIError) as e:
+                error = str(e)
+        else:
+            cmd = ["sudo", "-n", "docker", "kill", f"--signal={signal}", container]
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            error = None if result.returncode == 0 else result.stderr.decode().strip()
+        if error is None:
+            logger(f"[OK] {container} 리로드 시그널(SIG{signal}) 전송")
+            reloaded.append(container)
+        else:
+            logger(f"[FAIL] {container} 리로드 시그널 전송 실패: {error}")
+    if owned:
+        client.close()
+    return reloaded
+
+def compose_command(action, service, compose_file, logger, make_audit_log, client=None,
+                    orchestrate=True, timeout=None, dry_run=False):
+    """
+    ps|status|health: Engine API로 조회해 컨테이너 상태 목록(list[dict]) 반환
+    reconcile: 입력 해시가 바뀐 서비스만 재시작/재생성, 서비스별 결과(list[dict]) 반환
+    up (orchestrate, 소켓 접근 가능 시): 의존성 순서 병렬 기동 + 헬스 게이팅, 서비스별 타임라인(list[dict]) 반환
+    up|down|restart|logs: docker compose 실행 후 "[성공]" 반환
+    """
+    if service not in SERVICE_MAP:
         logger.error(make_audit_log("compose-실패", action=action, service=service, result="서비스미지원"))
         raise ValueError(f"[ERROR] 지원하지 않는 서비스: {service}")
-    svc_args = service_map[service]
-    cmd = ["sudo", "docker", "compose", "-f", str(compose_file)]
+    svc_args = SERVICE_MAP[service]
+
+    if action == "reconcile":
+        from security_infra.compose_reconcile import reconcile
+        prefix = ["docker"] if dry_run else docker_cli_prefix(logger)
+        if prefix is None:
+            logger.error(make_audit_log("compose-실패", action=action, service=service, result="sudoers미설정"))
+            raise PermissionError("[ERROR] sudoers 설정이 필요합니다.")
+        owned = client is None and not dry_run and docker_api.socket_accessible()
+        if owned:
+            client = docker_api.DockerClient()
+        logger.info(make_audit_log("compose-실행시도", action=action, service=service, dry_run=dry_run))
+        try:
+            rows = reconcile(compose_file, svc_args or None, prefix, client=client, dry_run=dry_run, logger=logger.info)
+        except (OSError, ValueError) as e:
+            logger.error(make_audit_log("compose-실패", action=action, service=service, result="실패", error=str(e)))
+            raise RuntimeError(f"[실패] reconcile 오류: {e}")
+        finally:
+            if owned:
+                client.close()
+        failed = [r["service"] for r in rows if r["status"] == "FAIL"]
+        (logger.error if failed else logger.info)(make_audit_log(
+            "compose-실패" if failed else "compose-성공", action=action, service=service,
+            result="실패" if failed else "OK", dry_run=dry_run,
+            actions={r["service"]: r["action"] for r in rows if r["action"] != "none"},
+        ))
+        return rows
+
+    if action == "up" and orchestrate and (client is not None or docker_api.socket_accessible()):
+        from security_infra.compose_orchestrator import DEFAULT_TIMEOUT, orchestrated_up
+        logger.info(make_audit_log("compose-실행시도", action=action, service=service, cmd="orchestrated-up"))
+        try:
+            rows = orchestrated_up(
+                compose_file, svc_args, ["docker"], client=client,
+                timeout=timeout or DEFAULT_TIMEOUT, logger=logger.info,
+            )
+        except (OSError, ValueError, subprocess.CalledProcessError, docker_api.DockerAPIError) as e:
+            logger.error(make_audit_log("compose-실패", action=action, service=service, result="실패", error=str(e)))
+            raise RuntimeError(f"[실패] 오케스트레이션 기동 오류: {e}")
+        from security_infra.compose_reconcile import mark_deployed
+        mark_deployed(compose_file, [r["service"] for r in rows if r["status"] == "OK"])
+        failed = [r["service"] for r in rows if r["status"] != "OK"]
+        event = "compose-실패" if failed else "compose-성공"
+        log = logger.error if failed else logger.info
+        log(make_audit_log(
+            event, action=action, service=service, result="실패" if failed else "OK", failed=failed,
+            ready_s={r["service"]: round(r["ready_s"], 1) for r in rows if r["ready_s"] is not None},
+        ))
+        return rows
+
+    if action in QUERY_ACTIONS and (client is not None or docker_api.socket_accessible()):
+        logger.info(make_audit_log("compose-실행시도", action=action, service=service, cmd="docker-api GET /containers/json"))
+        try:
+            if client is None:
+                with docker_api.DockerClient() as session:
+                    rows = service_containers(session, service, compose_file)
+            else:
+                rows = service_containers(client, service, compose_file)
+        except (OSError, docker_api.DockerAPIError) as e:
+            logger.error(make_audit_log("compose-실패", action=action, service=service, result="실패", error=str(e)))
+            raise RuntimeError(f"[실패] Docker API 조회 오류: {e}")
+        logger.info(make_audit_log("compose-성공", action=action, service=service, result="OK", containers=len(rows)))
+        return rows
+
     if action == "up":
-        cmd += ["up", "-d"] + svc_args
+        args = ["up", "-d"] + svc_args
     elif action == "down":
-        cmd += ["down"] + svc_args
+        args = ["down"] + svc_args
     elif action == "restart":
-        cmd += ["restart"] + svc_args
+        args = ["restart"] + svc_args
     elif action == "logs":
-        cmd += ["logs", "-f"] + svc_args
-    elif action in ["ps", "status"]:
-        cmd += ["ps"] + svc_args
+        args = ["logs", "-f"] + svc_args
+    elif action in QUERY_ACTIONS:
+        args = ["ps"] + svc_args
     else:
         logger.error(make_audit_log("compose-실패", action=action, service=service, result="action미지원"))
         raise ValueError(f"[ERROR] 지원하지 않는 action: {action}")
 
-    # 1. audit log (실행 전)
-    logger.info(make_audit_log("compose-실행시도", action=action, service=service, cmd=" ".join(cmd)))
-
-    # 2. sudoers 체크
-    if not check_sudoers_for_docker(logger):
+    # 1. 실행 접두어 (소켓 직접 접근 불가 시 sudoers 확인, 결과는 세션 동안 캐시)
+    prefix = docker_cli_prefix(logger)
+    if prefix is None:
         logger.error(make_audit_log("compose-실패", action=action, service=service, result="sudoers미설정"))
         raise PermissionError("[ERROR] sudoers 설정이 필요합니다.")
+    cmd = prefix + ["compose", "-f", str(compose_file)] + args
+
+    # 2. audit log (실행 전)
+    logger.info(make_audit_log("compose-실행시도", action=action, service=service, cmd=" ".join(cmd)))
 
     # 3. compose 명령 실행
     try:
         result = subprocess.run(cmd, check=True)
+        if action == "up":
+            from security_infra.compose_reconcile import mark_deployed, plan_reconcile
+            mark_deployed(compose_file, svc_args or [r["service"] for r in plan_reconcile(compose_file)])
         logger.info(make_audit_log("compose-성공", action=action, service=service, result="OK"))
         return "[성공]"
     except subprocess.CalledProcessError as e:
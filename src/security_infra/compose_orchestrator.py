@@ -0,0 +1,211 @@
+# src/security_infra/compose_orchestrator.py
+"""
+compose up 오케스트레이션: depends_on 그래프 기준 병렬 기동 + healthcheck 게이팅
+- 컨테이너/네트워크 생성은 `docker compose up --no-start` 1회
+- 시작은 Engine API(POST /containers/{id}/start), 의존 서비스가 준비되는 즉시 시작
+  (condition: service_healthy → healthy까지, 그 외 → 실행 시작까지 대기)
+- 헬스 대기는 고정 sleep 대신 asyncio 폴링 + 지수 백오프
+- 서비스별 대기/시작/준비 시각 타임라인 반환
+"""
+
+import asyncio
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+from security_infra import docker_api
+
+DEFAULT_TIMEOUT = 600.0         # 서비스당 준비 대기 한도(초)
+POLL_INITIAL = 0.5
+POLL_FACTOR = 1.5
+POLL_MAX = 5.0
+
+def load_dependencies(compose_file: Path) -> Dict[str, Dict[str, str]]:
+    """docker-compose.yml → {서비스: {의존 서비스: condition}} (리스트 형식은 service_started)"""
+    with open(compose_file, "r", encoding="utf-8") as f:
+        compose = yaml.safe_load(f) or {}
+    graph = {}
+    for name, definition in (compose.get("services") or {}).items():
+        depends = (definition or {}).get("depends_on") or {}
+        if isinstance(depends, list):
+            depends = {dep: "service_started" for dep in depends}
+        else:
+            depends = {dep: (opts or {}).get("condition", "service_started") for dep, opts in depends.items()}
+        graph[name] = depends
+    return graph
+
+def resolve_services(graph: Dict[str, Dict[str, str]], services: List[str]) -> List[str]:
+    """선택 서비스 + 전이 의존 서비스 (빈 목록 = 전체). 순환 의존이면 ValueError"""
+    wanted = list(services) or list(graph)
+    selected, visiting = [], set()
+
+    def visit(name, chain):
+        if name in selected:
+            return
+        if name not in graph:
+            raise ValueError(f"[ERROR] compose 파일에 없는 서비스: {name}")
+        if name in visiting:
+            raise ValueError(f"[ERROR] 순환 의존: {' → '.join(chain + [name])}")
+        visiting.add(name)
+        for dep in graph[name]:
+            visit(dep, chain + [name])
+        visiting.discard(name)
+        selected.append(name)
+
+    for name in wanted:
+        visit(name, [])
+    return selected
+
+def readiness(row: Optional[dict]) -> str:
+    """컨테이너 상태 → ready | started | waiting | failed"""
+    if row is None:
+        return "waiting"
+    if row["state"] in ("exited", "dead"):
+        return "failed"
+    if row["state"] != "running":
+        return "waiting"
+    if row["health"] in ("healthy", "none"):
+        return "ready"
+    if row["health"] == "unhealthy":
+        return "failed"
+    return "started"
+
+class StackOrchestrator:
+    """
+    client: DockerClient 호환 객체 (containers(labels), start(id))
+    """
+
+    def __init__(
+        self,
+        client,
+        project: str,
+        graph: Dict[str, Dict[str, str]],
+        timeout: float = DEFAULT_TIMEOUT,
+        poll_initial: float = POLL_INITIAL,
+        poll_max: float = POLL_MAX,
+        logger: Callable[[str], None] = print,
+    ):
+        self.client = client
+        self.project = project
+        self.graph = graph
+        self.timeout = timeout
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.logger = logger
+
+    async def _call(self, fn, *args):
+        # 동기 클라이언트(단일 keep-alive 연결)를 스레드에서 호출해 이벤트 루프를 막지 않음
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def _container(self, service: str) -> Optional[dict]:
+        labels = [f"com.docker.compose.project={self.project}", f"com.docker.compose.service={service}"]
+        items = await self._call(self.client.containers, labels)
+        return docker_api.container_row(items[0]) if items else None
+
+    async def _bring_up(self, service: str, started: Dict[str, asyncio.Event], ready: Dict[str, asyncio.Event],
+                        failed: Dict[str, str], t0: float) -> dict:
+        row = {"service": service, "depends_on": sorted(self.graph[service]), "status": "OK",
+               "wait_s": 0.0, "start_s": None, "ready_s": None, "health": "", "error": ""}
+        # 1) 의존 서비스 대기 (condition별)
+        for dep, condition in self.graph[service].items():
+            gate = ready[dep] if condition == "service_healthy" else started[dep]
+            await gate.wait()
+            if dep in failed:
+                row.update(status="SKIP", error=f"의존 서비스 실패: {dep}")
+                failed[service] = row["error"]
+                started[service].set()
+                ready[service].set()
+                return row
+        row["wait_s"] = time.perf_counter() - t0
+
+        # 2) 시작 → 3) 준비 상태까지 백오프 폴링
+        try:
+            current = await self._container(service)
+            if current is None:
+                raise RuntimeError("컨테이너 없음 (compose up --no-start 실패?)")
+            await self._call(self.client.start, current["id"])
+            row["start_s"] = time.perf_counter() - t0
+            started[service].set()
+            self.logger(f"[INFO] {service} 시작 ({row['start_s']:.1f}s)")
+
+            delay, deadline = self.poll_initial, time.perf_counter() + self.timeout
+            while True:
+                current = await self._container(service)
+                state = readiness(current)
+                row["health"] = current["health"] if current else ""
+                if state == "ready":
+                    break
+                if state == "failed":
+                    raise RuntimeError(f"상태 {current['state']}/{current['health']}: {current['status']}")
+                if time.perf_counter() > deadline:
+                    raise TimeoutError(f"{int(self.timeout)}s 내 준비되지 않음 (health={row['health']})")
+                await asyncio.sleep(delay)
+                delay = min(delay * POLL_FACTOR, self.poll_max)
+            row["ready_s"] = time.perf_counter() - t0
+            self.logger(f"[OK] {service} 준비 완료 ({row['ready_s']:.1f}s, health={row['health']})")
+        except Exception as e:
+            row.update(status="FAIL", error=str(e))
+            failed[service] = str(e)
+            self.logger(f"[FAIL] {service} 기동 실패: {e}")
+        finally:
+            started[service].set()
+            ready[service].set()
+        return row
+
+    async def run(self, services: List[str]) -> List[dict]:
+        started = {name: asyncio.Event() for name in services}
+        ready = {name: asyncio.Event() for name in services}
+        failed: Dict[str, str] = {}
+        t0 = time.perf_counter()
+        tasks = [self._bring_up(name, started, ready, failed, t0) for name in services]
+        return list(await asyncio.gather(*tasks))
+
+def format_timeline(rows: List[dict], width: int = 30) -> str:
+    """서비스별 대기/기동 구간 타임라인 (준비 시각 순)"""
+    total = max([r["ready_s"] or 0.0 for r in rows] + [0.001])
+    lines = [f"서비스 기동 타임라인 (총 {total:.1f}s, '.'=의존 대기, '#'=시작~준비):"]
+    for r in sorted(rows, key=lambda r: (r["ready_s"] is None, r["ready_s"] or 0.0)):
+        if r["status"] != "OK":
+            lines.append(f"  [{r['status']}] {r['service']:<15} {r['error']}")
+            continue
+        wait_cols = int(r["wait_s"] / total * width)
+        run_cols = max(1, int((r["ready_s"] - r["wait_s"]) / total * width))
+        bar = ("." * wait_cols + "#" * run_cols).ljust(width)
+        deps = f" (대기: {', '.join(r['depends_on'])})" if r["depends_on"] else ""
+        lines.append(
+            f"  [OK] {r['service']:<15} |{bar}| 시작 {r['start_s']:.1f}s → 준비 {r['ready_s']:.1f}s "
+            f"(time-to-healthy {r['ready_s'] - r['start_s']:.1f}s, health={r['health']}){deps}"
+        )
+    return "\n".join(lines)
+
+def orchestrated_up(
+    compose_file: Path,
+    services: List[str],
+    cli_prefix: List[str],
+    client=None,
+    timeout: float = DEFAULT_TIMEOUT,
+    logger: Callable[[str], None] = print,
+) -> List[dict]:
+    """
+    컨테이너 생성(compose up --no-start, 1회) 후 의존 그래프 순서로 병렬 시작 + 헬스 게이팅
+    반환: 서비스별 타임라인 행 목록
+    """
+    from security_infra.compose_manager import compose_project_name
+
+    graph = load_dependencies(compose_file)
+    selected = resolve_services(graph, services)
+    cmd = cli_prefix + ["compose", "-f", str(compose_file), "up", "--no-start"] + selected
+    subprocess.run(cmd, check=True)
+
+    owned = client is None
+    if owned:
+        client = docker_api.DockerClient()
+    try:
+        orchestrator = StackOrchestrator(client, compose_project_name(compose_file), graph, timeout, logger=logger)
+        return asyncio.run(orchestrator.run(selected))
+    finally:
+        if owned:
+            client.close()
@@ -0,0 +1,239 @@
+# src/security_infra/compose_reconcile.py
+"""
+compose reconcile: 입력이 바뀐 서비스만 재시작/재생성
+- 서비스 입력 = compose 서비스 정의 + 참조 환경변수 값 + 마운트된 템플릿 결과(sync-templates 상태)
+  + 마운트된 인증서(cert 매니페스트 지문)
+- 파일을 다시 읽지 않고 sync-templates/generate-certificates가 기록한 해시/지문만 사용
+- 정의/환경변수 변경 → 재생성(force-recreate), 설정/인증서만 변경 → 재시작
+- 성공한 서비스만 docker/.deploy-state.json에 새 해시 기록
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+from security_infra.file_utils import atomic_write
+
+DEPLOY_STATE_FILE = "docker/.deploy-state.json"
+TEMPLATE_STATE_FILE = "docker/.template-state.json"
+CERT_MANIFEST_FILE = "docker/certs.json"
+
+# 입력 종류별 조치 (정의/환경변수는 컨테이너 재생성이 필요)
+RECREATE_INPUTS = ("definition", "env")
+RESTART_INPUTS = ("config", "certs")
+
+# ${VAR}, ${VAR:-default}, ${VAR-default}, $VAR ($$는 이스케이프)
+ENV_REFERENCE = re.compile(r"\$\$|\$\{([A-Za-z_][A-Za-z0-9_]*)(?::?-[^}]*)?\}|\$([A-Za-z_][A-Za-z0-9_]*)")
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def _load_json(path: Path) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def load_compose_env(compose_file: Path) -> Dict[str, str]:
+    """compose와 같은 우선순위: 셸 환경변수 > compose 파일 옆 .env"""
+    env_file = Path(compose_file).parent / ".env"
+    values = {}
+    if env_file.exists():
+        from dotenv import dotenv_values
+        values = {k: v for k, v in dotenv_values(env_file).items() if v is not None}
+    values.update(os.environ)
+    return values
+
+def env_references(definition) -> List[str]:
+    """서비스 정의에서 참조하는 환경변수 이름 목록"""
+    text = json.dumps(definition, ensure_ascii=False)
+    names = set()
+    for m in ENV_REFERENCE.finditer(text):
+        name = m.group(1) or m.group(2)
+        if name:
+            names.add(name)
+    return sorted(names)
+
+def bind_sources(definition: dict, base_dir: Path) -> List[Path]:
+    """bind 마운트 호스트 경로 목록 (short/long 문법, named volume 제외)"""
+    sources = []
+    for volume in definition.get("volumes") or []:
+        if isinstance(volume, dict):
+            if volume.get("type") != "bind":
+                continue
+            source = volume.get("source", "")
+        else:
+            source = str(volume).split(":", 1)[0]
+            if not source.startswith((".", "/", "~")):
+                continue
+        sources.append((base_dir / os.path.expanduser(source)).resolve())
+    return sources
+
+def _under(path: Path, roots: List[Path]) -> bool:
+    return any(path == root or root in path.parents for root in roots)
+
+def service_inputs(
+    definition: dict,
+    env: Dict[str, str],
+    base_dir: Path,
+    template_state: dict,
+    cert_manifest: dict,
+) -> Dict[str, str]:
+    """서비스 입력 종류별 해시 {"definition", "env", "config", "certs"}"""
+    sources = bind_sources(definition, base_dir)
+    config = {
+        dst: entry.get("sha256")
+        for dst, entry in template_state.items()
+        if _under((base_dir / dst).resolve(), sources)
+    }
+    certs = {
+        name: [entry.get("fingerprint_sha256"), entry.get("key_hash")]
+        for name, entry in (cert_manifest.get("certs") or {}).items()
+        if _under(Path(entry.get("cert_path", "")).resolve(), sources)
+    }
+    return {
+        "definition": _digest(definition),
+        "env": _digest({name: env.get(name) for name in env_references(definition)}),
+        "config": _digest(config),
+        "certs": _digest(certs),
+    }
+
+def plan_reconcile(
+    compose_file: Path,
+    services: Optional[List[str]] = None,
+    state: Optional[dict] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> List[dict]:
+    """
+    서비스별 조치 계획: none | restart | recreate | baseline(기록 없음 → 현재 상태를 기준으로 기록)
+    """
+    compose_file = Path(compose_file)
+    base_dir = compose_file.resolve().parent
+    with open(compose_file, "r", encoding="utf-8") as f:
+        definitions = (yaml.safe_load(f) or {}).get("services") or {}
+    if state is None:
+        state = _load_json(base_dir / DEPLOY_STATE_FILE)
+    env = load_compose_env(compose_file) if env is None else env
+    template_state = _load_json(base_dir / TEMPLATE_STATE_FILE)
+    cert_manifest = _load_json(base_dir / CERT_MANIFEST_FILE)
+
+    plan = []
+    for name in services or list(definitions):
+        if name not in definitions:
+            raise ValueError(f"[ERROR] compose 파일에 없는 서비스: {name}")
+        inputs = service_inputs(definitions[name], env, base_dir, template_state, cert_manifest)
+        previous = (state.get(name) or {}).get("inputs")
+        if previous is None:
+            action, changed = "baseline", []
+        else:
+            changed = [kind for kind in inputs if previous.get(kind) != inputs[kind]]
+            if any(kind in RECREATE_INPUTS for kind in changed):
+                action = "recreate"
+            elif changed:
+                action = "restart"
+            else:
+                action = "none"
+        plan.append({"service": name, "action": action, "changed": changed,
+                     "hash": _digest(inputs), "inputs": inputs, "status": "", "error": ""})
+    return plan
+
+def record_state(state: dict, rows: List[dict], state_path: Path):
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    for row in rows:
+        if row["status"] == "OK":
+            state[row["service"]] = {"hash": row["hash"], "inputs": row["inputs"], "deployed_at": now}
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+    atomic_write(state_path, data, mode=0o644)
+
+def mark_deployed(compose_file: Path, services: List[str]):
+    """compose up 직후 현재 입력 해시를 배포 상태로 기록 (다음 reconcile의 기준)"""
+    if not services:
+        return
+    compose_file = Path(compose_file)
+    state_path = compose_file.resolve().parent / DEPLOY_STATE_FILE
+    state = _load_json(state_path)
+    rows = plan_reconcile(compose_file, services, state)
+    for row in rows:
+        row["status"] = "OK"
+    record_state(state, rows, state_path)
+
+def reconcile(
+    compose_file: Path,
+    services: Optional[List[str]],
+    cli_prefix: List[str],
+    client=None,
+    dry_run: bool = False,
+    logger: Callable[[str], None] = print,
+    runner: Callable = subprocess.run,
+) -> List[dict]:
+    """
+    입력 해시가 바뀐 서비스만 재생성(docker compose up -d --no-deps --force-recreate, 1회)
+    또는 재시작(Engine API, 클라이언트 없으면 docker compose restart) 후 새 해시 기록
+    """
+    from security_infra.compose_manager import compose_project_name
+
+    compose_file = Path(compose_file)
+    state_path = compose_file.resolve().parent / DEPLOY_STATE_FILE
+    state = _load_json(state_path)
+    plan = plan_reconcile(compose_file, services, state)
+    if dry_run:
+        return plan
+
+    base_cmd = cli_prefix + ["compose", "-f", str(compose_file)]
+    recreate = [r for r in plan if r["action"] == "recreate"]
+    restart = [r for r in plan if r["action"] == "restart"]
+
+    if recreate:
+        names = [r["service"] for r in recreate]
+        try:
+            runner(base_cmd + ["up", "-d", "--no-deps", "--force-recreate"] + names, check=True)
+            for r in recreate:
+                r["status"] = "OK"
+                logger(f"[OK] {r['service']} 재생성 (변경: {', '.join(r['changed'])})")
+        except subprocess.CalledProcessError as e:
+            for r in recreate:
+                r.update(status="FAIL", error=str(e))
+                logger(f"[FAIL] {r['service']} 재생성 실패: {e}")
+
+    project = compose_project_name(compose_file)
+    for r in restart:
+        try:
+            if client is not None:
+                labels = [f"com.docker.compose.project={project}", f"com.docker.compose.service={r['service']}"]
+                containers = client.containers(labels)
+                if not containers:
+                    raise RuntimeError("컨테이너 없음")
+                for item in containers:
+                    client.restart(item["Id"])
+            else:
+                runner(base_cmd + ["restart", r["service"]], check=True)
+            r["status"] = "OK"
+            logger(f"[OK] {r['service']} 재시작 (변경: {', '.join(r['changed'])})")
+        except Exception as e:
+            r.update(status="FAIL", error=str(e))
+            logger(f"[FAIL] {r['service']} 재시작 실패: {e}")
+
+    for r in plan:
+        if r["action"] in ("none", "baseline"):
+            r["status"] = "OK"
+    record_state(state, plan, state_path)
+    return plan
+
+def format_reconcile(rows: List[dict], dry_run: bool = False) -> str:
+    labels = {"none": "변경 없음", "restart": "재시작", "recreate": "재생성", "baseline": "기준 기록"}
+    lines = ["reconcile 계획 (dry-run):" if dry_run else "reconcile 결과:"]
+    for r in rows:
+        changed = f" (변경: {', '.join(r['changed'])})" if r["changed"] else ""
+        status = "PLAN" if dry_run else (r["status"] or "OK")
+        error = f" - {r['error']}" if r["error"] else ""
+        lines.append(f"  [{status}] {r['service']:<15} {labels[r['action']]}{changed}{error}")
+    return "\n".join(lines)
@@ -1,20 +1,199 @@
 # src/security_infra/debug_vault_token.py
 """
 Vault Agent가 발급한 토큰의 상태 및 정책을 직접 진단하는 디버그 스크립트
+- TokenStatusClient / token_status(): 모니터링용 경량 상태 조회
+  (auth/token/lookup-self를 keep-alive 세션으로 호출, 짧은 TTL 또는 토큰 파일 변경 전까지 결과 캐시, subprocess 없음,
+   state_file 지정 시 사용자 전용 상태 파일로 캐시를 공유 → 1회성 CLI 실행 사이에서도 재사용)
+- print_token_and_policy(): vault CLI + REST 결과를 그대로 출력하는 수동 디버깅용
 """
 
+import hashlib
+import json
 import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
 import requests
 import subprocess
 
+from security_infra.file_utils import USER_STATE_DIR, atomic_write, file_signature, private_dir, read_private_file
+from security_infra.vault_client import VaultError, VaultSession
+
 VAULT_ADDR = "https://127.0.0.1:8200"
 VAULT_TOKEN_PATH = "/etc/vault-agent/vault-token"
 VAULT_CACERT = "/etc/ssl/certs/vault.crt"
+STATUS_CACHE_TTL = 5.0           # 조회 결과 재사용 시간(초)
+MIN_TTL = 60                     # 남은 TTL이 이보다 짧으면 healthy=False
+
+def status_state_file(vault_addr: str = VAULT_ADDR, token_path: str = VAULT_TOKEN_PATH) -> Path:
+    """(주소, 토큰 파일)별 상태 캐시 파일 경로 (USER_STATE_DIR 아래)"""
+    digest = hashlib.sha256(f"{vault_addr}\0{token_path}".encode()).hexdigest()[:16]
+    return USER_STATE_DIR / f"token-status-{digest}.json"
 
 def get_vault_token(token_path=VAULT_TOKEN_PATH):
     with open(token_path, "r") as f:
         return f.read().strip()
 
+class TokenStatusClient:
+    """
+    토큰 상태 조회 (스레드 안전, 프로세스당 1개 재사용 권장)
+    status(): ok/healthy/ttl/renewable/policies/expire_time/... (토큰 값은 포함하지 않음)
+    state_file: 조회 결과를 프로세스 간 공유할 파일 (None이면 프로세스 내 캐시만)
+    """
+
+    def __init__(
+        self,
+        vault_addr: str = VAULT_ADDR,
+        token_path: str = VAULT_TOKEN_PATH,
+        cacert=VAULT_CACERT,
+        cache_ttl: float = STATUS_CACHE_TTL,
+        min_ttl: float = MIN_TTL,
+        clock: Callable[[], float] = time.monotonic,
+        state_file: Optional[Path] = None,
+    ):
+        self.vault = VaultSession(vault_addr, verify=cacert)
+        self.token_path = token_path
+        self.cache_ttl = cache_ttl
+        self.min_ttl = min_ttl
+        self.clock = clock
+        self.state_file = Path(state_file) if state_file else None
+        self._lock = threading.Lock()
+        self._cached: Optional[dict] = None
+        self._cached_sig = None
+        self._expires = 0.0
+        self._checked = 0.0
+        self.counters = {"lookups": 0, "hits": 0}
+
+    def _lookup(self) -> dict:
+        try:
+            token = get_vault_token(self.token_path)
+        except OSError as e:
+            return {"ok": False, "error": f"토큰 파일 읽기 실패: {e}"}
+        if not token:
+            return {"ok": False, "error": "토큰 파일이 비어 있음"}
+        try:
+            data = self.vault.request("GET", "auth/token/lookup-self", token=token).get("data") or {}
+        except VaultError as e:
+            return {"ok": False, "status": e.status, "error": "; ".join(e.errors) or "Vault 응답 오류"}
+        except requests.RequestException as e:
+            return {"ok": False, "error": f"Vault 연결 실패: {e.__class__.__name__}"}
+        return {
+            "ok": True,
+            "ttl": int(data.get("ttl") or 0),
+            "renewable": bool(data.get("renewable")),
+            "policies": sorted(set(data.get("policies") or []) | set(data.get("identity_policies") or [])),
+            "expire_time": data.get("expire_time"),
+            "display_name": data.get("display_name"),
+        }
+
+    def _load_state(self, sig, now: float) -> bool:
+        """상태 파일의 결과가 같은 대상/토큰 파일이고 아직 유효하면 메모리 캐시로 적재"""
+        if self.state_file is None or sig is None:
+            return False
+        raw = read_private_file(self.state_file)
+        try:
+            state = json.loads(raw) if raw else {}
+            target_ok = state.get("target") == [self.vault.vault_addr, self.token_path]
+            checked, expires = float(state["result"]["checked_at"]), float(state["expires_at"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return False
+        wall = time.time()
+        if not target_ok or state.get("token_signature") != sig or not checked <= wall < expires:
+            return False
+        self._cached = state["result"]
+        self._cached_sig = sig
+        self._checked = now - (wall - checked)
+        self._expires = now + (expires - wall)
+        return True
+
+    def _save_state(self):
+        if self.state_file is None or self._cached_sig is None or not private_dir(self.state_file.parent, create=True):
+            return
+        state = {
+            "target": [self.vault.vault_addr, self.token_path],
+            "token_signature": self._cached_sig,
+            "expires_at": self._cached["checked_at"] + (self._expires - self._checked),
+            "result": self._cached,
+        }
+        try:
+            atomic_write(self.state_file, json.dumps(state, ensure_ascii=False).encode("utf-8"), mode=0o600)
+        except OSError:
+            pass
+
+    def status(self, min_ttl: Optional[float] = None) -> dict:
+        """
+        캐시가 유효하면(cache_ttl 이내 + 토큰 파일 그대로) Vault 호출 없이 반환, ttl은 경과 시간만큼 차감
+        min_ttl: 호출별 healthy 기준 (미지정시 생성 시 값) — 조회 결과 캐시와 무관하게 매번 적용
+        """
+        min_ttl = self.min_ttl if min_ttl is None else min_ttl
+        with self._lock:
+            sig = file_signature(self.token_path)
+            now = self.clock()
+            if (self._cached is not None and now < self._expires and sig == self._cached_sig) or self._load_state(sig, now):
+                self.counters["hits"] += 1
+                cached = True
+            else:
+                self.counters["lookups"] += 1
+                self._cached = self._lookup()
+                self._cached["checked_at"] = time.time()
+                self._cached_sig = sig
+                self._checked = now
+                ttl = self._cached.get("ttl")
+                # 토큰 만료가 캐시 시간보다 먼저 오면 만료 시점까지만 캐시
+                self._expires = now + (min(self.cache_ttl, ttl) if ttl else self.cache_ttl)
+                self._save_state()
+                cached = False
+            result = dict(self._cached)
+            age = now - self._checked
+        if result["ok"] and result["ttl"]:
+            result["ttl"] = max(0, int(result["ttl"] - age))
+            result["healthy"] = result["ttl"] >= min_ttl
+        else:
+            # ttl 0 = 만료 없는 토큰 (root 등)
+            result["healthy"] = result["ok"]
+        result["cached"] = cached
+        return result
+
+    def invalidate(self):
+        with self._lock:
+            self._cached = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counters)
+
+    def close(self):
+        self.vault.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_status_clients = {}
+_status_lock = threading.Lock()
+
+def token_status(
+    vault_addr: str = VAULT_ADDR,
+    token_path: str = VAULT_TOKEN_PATH,
+    cacert=VAULT_CACERT,
+    min_ttl: Optional[float] = None,
+    **kwargs,
+) -> dict:
+    """
+    (주소, 토큰 파일, 클라이언트 옵션)별 프로세스 공용 클라이언트로 상태 조회 — 서비스 헬스체크에서 반복 호출용
+    min_ttl은 호출마다 적용 (기준이 다른 호출도 같은 조회 캐시 공유)
+    """
+    key = (vault_addr, token_path, str(cacert), tuple(sorted(kwargs.items())))
+    with _status_lock:
+        client = _status_clients.get(key)
+        if client is None:
+            client = _status_clients[key] = TokenStatusClient(vault_addr, token_path, cacert, **kwargs)
+    return client.status(min_ttl)
+
 def print_token_and_policy():
     token = get_vault_token()
     print(">> [DEBUG] 토큰 값 앞 20글자:", token[:20], "...")
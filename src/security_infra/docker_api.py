@@ -0,0 +1,188 @@
+# src/security_infra/docker_api.py
+"""
+Docker Engine API 클라이언트 (unix 소켓, 표준 라이브러리만 사용)
+- 세션당 HTTP/1.1 keep-alive 연결 1개 재사용 (끊기면 1회 재연결)
+- docker CLI/sudo 서브프로세스 없이 ps/status/health를 구조화된 dict로 조회
+"""
+
+import http.client
+import json
+import os
+import re
+import socket
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import quote, urlencode
+
+DOCKER_SOCKET = "/var/run/docker.sock"
+API_VERSION = "v1.41"           # Docker Engine 20.10+
+DEFAULT_TIMEOUT = 10.0
+
+HEALTH_PATTERN = re.compile(r"\((healthy|unhealthy|health: starting)\)")
+
+class DockerAPIError(RuntimeError):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"[ERROR] Docker API {status}: {message}")
+        self.status = status
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float = DEFAULT_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+def default_socket_path() -> str:
+    """DOCKER_HOST=unix:///... 이면 해당 경로, 아니면 /var/run/docker.sock"""
+    host = os.environ.get("DOCKER_HOST", "")
+    if host.startswith("unix://"):
+        return host[len("unix://"):]
+    return DOCKER_SOCKET
+
+def socket_accessible(socket_path: Optional[str] = None) -> bool:
+    """현재 사용자가 sudo 없이 Docker 소켓에 접근 가능한지 (stat/access만, 연결 없음)"""
+    path = socket_path or default_socket_path()
+    return os.path.exists(path) and os.access(path, os.R_OK | os.W_OK)
+
+def parse_health(status: str, state: str) -> str:
+    """/containers/json Status 문자열 → healthy|unhealthy|starting|none (healthcheck 없음)|-(미실행)"""
+    if state != "running":
+        return "-"
+    m = HEALTH_PATTERN.search(status or "")
+    if not m:
+        return "none"
+    return "starting" if m.group(1) == "health: starting" else m.group(1)
+
+class DockerClient:
+    """
+    Docker Engine API 세션 (스레드 안전: 요청 단위 lock)
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._conn: Optional[UnixHTTPConnection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> UnixHTTPConnection:
+        if self._conn is None:
+            self._conn = UnixHTTPConnection(self.socket_path, self.timeout)
+        return self._conn
+
+    def request(self, method: str, path: str, params: Optional[dict] = None, body=None):
+        url = f"/{API_VERSION}{path}"
+        if params:
+            url += "?" + urlencode(params)
+        headers = {"Host": "docker"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        with self._lock:
+            for attempt in (1, 2):
+                conn = self._connection()
+                try:
+                    conn.request(method, url, body=payload, headers=headers)
+                    resp = conn.getresponse()
+                    data = resp.read()
+                    break
+                except (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                        BrokenPipeError, ConnectionResetError):
+                    # keep-alive 연결이 서버 쪽에서 닫힘 → 1회 재연결
+                    self.close_unlocked()
+                    if attempt == 2:
+                        raise
+        if resp.status >= 400:
+            try:
+                message = json.loads(data).get("message", "")
+            except ValueError:
+                message = data.decode(errors="replace")
+            raise DockerAPIError(resp.status, message)
+        if not data:
+            return None
+        if resp.getheader("Content-Type", "").startswith("application/json"):
+            return json.loads(data)
+        return data.decode(errors="replace")
+
+    def ping(self) -> bool:
+        try:
+            return self.request("GET", "/_ping") == "OK"
+        except (OSError, DockerAPIError):
+            return False
+
+    def containers(self, labels: Optional[List[str]] = None, all: bool = True) -> List[dict]:
+        params = {"all": "1" if all else "0"}
+        if labels:
+            params["filters"] = json.dumps({"label": labels})
+        return self.request("GET", "/containers/json", params) or []
+
+    def inspect(self, name: str) -> dict:
+        return self.request("GET", f"/containers/{quote(name)}/json")
+
+    def start(self, name: str):
+        """이미 실행 중이면 304 (오류 아님)"""
+        self.request("POST", f"/containers/{quote(name)}/start")
+
+    def kill(self, name: str, signal: str = "HUP"):
+        self.request("POST", f"/containers/{quote(name)}/kill", {"signal": signal})
+
+    def restart(self, name: str, timeout: int = 10):
+        self.request("POST", f"/containers/{quote(name)}/restart", {"t": timeout})
+
+    def open_logs(self, name: str, params: dict, timeout: Optional[float] = None):
+        """
+        로그 스트림용 전용 연결 (follow는 응답이 끝나지 않으므로 세션 연결을 점유하지 않음)
+        반환: (연결, 응답) — 호출자가 연결을 닫아야 함
+        """
+        conn = UnixHTTPConnection(self.socket_path, timeout)
+        conn.request("GET", f"/{API_VERSION}/containers/{quote(name)}/logs?{urlencode(params)}",
+                     headers={"Host": "docker"})
+        resp = conn.getresponse()
+        if resp.status >= 400:
+            data = resp.read()
+            conn.close()
+            try:
+                message = json.loads(data).get("message", "")
+            except ValueError:
+                message = data.decode(errors="replace")
+            raise DockerAPIError(resp.status, message)
+        return conn, resp
+
+    def close_unlocked(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def close(self):
+        with self._lock:
+            self.close_unlocked()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def container_row(item: dict) -> Dict[str, object]:
+    """/containers/json 항목 → ps/status 출력용 dict"""
+    labels = item.get("Labels") or {}
+    state = item.get("State", "")
+    status = item.get("Status", "")
+    ports = []
+    for p in item.get("Ports") or []:
+        if p.get("PublicPort"):
+            ports.append(f"{p.get('IP', '')}:{p['PublicPort']}->{p['PrivatePort']}/{p.get('Type', 'tcp')}")
+    return {
+        "service": labels.get("com.docker.compose.service", ""),
+        "container": (item.get("Names") or ["/"])[0].lstrip("/"),
+        "id": item.get("Id", "")[:12],
+        "image": item.get("Image", ""),
+        "state": state,
+        "status": status,
+        "health": parse_health(status, state),
+        "ports": ports,
+    }
@@ -0,0 +1,180 @@
+# src/security_infra/ff3_engine.py
+"""
+FF3-1 형식보존암호화(NIST SP 800-38G Rev.1) 배치 엔진
+- AES 키 스케줄은 암호기 생성 시 1회만 확장, 배치 전체에서 같은 ECB 암호기 재사용
+- 라운드마다 청크 내 모든 값의 입력 블록을 이어붙여 AES 호출 1번으로 처리
+  (값별 연산은 정수 덧셈/나머지뿐, 숫자열 ↔ 정수 변환은 시작/끝에 1번씩)
+- 8자리 환자번호 등: 길이/문자(기본 0-9) 유지, 같은 키/tweak이면 같은 결과(결정적)
+"""
+
+from typing import Dict, Iterable, List, Sequence
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+ROUNDS = 8
+DEFAULT_CHUNK = 4096             # 라운드당 AES 호출 1번에 넣을 값 개수
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+MIN_DOMAIN = 1_000_000           # radix^minlen >= 10^6 (SP 800-38G Rev.1)
+
+def _max_len(radix: int) -> int:
+    """2 * floor(log_radix(2^96))"""
+    n, limit = 0, 1 << 96
+    value = 1
+    while value * radix <= limit:
+        value *= radix
+        n += 1
+    return 2 * n
+
+def _min_len(radix: int) -> int:
+    n, value = 0, 1
+    while value < MIN_DOMAIN:
+        value *= radix
+        n += 1
+    return max(2, n)
+
+def _to_bytes(value, name: str) -> bytes:
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    try:
+        return bytes.fromhex(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"[ERROR] {name}는 16진수 문자열 또는 bytes여야 합니다.")
+
+def split_tweak(tweak: bytes, legacy_ff3: bool = False):
+    """
+    FF3-1 56비트 tweak → (T_L, T_R) 4바이트씩
+    T_L = T[0..27] || 0^4, T_R = T[32..55] || T[28..31] || 0^4
+    legacy_ff3=True일 때만 64비트 tweak 허용 (폐기된 기존 FF3: 앞/뒤 4바이트 — 테스트 벡터 검증 전용)
+    """
+    if len(tweak) == 7:
+        return tweak[:3] + bytes([tweak[3] & 0xF0]), tweak[4:7] + bytes([(tweak[3] & 0x0F) << 4])
+    if len(tweak) == 8 and legacy_ff3:
+        return tweak[:4], tweak[4:]
+    if len(tweak) == 8:
+        raise ValueError("[ERROR] 64비트 tweak은 폐기된 FF3 방식이라 사용할 수 없습니다 (FF3-1은 7바이트/56비트)")
+    raise ValueError(f"[ERROR] tweak 길이 오류: {len(tweak)}바이트 (FF3-1은 7바이트/56비트)")
+
+class FF3Cipher:
+    """
+    key: 16/24/32바이트 (16진수 문자열 가능), tweak: 7바이트 (FF3-1)
+    alphabet: 문자 집합 (기본 0-9, radix = len(alphabet))
+    AES 암호기 상태를 공유하므로 스레드마다 별도 인스턴스 사용 (프로세스 풀은 워커당 1개)
+    legacy_ff3: 8바이트 tweak(기존 FF3) 허용 — NIST FF3 테스트 벡터 검증 전용, 가명화 경로에서는 사용 금지
+    """
+
+    def __init__(self, key, tweak, alphabet: str = DIGITS[:10], chunk_size: int = DEFAULT_CHUNK,
+                 legacy_ff3: bool = False):
+        key = _to_bytes(key, "KEY")
+        if len(key) not in (16, 24, 32):
+            raise ValueError(f"[ERROR] KEY 길이 오류: {len(key)}바이트 (AES-128/192/256)")
+        if len(set(alphabet)) != len(alphabet) or not 2 <= len(alphabet) <= 2 ** 16:
+            raise ValueError("[ERROR] alphabet은 중복 없는 2자 이상 문자열이어야 합니다.")
+        self.alphabet = alphabet
+        self.radix = len(alphabet)
+        self.chunk_size = chunk_size
+        self.min_len = _min_len(self.radix)
+        self.max_len = _max_len(self.radix)
+        tl, tr = split_tweak(_to_bytes(tweak, "TWEAK"), legacy_ff3)
+        # 라운드별 W ⊕ [i]^4 를 미리 계산 (REVB 적용된 블록 뒤쪽 4바이트)
+        self._round_tails = []
+        for i in range(ROUNDS):
+            w = int.from_bytes(tr if i % 2 == 0 else tl, "big") ^ i
+            self._round_tails.append(w.to_bytes(4, "big")[::-1])
+        # FF3는 REVB(K)로 AES 키 스케줄 확장 → 암호기 1개를 계속 재사용 (ECB는 상태 없음)
+        self._encryptor = Cipher(algorithms.AES(key[::-1]), modes.ECB()).encryptor()
+        self._pow: Dict[int, int] = {}
+        # 표준 숫자 문자(0-9a-z)와 같은 alphabet이면 int()/str() 빠른 경로 사용
+        self._native = self.radix <= 36 and alphabet == DIGITS[:self.radix]
+        if not self._native:
+            self._index = {ch: i for i, ch in enumerate(alphabet)}
+
+    # ── 숫자열 ↔ 정수 (NUM_radix(REV(X)) / REV(STR^m_radix(x))) ──
+    def _num_rev(self, text: str) -> int:
+        if self._native:
+            return int(text[::-1], self.radix)
+        value = 0
+        for ch in reversed(text):
+            value = value * self.radix + self._index[ch]
+        return value
+
+    def _str_rev(self, value: int, length: int) -> str:
+        if self._native and self.radix == 10:
+            return str(value).zfill(length)[::-1]
+        out = []
+        for _ in range(length):
+            value, digit = divmod(value, self.radix)
+            out.append(self.alphabet[digit])
+        return "".join(out)
+
+    def _modulus(self, m: int) -> int:
+        mod = self._pow.get(m)
+        if mod is None:
+            mod = self._pow[m] = self.radix ** m
+        return mod
+
+    def valid(self, value: str) -> bool:
+        """FF3-1로 처리 가능한 값인지 (길이 범위 + alphabet)"""
+        return self.min_len <= len(value) <= self.max_len and not value.strip(self.alphabet)
+
+    def _validate(self, value: str):
+        if not self.min_len <= len(value) <= self.max_len:
+            raise ValueError(
+                f"[ERROR] 길이 {len(value)} 값은 FF3-1 범위({self.min_len}~{self.max_len}자, radix {self.radix}) 밖입니다."
+            )
+        if value.strip(self.alphabet):
+            raise ValueError(f"[ERROR] alphabet에 없는 문자가 포함된 값: {value!r}")
+
+    def _chunk(self, values: Sequence[str], decrypt: bool) -> List[str]:
+        lengths = [len(v) for v in values]
+        for v in values:
+            self._validate(v)
+        us = [(n + 1) // 2 for n in lengths]
+        # a = NUM(REV(A)), b = NUM(REV(B)) 정수 상태로 8라운드 진행
+        a = [self._num_rev(v[:u]) for v, u in zip(values, us)]
+        b = [self._num_rev(v[u:]) for v, u in zip(values, us)]
+        mods_u = [self._modulus(u) for u in us]
+        mods_v = [self._modulus(n - u) for n, u in zip(lengths, us)]
+        update = self._encryptor.update
+        order = range(ROUNDS - 1, -1, -1) if decrypt else range(ROUNDS)
+        for i in order:
+            tail = self._round_tails[i]
+            mods = mods_u if i % 2 == 0 else mods_v
+            # REVB(P) = REVB([NUM(REV(B))]^12) || REVB(W ⊕ [i]^4), 청크 전체를 AES 1회 호출
+            src = a if decrypt else b
+            out = update(b"".join(x.to_bytes(12, "little") + tail for x in src))
+            ys = [int.from_bytes(out[k:k + 16], "little") for k in range(0, len(out), 16)]
+            if decrypt:
+                c = [(x - y) % mod for x, y, mod in zip(b, ys, mods)]
+                a, b = c, a
+            else:
+                c = [(x + y) % mod for x, y, mod in zip(a, ys, mods)]
+                a, b = b, c
+        return [self._str_rev(x, u) + self._str_rev(y, n - u) for x, y, n, u in zip(a, b, lengths, us)]
+
+    def _batch(self, values: Iterable[str], decrypt: bool) -> List[str]:
+        values = list(values)
+        out: List[str] = []
+        for start in range(0, len(values), self.chunk_size):
+            out.extend(self._chunk(values[start:start + self.chunk_size], decrypt))
+        return out
+
+    def encrypt_batch(self, values: Iterable[str]) -> List[str]:
+        return self._batch(values, decrypt=False)
+
+    def decrypt_batch(self, values: Iterable[str]) -> List[str]:
+        return self._batch(values, decrypt=True)
+
+    def encrypt(self, value: str) -> str:
+        return self._chunk([value], decrypt=False)[0]
+
+    def decrypt(self, value: str) -> str:
+        return self._chunk([value], decrypt=True)[0]
+
+def cipher_from_vault(client=None, alphabet: str = DIGITS[:10], chunk_size: int = DEFAULT_CHUNK) -> FF3Cipher:
+    """Vault(pseudonymize/data/ff3)의 KEY/TWEAK(16진수)로 암호기 생성 (키 캐시 클라이언트 사용)"""
+    from security_infra.pseudonymize_vault_reader import default_client
+
+    key, tweak = (client or default_client()).get_keys()
+    if not key or not tweak:
+        raise ValueError("[ERROR] Vault 시크릿에 KEY/TWEAK가 없습니다.")
+    return FF3Cipher(key, tweak, alphabet, chunk_size)
@@ -0,0 +1,93 @@
+# src/security_infra/file_utils.py
+"""
+파일 공통 유틸 (표준 라이브러리만 사용)
+"""
+
+import hashlib
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+# 실행 간 공유하는 짧은 캐시용 사용자 전용 디렉토리 (공용 /tmp는 사용하지 않음)
+USER_STATE_DIR = (
+    Path(os.environ["XDG_RUNTIME_DIR"]) if os.environ.get("XDG_RUNTIME_DIR") else Path.home() / ".cache"
+) / "security-infra"
+
+def atomic_write(path: Path, data: bytes, mode: Optional[int] = 0o644, preserve_owner: bool = False):
+    """
+    같은 디렉토리 임시파일 작성 → fsync → os.replace (읽는 쪽은 항상 완전한 파일만 봄)
+    - mode=None 이고 기존 파일이 있으면 기존 모드 유지
+    - preserve_owner=True 면 기존 파일의 소유자 유지 시도 (권한 없으면 무시)
+    """
+    path = Path(path)
+    try:
+        existing = os.stat(path)
+    except FileNotFoundError:
+        existing = None
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is None and existing is not None:
+            mode = existing.st_mode & 0o7777
+        if mode is not None:
+            os.chmod(tmp, mode)
+        if preserve_owner and existing is not None:
+            try:
+                os.chown(tmp, existing.st_uid, existing.st_gid)
+            except PermissionError:
+                pass
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+def private_dir(path: Path, create: bool = False) -> bool:
+    """본인 소유 + 그룹/기타 권한 없는 실제 디렉토리인지 (심볼릭 링크 불가), create=True면 0700으로 생성"""
+    if create:
+        try:
+            Path(path).mkdir(mode=0o700, parents=True, exist_ok=True)
+        except OSError:
+            return False
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+def read_private_file(path: Path) -> Optional[bytes]:
+    """private_dir 안의 본인 소유 일반 파일만 읽음 (링크/다른 사용자 파일/없음 → None)"""
+    path = Path(path)
+    if not private_dir(path.parent):
+        return None
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW)
+    except OSError:
+        return None
+    with os.fdopen(fd, "rb") as f:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode) or st.st_uid != os.getuid():
+            return None
+        return f.read()
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def file_signature(path: Path) -> Optional[List[int]]:
+    """[mtime_ns, size] — 마지막 기록 이후 파일 변경 여부 판단용 (stat 1회)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
@@ -1,8 +1,10 @@
 # src/security_infra/generate_certificates.py
 
-import typer
 from pathlib import Path
+import os
 import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import List, Optional
 
@@ -18,6 +20,18 @@ SERVICE_CERT_PATHS = {
 }
 
 DEFAULT_CERT_DAYS = 730
+DEFAULT_SERVICES = ("vault", "elk", "keycloak")
+
+# 인증서 생성 백엔드: openssl(서브프로세스) | native(cryptography, cert_engine.py)
+CERT_BACKENDS = ("openssl", "native")
+KEY_TYPES = ("rsa", "ec", "ed25519")
+
+# openssl req -newkey 인자 (키 종류별)
+OPENSSL_NEWKEY_ARGS = {
+    "rsa": ["-newkey", "rsa:2048"],
+    "ec": ["-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:P-256"],
+    "ed25519": ["-newkey", "ed25519"],
+}
 
 # [3] SAN(subjectAltName) 자동 구성 함수
 def make_san(service: str, extra_san: Optional[List[str]] = None) -> str:
@@ -38,7 +52,8 @@ def openssl_generate_cert(
     days: int,
     overwrite: bool = False,
     service: str = "",
-    logger=print
+    logger=print,
+    key_type: str = "rsa",
 ):
     cert_file = cert_dir / f"{common_name}.crt"
     key_file = cert_dir / f"{common_name}.key"
@@ -49,7 +64,7 @@ def openssl_generate_cert(
     subj = f"/CN={common_name}"
     cmd = [
         "openssl", "req", "-x509", "-nodes",
-        "-newkey", "rsa:2048",
+        *OPENSSL_NEWKEY_ARGS[key_type],
         "-keyout", str(key_file),
         "-out", str(cert_file),
         "-days", str(days),
@@ -64,32 +79,199 @@ def openssl_generate_cert(
         logger(f"[FAIL] {service} 인증서 생성 실패\n{e.stderr.decode()}")
         return False
 
-# [5] 인증서 생성 전체 프로세스
+# [5] 서비스 단위 작업 (프로세스 풀 워커에서도 실행되므로 모듈 최상위 함수)
+def generate_service_cert(
+    service: str,
+    cert_dir: Path,
+    days: int,
+    overwrite: bool = False,
+    extra_san: Optional[List[str]] = None,
+    backend: str = "openssl",
+    key_type: str = "rsa",
+):
+    """
+    서비스 1개의 인증서/키 생성.
+    로그는 워커에서 바로 출력하지 않고 모아서 반환 → 부모가 서비스 순서대로 출력
+    반환: (상태 OK|SKIP|FAIL, 로그 목록, 소요시간 초)
+    """
+    logs = []
+    started = time.perf_counter()
+    cn = service
+    existed = (cert_dir / f"{cn}.crt").exists() and (cert_dir / f"{cn}.key").exists()
+    san = make_san(service, extra_san)
+    if backend == "native":
+        # cryptography는 native 백엔드 선택 시에만 로딩
+        from security_infra.cert_engine import native_generate_cert
+        generate = native_generate_cert
+    else:
+        generate = openssl_generate_cert
+    ok = generate(cert_dir, cn, san, days, overwrite=overwrite, service=service, logger=logs.append, key_type=key_type)
+    if ok:
+        status = "OK"
+    elif existed and not overwrite:
+        status = "SKIP"
+    else:
+        status = "FAIL"
+    return status, logs, time.perf_counter() - started
+
+# [6] 로컬 CA 모드: Root/Intermediate CA 1회 로딩 후 leaf 일괄 발급
+def issue_with_local_ca(
+    tasks: List[tuple],
+    days: int,
+    extra_san: Optional[List[str]],
+    key_type: str,
+    jobs: int,
+    decide_overwrite,
+    ca_dir: Optional[Path] = None,
+    ca_days: Optional[int] = None,
+    hosts: Optional[List[str]] = None,
+    logger=print,
+):
+    """
+    반환: ([(이름, cert_dir)], 결과 목록[(상태, 로그, 소요시간)])
+    - 서비스 leaf: SERVICE_CERT_PATHS[service]/{service}.crt|key
+    - 호스트 leaf: {ca_dir}/hosts/{host}.crt|key
+    - decide_overwrite(이름, cert_dir, san, 발급자) → 재발급 여부 (매니페스트 기준)
+    """
+    from security_infra import cert_authority
+
+    ca_dir = Path(ca_dir) if ca_dir else cert_authority.CA_DIR
+    local_ca = cert_authority.ensure_local_ca(ca_dir, ca_days or cert_authority.DEFAULT_CA_DAYS, logger=logger)
+    issuer = local_ca.cert.subject.rfc4514_string()
+    targets = [(service, cert_dir, make_san(service, extra_san)) for service, cert_dir in tasks]
+    targets += [(host, ca_dir / "hosts", cert_authority.host_san(host)) for host in hosts or []]
+    leaf_tasks = [
+        (name, cert_dir, san, days, decide_overwrite(name, cert_dir, san, issuer), key_type)
+        for name, cert_dir, san in targets
+    ]
+    outcomes = cert_authority.issue_batch(local_ca, leaf_tasks, jobs=jobs, ca_dir=ca_dir)
+    return [(name, cert_dir) for name, cert_dir, _ in targets], outcomes
+
+# [7] 인증서 생성 전체 프로세스
 def generate_certificates(
-    services: List[str],
+    services: Optional[List[str]],
     days: int = DEFAULT_CERT_DAYS,
     overwrite: bool = False,
     extra_san: Optional[List[str]] = None,
-    logger=print
+    logger=print,
+    jobs: int = 1,
+    backend: str = "openssl",
+    key_type: Optional[str] = None,
+    ca: bool = False,
+    ca_dir: Optional[Path] = None,
+    ca_days: Optional[int] = None,
+    hosts: Optional[List[str]] = None,
+    renew_before_days: Optional[int] = None,
+    manifest_path: Optional[Path] = None,
 ) -> str:
     """
     주요 서비스용 인증서/키 파일 자동 생성
     - SAN 및 CN 자동 구성, 기존 파일 보존(기본)
+    - 기존 파일은 매니페스트(docker/certs.json) 기준으로 만료임박/SAN·키·발급자 불일치일 때만 재발급
+    - jobs > 1 이면 프로세스 풀에서 서비스별 키/인증서 동시 생성 (0 = CPU 수)
+      결과/로그는 항상 입력한 서비스 순서대로 출력
+    - backend: openssl(서브프로세스) | native(cryptography, 프로세스 생성 없음)
+    - key_type: rsa | ec(P-256) | ed25519 (기본: rsa, CA 모드는 ec)
+    - ca=True: 자체서명 대신 로컬 Root/Intermediate CA로 leaf 일괄 발급 (native 엔진)
+      services 미지정시 SERVICE_CERT_PATHS 전체 + hosts별 leaf 추가 발급
     """
+    from security_infra import cert_manifest
+
+    if not services:
+        services = list(SERVICE_CERT_PATHS) if ca else list(DEFAULT_SERVICES)
+    key_type = key_type or ("ec" if ca else "rsa")
+    if renew_before_days is None:
+        renew_before_days = cert_manifest.DEFAULT_RENEW_BEFORE_DAYS
+    if backend not in CERT_BACKENDS:
+        raise ValueError(f"[ERROR] 지원하지 않는 백엔드: {backend} (지원: {', '.join(CERT_BACKENDS)})")
+    if key_type not in KEY_TYPES:
+        raise ValueError(f"[ERROR] 지원하지 않는 키 종류: {key_type} (지원: {', '.join(KEY_TYPES)})")
+    if hosts and not ca:
+        raise ValueError("[ERROR] 호스트별 leaf 발급(--host)은 --ca 모드에서만 지원합니다.")
+    tracked = cert_manifest.manifest_supported()
+    if not tracked and (ca or backend == "native"):
+        raise ValueError("[ERROR] native 백엔드/--ca 모드는 cryptography 패키지가 필요합니다 (pip install cryptography)")
     results = []
     logger("===[인증서 자동 생성]===")
+    if days <= renew_before_days:
+        # 발급 직후부터 만료 임박으로 판정되어 매 실행마다 재발급되는 것을 방지
+        logger(f"[WARN] 재발급 기준({renew_before_days}일)이 유효기간({days}일) 이상 → {days // 2}일로 조정")
+        renew_before_days = days // 2
+    if not tracked:
+        logger("[WARN] cryptography 미설치: 매니페스트 없이 파일 존재 여부로만 판단 (만료/SAN 변경 재발급 비활성)")
+
+    manifest_path = manifest_path or cert_manifest.MANIFEST_PATH
+    manifest = cert_manifest.load_manifest(manifest_path)
+    reissued = {}
+
+    def decide_overwrite(name, cert_dir, san, issuer):
+        if overwrite or not tracked:
+            return overwrite
+        reason = cert_manifest.plan_reissue(
+            manifest, name, cert_dir / f"{name}.crt", cert_dir / f"{name}.key",
+            san, renew_before_days, issuer,
+        )
+        if reason and reason != "missing":
+            reissued[name] = reason
+            logger(f"[REISSUE] {name}: {cert_manifest.REISSUE_REASONS[reason]} → 재발급")
+        return reason is not None
+
+    tasks = []
     for service in services:
         cert_dir = SERVICE_CERT_PATHS.get(service)
         if not cert_dir:
             logger(f"[WARN] 지원하지 않는 서비스: {service}")
             results.append(f"[WARN] 지원하지 않는 서비스: {service}")
             continue
-        cn = service
-        san = make_san(service, extra_san)
-        ok = openssl_generate_cert(cert_dir, cn, san, days, overwrite=overwrite, service=service, logger=logger)
-        if ok:
-            results.append(f"[OK] {service} 인증서 생성 완료")
+        tasks.append((service, cert_dir))
+
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    started = time.perf_counter()
+    if ca:
+        targets, outcomes = issue_with_local_ca(
+            tasks, days, extra_san, key_type, jobs, decide_overwrite,
+            ca_dir=ca_dir, ca_days=ca_days, hosts=hosts, logger=logger,
+        )
+        mode = f"로컬 CA({key_type})"
+    else:
+        tasks = [
+            (service, cert_dir, days,
+             decide_overwrite(service, cert_dir, make_san(service, extra_san), f"CN={service}"),
+             extra_san, backend, key_type)
+            for service, cert_dir in tasks
+        ]
+        targets = [(task[0], task[1]) for task in tasks]
+        if min(jobs, len(tasks)) > 1:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+                futures = [pool.submit(generate_service_cert, *task) for task in tasks]
+                outcomes = [f.result() for f in futures]
         else:
-            results.append(f"[FAIL/SKIP] {service} 인증서 생성 실패 또는 이미 존재")
+            outcomes = [generate_service_cert(*task) for task in tasks]
+        mode = f"백엔드 {backend}({key_type})"
+    workers = max(min(jobs, len(targets)), 1)
+
+    status_text = {
+        "OK": "인증서 생성 완료",
+        "SKIP": "인증서 최신 상태 (재발급 불필요)",
+        "FAIL": "인증서 생성 실패",
+    }
+    for (name, cert_dir), (status, logs, elapsed) in zip(targets, outcomes):
+        for line in logs:
+            logger(line)
+        note = f" (재발급: {reissued[name]})" if name in reissued and status != "SKIP" else ""
+        results.append(f"[{status}] {name} {status_text[status]}{note} ({elapsed:.2f}s)")
+        if status == "OK" and tracked:
+            try:
+                manifest["certs"][name] = cert_manifest.inspect_cert(cert_dir / f"{name}.crt", cert_dir / f"{name}.key")
+            except Exception as e:
+                logger(f"[WARN] {name} 매니페스트 기록 실패: {e}")
+    if tracked:
+        cert_manifest.save_manifest(manifest, manifest_path)
+    elapsed_total = time.perf_counter() - started
+    results.append(
+        f"총 {len(targets)}개 인증서, {mode}, "
+        f"동시작업 {workers}, 소요시간 {elapsed_total:.2f}s"
+    )
     logger(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 인증서 생성 작업 완료.")
     return "\n".join(results)
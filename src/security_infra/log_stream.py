@@ -0,0 +1,251 @@
+# src/security_infra/log_stream.py
+"""
+서비스 컨테이너 로그 멀티플렉싱 (Docker Engine API /containers/{id}/logs)
+- 컨테이너별 스트림을 동시에 읽어 타임스탬프 순으로 병합
+- 정규식/레벨/시간창 필터를 프로세스 안에서 적용, 통과한 줄만 즉시 출력
+- 메모리 한도: 과거 로그는 컨테이너당 1줄씩만 보유(heapq.merge),
+  follow 모드는 재정렬 창(window) + 최대 버퍼 줄 수 안에서만 보유
+"""
+
+import calendar
+import heapq
+import json
+import queue
+import re
+import struct
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_WINDOW = 0.25           # follow 재정렬 창(초)
+DEFAULT_MAX_BUFFER = 10000      # follow 재정렬 버퍼 최대 줄 수
+MAX_LINE_BYTES = 64 * 1024      # 이보다 긴 줄은 잘라서 출력
+
+LEVELS = {"trace": 0, "debug": 1, "info": 2, "warn": 3, "error": 4, "fatal": 5}
+LEVEL_ALIASES = {"warning": "warn", "err": "error", "critical": "fatal", "crit": "fatal", "severe": "error"}
+LEVEL_PATTERN = re.compile(r"\b(TRACE|DEBUG|INFO|WARN(?:ING)?|ERR(?:OR)?|FATAL|CRIT(?:ICAL)?|SEVERE)\b", re.IGNORECASE)
+DURATION_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)([smhd])$")
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+STREAM_HEADER = struct.Struct(">BxxxL")
+STREAM_NAMES = {0: "stdin", 1: "stdout", 2: "stderr"}
+
+def parse_time_arg(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """'10m' / '2h' / '30s' / '1d' (현재 기준 과거) 또는 ISO-8601 시각 → epoch 초"""
+    if not value:
+        return None
+    now = time.time() if now is None else now
+    m = DURATION_PATTERN.match(value.strip())
+    if m:
+        return now - float(m.group(1)) * DURATION_UNITS[m.group(2)]
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"[ERROR] 잘못된 시간 형식: {value} (예: 10m, 2h, 2025-01-01T09:00:00+09:00)")
+    if parsed.tzinfo is None:
+        return parsed.timestamp()
+    return calendar.timegm(parsed.utctimetuple()) + parsed.microsecond / 1e6
+
+def parse_docker_timestamp(ts: str) -> int:
+    """RFC3339Nano(UTC, 'Z') → epoch 나노초 (소수부 자릿수가 가변이라 문자열 정렬 불가)"""
+    base, _, frac = ts.rstrip("Z").partition(".")
+    seconds = calendar.timegm(time.strptime(base[:19], "%Y-%m-%dT%H:%M:%S"))
+    return seconds * 1_000_000_000 + int((frac + "000000000")[:9] or 0)
+
+def detect_level(message: str) -> Optional[str]:
+    """JSON 로그의 level 필드 또는 본문 앞부분의 레벨 토큰 → trace|debug|info|warn|error|fatal"""
+    if message.startswith("{"):
+        try:
+            data = json.loads(message)
+            raw = data.get("level") or data.get("log.level") or data.get("severity")
+            if isinstance(raw, str):
+                raw = raw.lower()
+                raw = LEVEL_ALIASES.get(raw, raw)
+                if raw in LEVELS:
+                    return raw
+        except ValueError:
+            pass
+    m = LEVEL_PATTERN.search(message[:200])
+    if not m:
+        return None
+    raw = m.group(1).lower()
+    return LEVEL_ALIASES.get(raw, raw)
+
+class LogFilter:
+    def __init__(
+        self,
+        pattern: Optional[str] = None,
+        min_level: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ):
+        if min_level is not None and min_level.lower() not in LEVELS:
+            raise ValueError(f"[ERROR] 지원하지 않는 레벨: {min_level} (지원: {', '.join(LEVELS)})")
+        self.regex = re.compile(pattern) if pattern else None
+        self.min_level = LEVELS[min_level.lower()] if min_level else None
+        self.since_ns = int(since * 1e9) if since is not None else None
+        self.until_ns = int(until * 1e9) if until is not None else None
+
+    def match(self, record: dict) -> bool:
+        ns = record["_ns"]
+        if self.since_ns is not None and ns < self.since_ns:
+            return False
+        if self.until_ns is not None and ns > self.until_ns:
+            return False
+        if self.min_level is not None:
+            level = record["level"]
+            # 레벨을 알 수 없는 줄(스택트레이스 등)은 레벨 필터에서 제외
+            if level is None or LEVELS[level] < self.min_level:
+                return False
+        if self.regex is not None and not self.regex.search(record["message"]):
+            return False
+        return True
+
+def iter_raw_lines(resp, tty: bool) -> Iterator[tuple]:
+    """
+    /logs 응답 → (stream, line bytes). 비 TTY는 8바이트 헤더 멀티플렉스 프레임, TTY는 원시 스트림
+    """
+    if tty:
+        while True:
+            line = resp.readline(MAX_LINE_BYTES)
+            if not line:
+                return
+            yield "stdout", line
+    pending = {1: b"", 2: b""}
+    while True:
+        header = resp.read(STREAM_HEADER.size)
+        if len(header) < STREAM_HEADER.size:
+            break
+        stream, size = STREAM_HEADER.unpack(header)
+        payload = resp.read(size)
+        buf = pending.get(stream, b"") + payload
+        *lines, rest = buf.split(b"\n")
+        for line in lines:
+            yield STREAM_NAMES.get(stream, "stdout"), line
+        if len(rest) > MAX_LINE_BYTES:
+            yield STREAM_NAMES.get(stream, "stdout"), rest
+            rest = b""
+        pending[stream] = rest
+    for stream, rest in pending.items():
+        if rest:
+            yield STREAM_NAMES[stream], rest
+
+def container_records(client, row: dict, params: dict) -> Iterator[dict]:
+    """컨테이너 1개 로그 → 레코드 (timestamps=1 필수, 컨테이너당 전용 연결 사용)"""
+    tty = bool(((client.inspect(row["id"]) or {}).get("Config") or {}).get("Tty"))
+    conn, resp = client.open_logs(row["id"], params)
+    try:
+        for stream, raw in iter_raw_lines(resp, tty):
+            text = raw[:MAX_LINE_BYTES].decode("utf-8", errors="replace").rstrip("\r")
+            ts, _, message = text.partition(" ")
+            try:
+                ns = parse_docker_timestamp(ts)
+            except ValueError:
+                continue
+            yield {
+                "_ns": ns,
+                "ts": ts,
+                "service": row["service"],
+                "container": row["container"],
+                "stream": stream,
+                "level": detect_level(message),
+                "message": message,
+            }
+    finally:
+        conn.close()
+
+def merge_records(sources: List[Iterable[dict]]) -> Iterator[dict]:
+    """과거 로그: 컨테이너별로 이미 정렬된 스트림을 타임스탬프 순으로 지연 병합"""
+    return heapq.merge(*sources, key=lambda r: r["_ns"])
+
+def follow_records(
+    sources: List[Iterable[dict]],
+    window: float = DEFAULT_WINDOW,
+    max_buffer: int = DEFAULT_MAX_BUFFER,
+) -> Iterator[dict]:
+    """
+    follow 모드: 소스마다 읽기 스레드, 재정렬 창(window초) 동안만 보유 후 타임스탬프 순 출력
+    버퍼가 max_buffer를 넘으면 가장 오래된 줄부터 즉시 출력 (메모리 상한)
+    """
+    inbox = queue.Queue(maxsize=max_buffer)
+    done = object()
+
+    def reader(source):
+        try:
+            for record in source:
+                inbox.put(record)
+        finally:
+            inbox.put(done)
+
+    for source in sources:
+        threading.Thread(target=reader, args=(source,), daemon=True).start()
+
+    heap, seq, remaining = [], 0, len(sources)
+    while remaining or heap:
+        timeout = window
+        if heap:
+            timeout = max(0.0, heap[0][1] + window - time.monotonic())
+        try:
+            item = inbox.get(timeout=timeout) if remaining else None
+        except queue.Empty:
+            item = None
+        if item is done:
+            remaining -= 1
+        elif item is not None:
+            heapq.heappush(heap, (item["_ns"], time.monotonic(), seq, item))
+            seq += 1
+        now = time.monotonic()
+        while heap and (not remaining or len(heap) > max_buffer or heap[0][1] + window <= now):
+            yield heapq.heappop(heap)[3]
+
+def record_json(record: dict) -> str:
+    return json.dumps({k: v for k, v in record.items() if not k.startswith("_")}, ensure_ascii=False)
+
+def record_text(record: dict) -> str:
+    return f"{record['ts'][:23]} {record['service']:<14} | {record['message']}"
+
+def stream_logs(
+    client,
+    rows: List[dict],
+    log_filter: LogFilter,
+    emit: Callable[[dict], None],
+    follow: bool = False,
+    tail: Optional[int] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    window: float = DEFAULT_WINDOW,
+    max_buffer: int = DEFAULT_MAX_BUFFER,
+) -> Dict[str, int]:
+    """
+    컨테이너 목록(service_containers 결과)의 로그를 병합/필터링해 emit. 반환: {"read", "emitted"}
+    since/until/tail은 Engine API에도 전달해 필요 없는 줄은 전송 단계에서 제외
+    follow 모드는 종료 시각이 없으므로 until과 함께 쓸 수 없음 (스트림이 끝나지 않음)
+    """
+    if follow and until is not None:
+        raise ValueError("[ERROR] --follow와 --until은 함께 사용할 수 없습니다 (follow는 종료 시각 없이 계속 출력)")
+    params = {"stdout": "1", "stderr": "1", "timestamps": "1", "follow": "1" if follow else "0"}
+    if tail is not None:
+        params["tail"] = str(tail)
+    if since is not None:
+        params["since"] = f"{since:.9f}"
+    if until is not None:
+        params["until"] = f"{until:.9f}"
+    sources = [container_records(client, row, params) for row in rows]
+    merged = follow_records(sources, window, max_buffer) if follow else merge_records(sources)
+    stats = {"read": 0, "emitted": 0}
+    for record in merged:
+        stats["read"] += 1
+        if log_filter.match(record):
+            emit(record)
+            stats["emitted"] += 1
+    return stats
+
+def line_emitter(formatter: Callable[[dict], str], stream=None):
+    """레코드 → 한 줄 출력 후 즉시 flush (파이프 하류가 바로 처리할 수 있도록)"""
+    stream = stream or sys.stdout
+
+    def emit(record):
+        stream.write(formatter(record) + "\n")
+        stream.flush()
+    return emit
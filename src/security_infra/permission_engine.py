@@ -0,0 +1,209 @@
+# src/security_infra/permission_engine.py
+"""
+chown/chmod 서브프로세스 대신 os.chown/os.chmod 시스템콜로 권한을 맞추는 엔진
+- lstat으로 현재 소유자/모드를 먼저 확인하고 다른 경우에만 변경
+- 재귀 트리는 os.scandir로 순회 (심볼릭 링크는 따라가지 않음)
+- root 권한이 필요한 항목은 모아서 sudo 1회로 일괄 처리
+  (이 파일을 root로 직접 실행: stdin=JSON 작업목록, stdout=JSON 결과 / 표준 라이브러리만 사용)
+
+작업(spec) 형식:
+    {"name": "vault", "path": "/.../docker/vault", "uid": 101, "gid": 101,
+     "mode": 0o770, "file_mode": 0o660, "recursive": true, "exclude": ["/.../vault.crt"]}
+"""
+
+import grp
+import json
+import os
+import pwd
+import stat
+import subprocess
+import sys
+from pathlib import Path
+
+ENGINE_PATH = Path(__file__).resolve()
+MAX_FAILED_DETAILS = 20
+
+def parse_owner(owner: str):
+    """'1000:1000' 또는 'user:group' → (uid, gid)"""
+    user, _, group = str(owner).partition(":")
+    uid = int(user) if user.isdigit() else pwd.getpwnam(user).pw_uid
+    if not group:
+        gid = pwd.getpwuid(uid).pw_gid
+    else:
+        gid = int(group) if group.isdigit() else grp.getgrnam(group).gr_gid
+    return uid, gid
+
+def parse_mode(mode) -> int:
+    """'770' / '0o770' / 0o770 → 0o770"""
+    if isinstance(mode, int):
+        return mode
+    text = str(mode).strip().lower()
+    return int(text[2:] if text.startswith("0o") else text, 8)
+
+def new_counts():
+    return {"changed": 0, "unchanged": 0, "failed": 0, "failed_paths": []}
+
+class PermissionReport:
+    """작업명(name)별 변경/유지/실패 집계 + root 재시도 대상 목록"""
+
+    def __init__(self):
+        self.counts = {}
+        self.needs_root = []
+        self.sudo_calls = 0
+
+    def entry(self, name):
+        return self.counts.setdefault(name, new_counts())
+
+    def add(self, name, key):
+        self.entry(name)[key] += 1
+
+    def fail(self, name, path, error):
+        counts = self.entry(name)
+        counts["failed"] += 1
+        if len(counts["failed_paths"]) < MAX_FAILED_DETAILS:
+            counts["failed_paths"].append(f"{path}: {error}")
+
+    def merge(self, counts_by_name: dict):
+        for name, counts in counts_by_name.items():
+            mine = self.entry(name)
+            for key in ("changed", "unchanged", "failed"):
+                mine[key] += counts.get(key, 0)
+            room = MAX_FAILED_DETAILS - len(mine["failed_paths"])
+            mine["failed_paths"].extend(counts.get("failed_paths", [])[:max(room, 0)])
+
+    def totals(self):
+        total = new_counts()
+        for counts in self.counts.values():
+            for key in ("changed", "unchanged", "failed"):
+                total[key] += counts[key]
+        return total
+
+def apply_one(path: str, st: os.stat_result, uid: int, gid: int, mode: int):
+    """차이가 있을 때만 chown/chmod → 변경 여부"""
+    changed = False
+    if (st.st_uid, st.st_gid) != (uid, gid):
+        os.chown(path, uid, gid, follow_symlinks=False)
+        changed = True
+    if stat.S_IMODE(st.st_mode) != mode:
+        os.chmod(path, mode)
+        changed = True
+    return changed
+
+def apply_spec(spec: dict, report: PermissionReport, privileged: bool):
+    """
+    spec 1건 적용. 비특권 실행에서 권한 부족이면
+    - 디렉토리: 하위 트리 전체를 root 재시도 대상으로 넘기고 더 내려가지 않음
+    - 파일: 해당 경로만 root 재시도 대상으로 넘김
+    """
+    name, uid, gid = spec["name"], spec["uid"], spec["gid"]
+    mode = spec["mode"]
+    file_mode = spec.get("file_mode") if spec.get("file_mode") is not None else mode
+    recursive = spec.get("recursive", False)
+    exclude = set(spec.get("exclude", ()))
+
+    def escalate(path, subtree):
+        report.needs_root.append({**spec, "path": path, "recursive": subtree and recursive, "children_only": False})
+
+    def handle(path, st, is_dir):
+        """적용 후 하위 순회 가능 여부 반환"""
+        try:
+            changed = apply_one(path, st, uid, gid, mode if is_dir else file_mode)
+            report.add(name, "changed" if changed else "unchanged")
+            return True
+        except PermissionError as e:
+            if privileged:
+                report.fail(name, path, e)
+            else:
+                escalate(path, is_dir)
+            return False
+        except OSError as e:
+            report.fail(name, path, e)
+            return False
+
+    root = spec["path"]
+    if not spec.get("children_only"):
+        try:
+            st = os.lstat(root)
+        except FileNotFoundError as e:
+            report.fail(name, root, e)
+            return
+        except PermissionError as e:
+            if privileged:
+                report.fail(name, root, e)
+            else:
+                escalate(root, True)
+            return
+        if stat.S_ISLNK(st.st_mode):
+            report.add(name, "unchanged")
+            return
+        is_dir = stat.S_ISDIR(st.st_mode)
+        if not handle(root, st, is_dir) or not (is_dir and recursive):
+            return
+
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except PermissionError as e:
+            if privileged:
+                report.fail(name, current, e)
+            else:
+                # 디렉토리 자체는 적용 완료 → root로는 하위만 처리
+                report.needs_root.append({**spec, "path": current, "recursive": True, "children_only": True})
+            continue
+        except OSError as e:
+            report.fail(name, current, e)
+            continue
+        for entry in entries:
+            if entry.path in exclude or entry.is_symlink():
+                continue
+            try:
+                entry_st = entry.stat(follow_symlinks=False)
+            except OSError as e:
+                report.fail(name, entry.path, e)
+                continue
+            entry_is_dir = stat.S_ISDIR(entry_st.st_mode)
+            if handle(entry.path, entry_st, entry_is_dir) and entry_is_dir:
+                stack.append(entry.path)
+
+def apply_specs(specs, privileged=None, escalate=True, logger=print) -> PermissionReport:
+    """
+    spec 목록 적용. privileged 미지정시 현재 euid로 판단.
+    root가 필요한 항목은 마지막에 sudo 1회로 일괄 처리
+    """
+    if privileged is None:
+        privileged = os.geteuid() == 0
+    report = PermissionReport()
+    for spec in specs:
+        report.entry(spec["name"])
+        apply_spec(spec, report, privileged)
+    if report.needs_root and escalate and not privileged:
+        logger(f"[INFO] root 권한 필요 {len(report.needs_root)}건 → sudo 1회로 일괄 처리")
+        pending, report.needs_root = report.needs_root, []
+        report.merge(run_as_root(pending))
+        report.sudo_calls += 1
+    return report
+
+def run_as_root(specs) -> dict:
+    """이 파일을 sudo로 1회 실행해 spec 목록 일괄 적용 → 작업명별 집계"""
+    cmd = ["sudo", sys.executable, str(ENGINE_PATH)]
+    try:
+        result = subprocess.run(cmd, input=json.dumps(specs), capture_output=True, text=True)
+        if result.returncode == 0:
+            return json.loads(result.stdout)
+        error = result.stderr.strip() or f"returncode={result.returncode}"
+    except (OSError, ValueError) as e:
+        error = str(e)
+    failed = {}
+    for spec in specs:
+        counts = failed.setdefault(spec["name"], new_counts())
+        counts["failed"] += 1
+        counts["failed_paths"].append(f"{spec['path']}: sudo 실패 ({error})")
+    return failed
+
+if __name__ == "__main__":
+    # sudo로 실행되는 root 헬퍼: stdin JSON spec 목록 → stdout JSON 집계
+    root_report = apply_specs(json.load(sys.stdin), privileged=True, escalate=False)
+    json.dump(root_report.counts, sys.stdout)
@@ -0,0 +1,289 @@
+# src/security_infra/pseudonymize_pipeline.py
+"""
+CSV/JSONL 대용량 파일 스트리밍 가명화
+- 입력을 레코드 경계(CSV 따옴표 안 줄바꿈 포함) 기준 고정 행 수 청크로 읽어 프로세스 풀에 전달
+- 워커: 청크 파싱 → 지정 컬럼 배치 FF3-1 암호화 → 직렬화 (암호기는 워커당 1회 생성)
+- 출력은 입력 순서 그대로, 동시에 처리 중인 청크 수를 제한해 메모리 사용량 일정
+- 청크를 쓸 때마다 체크포인트(입력/출력 바이트 위치) 기록 → --resume으로 중단 지점부터 재개
+"""
+
+import csv
+import io
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from security_infra.file_utils import atomic_write, file_signature
+
+FORMATS = ("csv", "jsonl")
+FORMAT_SUFFIXES = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+ON_INVALID = ("fail", "keep", "blank")
+DEFAULT_CHUNK_ROWS = 10000
+CHECKPOINT_SUFFIX = ".ckpt.json"
+MAX_INVALID_SAMPLES = 5
+
+_engine = None
+
+def _init_worker(factory: Callable):
+    global _engine
+    _engine = factory()
+
+def detect_format(path: Path, fmt: Optional[str] = None) -> str:
+    if fmt:
+        if fmt not in FORMATS:
+            raise ValueError(f"[ERROR] 지원하지 않는 형식: {fmt} (지원: {', '.join(FORMATS)})")
+        return fmt
+    detected = FORMAT_SUFFIXES.get(Path(path).suffix.lower())
+    if detected is None:
+        raise ValueError(f"[ERROR] 확장자로 형식을 알 수 없음: {path} (--format csv|jsonl 지정)")
+    return detected
+
+def iter_record_chunks(f, chunk_rows: int, quoted: bool) -> Iterator[Tuple[bytes, int, int]]:
+    """
+    바이너리 파일(현재 위치부터) → (청크 바이트, 레코드 수, 청크 끝 오프셋)
+    quoted=True(CSV): 따옴표 개수 홀짝으로 따옴표 안 줄바꿈을 레코드 경계로 보지 않음,
+    빈 줄도 csv.reader가 돌려주는 레코드이므로 1행으로 셈 (JSONL 빈 줄은 레코드가 아님)
+    """
+    buf, rows, pos, in_quote = [], 0, f.tell(), False
+    for line in iter(f.readline, b""):
+        pos += len(line)
+        buf.append(line)
+        if quoted and line.count(b'"') % 2:
+            in_quote = not in_quote
+        if in_quote or (not quoted and not line.strip()):
+            continue
+        rows += 1
+        if rows >= chunk_rows:
+            yield b"".join(buf), rows, pos
+            buf, rows = [], 0
+    if buf:
+        yield b"".join(buf), rows, pos
+
+def _restore_type(original, value):
+    """JSON 정수 입력은 결과가 정수로 손실 없이 표현될 때(앞자리 0 없음)만 정수로 되돌림"""
+    if isinstance(original, int) and value.isascii() and value.isdigit() and str(int(value)) == value:
+        return int(value)
+    return value
+
+def _transform(records, columns, get, put, operation: str, on_invalid: str):
+    """컬럼별로 유효한 값만 모아 배치 처리. 반환: (무효 값 수, 샘플 [(행, 컬럼, 값)])"""
+    invalid, samples = 0, []
+    batch = _engine.decrypt_batch if operation == "decrypt" else _engine.encrypt_batch
+    for column in columns:
+        positions, values = [], []
+        for i, record in enumerate(records):
+            value = get(record, column)
+            if value is None or value == "":
+                continue
+            text = str(value) if isinstance(value, int) and not isinstance(value, bool) else value
+            if isinstance(text, str) and _engine.valid(text):
+                positions.append(i)
+                values.append(text)
+                continue
+            invalid += 1
+            if len(samples) < MAX_INVALID_SAMPLES:
+                samples.append((i, column, value))
+            if on_invalid == "blank":
+                put(record, column, "")
+        for i, value in zip(positions, batch(values)):
+            put(records[i], column, _restore_type(get(records[i], column), value))
+    return invalid, samples
+
+def _csv_get(row, index):
+    return row[index] if index < len(row) else None
+
+def _csv_put(row, index, value):
+    row[index] = value
+
+def _json_get(record, key):
+    return record.get(key) if isinstance(record, dict) else None
+
+def _json_put(record, key, value):
+    record[key] = value
+
+def process_chunk(fmt: str, payload: bytes, columns: list, operation: str = "encrypt",
+                  on_invalid: str = "fail", delimiter: str = ",", lineterminator: str = "\n"):
+    """
+    워커: 청크 1개 → (출력 바이트, 레코드 수, 무효 값 수, 무효 샘플[(청크 내 행, 컬럼, 값)])
+    CSV 빈 행은 그대로 유지하고, 모든 행을 lineterminator(입력 헤더와 같은 줄끝)로 기록
+    """
+    text = payload.decode("utf-8")
+    if fmt == "csv":
+        records = list(csv.reader(io.StringIO(text, newline=""), delimiter=delimiter))
+        invalid, samples = _transform(records, columns, _csv_get, _csv_put, operation, on_invalid)
+        out = io.StringIO()
+        csv.writer(out, delimiter=delimiter, lineterminator=lineterminator).writerows(records)
+        data = out.getvalue()
+    else:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        invalid, samples = _transform(records, columns, _json_get, _json_put, operation, on_invalid)
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+    return data.encode("utf-8"), len(records), invalid, samples
+
+def _read_csv_header(f, delimiter: str) -> Tuple[bytes, List[str], str]:
+    """헤더 앞 빈 줄은 헤더 원문에 포함. 반환: (헤더 원문, 컬럼 목록, 헤더 줄끝)"""
+    raw, header = b"", []
+    for chunk, _, _ in iter_record_chunks(f, 1, quoted=True):
+        raw += chunk
+        header = next(csv.reader(io.StringIO(chunk.decode("utf-8-sig"), newline=""), delimiter=delimiter), [])
+        if header:
+            break
+    if not header:
+        raise ValueError("[ERROR] 빈 CSV 파일입니다.")
+    return raw, header, "\r\n" if raw.endswith(b"\r\n") else "\n"
+
+def load_checkpoint(path: Path) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def _write_checkpoint(path: Path, state: dict):
+    state["updated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    atomic_write(path, json.dumps(state, ensure_ascii=False, indent=2).encode("utf-8"), mode=0o600)
+
+def pseudonymize_file(
+    input_path: Path,
+    output_path: Path,
+    columns: List[str],
+    engine_factory: Callable,
+    fmt: Optional[str] = None,
+    operation: str = "encrypt",
+    workers: Optional[int] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    resume: bool = False,
+    on_invalid: str = "fail",
+    delimiter: str = ",",
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    입력 파일의 지정 컬럼을 가명화해 출력 파일에 기록
+    - engine_factory: 워커에서 호출할 암호기 생성 함수 (pickle 가능, 예: functools.partial(FF3Cipher, key, tweak))
+    - workers=0: 현재 프로세스에서 처리 (None: CPU 수)
+    반환: {"rows", "bytes", "elapsed_s", "rows_per_s", "bytes_per_s", "invalid", "resumed_from"}
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    fmt = detect_format(input_path, fmt)
+    if on_invalid not in ON_INVALID:
+        raise ValueError(f"[ERROR] on_invalid는 {', '.join(ON_INVALID)} 중 하나여야 합니다.")
+    if not columns:
+        raise ValueError("[ERROR] 가명화할 컬럼을 1개 이상 지정하세요.")
+    if output_path.resolve() == input_path.resolve():
+        raise ValueError("[ERROR] 출력 파일은 입력 파일과 달라야 합니다.")
+    ckpt_path = output_path.with_name(output_path.name + CHECKPOINT_SUFFIX)
+    checkpoint = load_checkpoint(ckpt_path)
+    signature = file_signature(input_path)
+    if signature is None:
+        raise ValueError(f"[ERROR] 입력 파일 없음: {input_path}")
+    if checkpoint is not None and not resume:
+        raise ValueError(f"[ERROR] 중단된 작업의 체크포인트가 있습니다: {ckpt_path} (--resume 또는 삭제 후 재실행)")
+    if checkpoint is not None:
+        expected = {"input": str(input_path.resolve()), "input_signature": signature, "format": fmt,
+                    "columns": list(columns), "operation": operation}
+        mismatch = [k for k, v in expected.items() if checkpoint.get(k) != v]
+        if mismatch or not output_path.exists():
+            raise ValueError(f"[ERROR] 체크포인트와 입력/옵션이 다릅니다 ({', '.join(mismatch) or '출력 파일 없음'}): {ckpt_path}")
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    started = time.perf_counter()
+    with open(input_path, "rb") as src, open(output_path, "r+b" if checkpoint else "wb") as dst:
+        if fmt == "csv":
+            header_raw, header, lineterminator = _read_csv_header(src, delimiter)
+            missing = [c for c in columns if c not in header]
+            if missing:
+                raise ValueError(f"[ERROR] CSV 헤더에 없는 컬럼: {', '.join(missing)}")
+            keys = [header.index(c) for c in columns]
+            if checkpoint is None:
+                dst.write(header_raw)
+        else:
+            keys, lineterminator = list(columns), "\n"
+        state = checkpoint or {
+            "input": str(input_path.resolve()), "input_signature": signature, "format": fmt,
+            "columns": list(columns), "operation": operation,
+            "in_offset": src.tell(), "out_offset": dst.tell(), "rows": 0,
+        }
+        resumed_from = state["rows"] if checkpoint else None
+        src.seek(state["in_offset"])
+        # 마지막 체크포인트 이후에 쓰인 불완전한 출력은 잘라냄
+        dst.seek(state["out_offset"])
+        dst.truncate()
+        start_offset, rows_at_start = state["in_offset"], state["rows"]
+
+        pool = None
+        if workers > 0:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine_factory,))
+        else:
+            _init_worker(engine_factory)
+        window = deque()
+        max_inflight = max(2, workers * 2)
+        invalid_total = 0
+
+        def drain():
+            nonlocal invalid_total
+            future, base_row, end_offset = window.popleft()
+            data, nrows, invalid, samples = future.result() if pool else future
+            if invalid and on_invalid == "fail":
+                row, column, value = samples[0]
+                name = columns[keys.index(column)] if fmt == "csv" else column
+                raise ValueError(
+                    f"[ERROR] {base_row + row + 1}번째 레코드 '{name}' 값 {value!r}: FF3-1 처리 불가 "
+                    f"(무효 {invalid}개, --on-invalid keep|blank로 건너뛰기 가능)"
+                )
+            invalid_total += invalid
+            dst.write(data)
+            dst.flush()
+            os.fsync(dst.fileno())
+            state.update(in_offset=end_offset, out_offset=dst.tell(), rows=state["rows"] + nrows)
+            _write_checkpoint(ckpt_path, state)
+            if progress:
+                progress(_stats(state, start_offset, rows_at_start, started, invalid_total, resumed_from))
+
+        args = (columns if fmt == "jsonl" else keys, operation, on_invalid, delimiter, lineterminator)
+        try:
+            submitted_rows = state["rows"]
+            for payload, nrows, end_offset in iter_record_chunks(src, chunk_rows, quoted=fmt == "csv"):
+                if pool:
+                    future = pool.submit(process_chunk, fmt, payload, *args)
+                else:
+                    future = process_chunk(fmt, payload, *args)
+                window.append((future, submitted_rows, end_offset))
+                submitted_rows += nrows
+                while len(window) >= max_inflight:
+                    drain()
+            while window:
+                drain()
+        finally:
+            if pool:
+                for future, _, _ in window:
+                    future.cancel()
+                pool.shutdown(wait=True)
+    ckpt_path.unlink(missing_ok=True)
+    return _stats(state, start_offset, rows_at_start, started, invalid_total, resumed_from)
+
+def _stats(state, start_offset, rows_at_start, started, invalid, resumed_from) -> dict:
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    rows = state["rows"] - rows_at_start
+    nbytes = state["in_offset"] - start_offset
+    return {
+        "rows": rows,
+        "bytes": nbytes,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(rows / elapsed, 1),
+        "bytes_per_s": round(nbytes / elapsed, 1),
+        "invalid": invalid,
+        "resumed_from": resumed_from,
+    }
+
+def format_stats(stats: dict) -> str:
+    resumed = f", {stats['resumed_from']}행부터 재개" if stats["resumed_from"] is not None else ""
+    invalid = f", 처리 불가 값 {stats['invalid']}개" if stats["invalid"] else ""
+    return (
+        f"{stats['rows']}행 / {stats['bytes'] / 1024 / 1024:.1f}MiB, {stats['elapsed_s']:.1f}s "
+        f"({stats['rows_per_s']:,.0f} rows/s, {stats['bytes_per_s'] / 1024 / 1024:.1f} MiB/s){resumed}{invalid}"
+    )
@@ -1,36 +1,201 @@
 # src/security_infra/pseudonymize_vault_reader.py
 """
 Vault Agent + AppRole 기반 가명화키(KEY, TWEAK) 안전 조회 예제
+- PseudonymizeKeyClient: keep-alive 세션 재사용 + 프로세스 내 키 캐시
+  - 캐시 유효기간: KV v2 custom_metadata의 ttl (없으면 lease_duration, 그것도 없으면 기본값)
+  - 만료 전 갱신 구간에 들어오면 캐시를 반환하면서 백그라운드에서 갱신 (호출자는 대기하지 않음)
+  - Vault Agent 토큰 파일은 변경(mtime/크기)됐을 때만 다시 읽음
+  - 캐시가 빈 상태에서 동시에 호출되면 첫 호출만 Vault를 조회하고 나머지는 그 결과를 기다림
+  - KEY/TWEAK 중 하나라도 없으면 VaultError (불완전한 결과는 캐시하지 않음)
 """
 
-import os
-import requests
+import re
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from security_infra.file_utils import file_signature
+from security_infra.vault_client import VaultError, VaultSession
 
 # 환경설정 (환경변수 또는 직접 경로 지정)
 VAULT_ADDR = "https://127.0.0.1:8200"
 VAULT_TOKEN_PATH = "/etc/vault-agent/vault-token"
 VAULT_CACERT = "/etc/ssl/certs/vault.crt"     # Vault CA 인증서
-SECRET_PATH = "pseudonymize/ff3"              # KV 엔진 경로 (예: kv-v2 엔진, pseudonymize/ff3)
+SECRET_PATH = "pseudonymize/data/ff3"         # KV v2 엔진 경로 (마운트 pseudonymize, 시크릿 ff3)
+DEFAULT_TTL = 300.0                           # 메타데이터에 TTL이 없을 때 캐시 유효기간(초)
+REFRESH_RATIO = 0.8                           # TTL의 80% 경과 후 백그라운드 갱신
+
+DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h|d)")
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400}
 
 # 1. Vault Agent가 발급한 임시 토큰 읽기
 def get_vault_token(token_path=VAULT_TOKEN_PATH):
     with open(token_path, "r") as f:
         return f.read().strip()
 
-# 2. Vault에서 가명화 키(예: KEY, TWEAK) 읽기
+def parse_ttl(value) -> Optional[float]:
+    """Vault 기간 표기('300', '10m', '1h30m') → 초 (해석 불가/0이면 None)"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if text.replace(".", "", 1).isdigit():
+        seconds = float(text)
+    else:
+        parts = DURATION.findall(text)
+        if not parts or "".join(n + u for n, u in parts) != text:
+            return None
+        seconds = sum(float(n) * DURATION_UNITS[u] for n, u in parts)
+    return seconds if seconds > 0 else None
+
+class PseudonymizeKeyClient:
+    """
+    가명화키 조회 클라이언트 (스레드 안전, 프로세스당 1개 재사용 권장)
+    stats(): hits/misses/coalesced/refreshes/refresh_errors/token_reloads
+    """
+
+    def __init__(
+        self,
+        vault_addr: str = VAULT_ADDR,
+        token_path: str = VAULT_TOKEN_PATH,
+        cacert=VAULT_CACERT,
+        secret_path: str = SECRET_PATH,
+        default_ttl: float = DEFAULT_TTL,
+        refresh_ratio: float = REFRESH_RATIO,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.vault = VaultSession(vault_addr, verify=cacert)
+        self.token_path = token_path
+        self.secret_path = secret_path
+        self.default_ttl = default_ttl
+        self.refresh_ratio = refresh_ratio
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()     # 동기 조회 1개만 (동시 캐시 미스 합치기)
+        self._token = None
+        self._token_sig = None
+        self._keys: Optional[Tuple[str, str]] = None
+        self._fetched_at = 0.0
+        self._ttl = 0.0
+        self._refreshing: Optional[threading.Thread] = None
+        self.counters = {"hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0, "refresh_errors": 0,
+                         "token_reloads": 0}
+
+    def _current_token(self, force: bool = False) -> str:
+        sig = file_signature(self.token_path)
+        if force or self._token is None or sig != self._token_sig:
+            self._token = get_vault_token(self.token_path)
+            self._token_sig = sig
+            self.counters["token_reloads"] += 1
+        return self._token
+
+    def _fetch(self) -> Tuple[Tuple[str, str], float]:
+        """KV v2 읽기 1회 → ((KEY, TWEAK), ttl초). 403이면 토큰을 다시 읽어 1회 재시도"""
+        with self._lock:
+            token = self._current_token()
+        try:
+            resp = self.vault.request("GET", self.secret_path, token=token)
+        except VaultError as e:
+            if e.status != 403:
+                raise
+            with self._lock:
+                token = self._current_token(force=True)
+            resp = self.vault.request("GET", self.secret_path, token=token)
+        # KV v2 엔진일 때는 data.data 구조임
+        body = resp.get("data") or {}
+        data = body.get("data") or {}
+        custom = (body.get("metadata") or {}).get("custom_metadata") or {}
+        missing = [name for name in ("KEY", "TWEAK") if not data.get(name)]
+        if missing:
+            raise VaultError(200, [f"{self.secret_path} 시크릿에 {'/'.join(missing)} 필드가 없습니다"])
+        ttl = parse_ttl(custom.get("ttl")) or parse_ttl(resp.get("lease_duration")) or self.default_ttl
+        return (data["KEY"], data["TWEAK"]), ttl
+
+    def _store(self, keys, ttl, fetched_at):
+        self._keys, self._ttl, self._fetched_at = keys, ttl, fetched_at
+
+    def _background_refresh(self):
+        try:
+            started = self.clock()
+            keys, ttl = self._fetch()
+            with self._lock:
+                self._store(keys, ttl, started)
+                self.counters["refreshes"] += 1
+        except Exception:
+            # 갱신 실패 시 기존 캐시를 만료 시각까지 사용, 만료 후 호출에서 동기 조회
+            with self._lock:
+                self.counters["refresh_errors"] += 1
+        finally:
+            with self._lock:
+                self._refreshing = None
+
+    def _cached_keys(self) -> Optional[Tuple[str, str]]:
+        """유효한 캐시 (self._lock 보유 상태에서 호출)"""
+        if self._keys is not None and self.clock() - self._fetched_at < self._ttl:
+            return self._keys
+        return None
+
+    def get_keys(self) -> Tuple[str, str]:
+        """(KEY, TWEAK) — 캐시 유효하면 네트워크/파일 I/O 없음"""
+        with self._lock:
+            keys = self._cached_keys()
+            if keys is not None:
+                self.counters["hits"] += 1
+                now = self.clock()
+                if now - self._fetched_at >= self._ttl * self.refresh_ratio and self._refreshing is None:
+                    self._refreshing = threading.Thread(target=self._background_refresh, daemon=True)
+                    self._refreshing.start()
+                return keys
+            self.counters["misses"] += 1
+        with self._fetch_lock:
+            # 기다리는 동안 다른 호출이 조회를 끝냈으면 그 결과 사용
+            with self._lock:
+                keys = self._cached_keys()
+                if keys is not None:
+                    self.counters["coalesced"] += 1
+                    return keys
+            started = self.clock()
+            keys, ttl = self._fetch()
+            with self._lock:
+                self._store(keys, ttl, started)
+            return keys
+
+    def wait_refresh(self, timeout: Optional[float] = None):
+        thread = self._refreshing
+        if thread is not None:
+            thread.join(timeout)
+
+    def invalidate(self):
+        with self._lock:
+            self._keys = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.counters, "ttl_s": self._ttl, "cached": self._keys is not None}
+
+    def close(self):
+        self.wait_refresh()
+        self.vault.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_default_client: Optional[PseudonymizeKeyClient] = None
+_default_lock = threading.Lock()
+
+def default_client() -> PseudonymizeKeyClient:
+    """프로세스 공용 클라이언트 (첫 호출 시 생성)"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = PseudonymizeKeyClient()
+        return _default_client
+
+# 2. Vault에서 가명화 키(예: KEY, TWEAK) 읽기 (프로세스 공용 캐시 사용)
 def read_pseudonymize_keys():
-    token = get_vault_token()
-    url = f"{VAULT_ADDR}/v1/{SECRET_PATH}"
-    headers = {"X-Vault-Token": token}
-    # KV v2라면 데이터는 .json()["data"]["data"]에 있음
-    resp = requests.get(url, headers=headers, verify=VAULT_CACERT)
-    resp.raise_for_status()
-    vault_data = resp.json()
-    # KV v2 엔진일 때는 data.data 구조임
-    data = vault_data["data"]["data"]
-    key = data.get("KEY")
-    tweak = data.get("TWEAK")
-    return key, tweak
+    return default_client().get_keys()
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,186 @@
+# src/security_infra/resource_tuning.py
+"""
+호스트 자원(/proc/meminfo, cgroup 한도, CPU 수) 기준 서비스별 JVM 힙/메모리 한도 산정 → .env 기록
+- 가용 메모리 = min(MemTotal, cgroup memory 한도) - OS 예약분
+- 서비스별 가중치로 컨테이너 한도 배분 후 힙 = 한도 × 비율
+  (Elasticsearch: 힙 ≤ 한도의 50%, 나머지는 파일시스템 캐시/오프힙 / 힙 ≤ 31g: compressed oops 유지)
+- docker-compose.yml이 참조하는 변수만 갱신, .env의 다른 줄/주석은 그대로 유지
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from security_infra.file_utils import atomic_write
+
+MIB = 1024 * 1024
+ALIGN_MIB = 64                  # 한도/힙 반올림 단위
+MIN_RESERVE_MIB = 1024          # OS/도커 데몬/기타 프로세스 예약 최소값
+RESERVE_RATIO = 0.10            # 예약분 = max(최소값, 전체의 10%)
+ES_MAX_HEAP_MIB = 31 * 1024     # compressed oops 한계
+
+# 서비스: (한도 변수, 힙 변수, 배분 가중치, 최소 한도 MiB, 최대 한도 MiB, 힙/한도 비율)
+SERVICE_PROFILES = {
+    "elasticsearch": ("ES_MEM_LIMIT", "ES_MEM", 0.45, 1024, 64 * 1024, 0.50),
+    "logstash": ("LS_MEM_LIMIT", "LS_MEM", 0.18, 768, 16 * 1024, 0.50),
+    "kibana": ("KB_MEM_LIMIT", None, 0.12, 1024, 4 * 1024, None),
+    "keycloak": ("KC_MEM_LIMIT", "KC_HEAP", 0.15, 512, 8 * 1024, 0.70),
+    "vault": ("VT_MEM_LIMIT", None, 0.06, 256, 2 * 1024, None),
+    "openldap": ("LD_MEM_LIMIT", None, 0.04, 128, 1024, None),
+}
+
+def read_meminfo(path: str = "/proc/meminfo") -> Dict[str, int]:
+    """/proc/meminfo → {항목: 바이트}"""
+    info = {}
+    with open(path, "r") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            parts = rest.split()
+            if parts and parts[0].isdigit():
+                info[key] = int(parts[0]) * (1024 if len(parts) > 1 and parts[1] == "kB" else 1)
+    return info
+
+def _read_first(paths: List[str]) -> Optional[str]:
+    for path in paths:
+        try:
+            with open(path, "r") as f:
+                return f.read().strip()
+        except OSError:
+            continue
+    return None
+
+def cgroup_memory_limit(root: str = "/sys/fs/cgroup") -> Optional[int]:
+    """cgroup v2 memory.max / v1 memory.limit_in_bytes (무제한이면 None)"""
+    raw = _read_first([f"{root}/memory.max", f"{root}/memory/memory.limit_in_bytes"])
+    if raw is None or raw == "max":
+        return None
+    limit = int(raw)
+    # v1 무제한은 페이지 정렬된 매우 큰 값
+    return None if limit >= 1 << 60 else limit
+
+def cgroup_cpu_limit(root: str = "/sys/fs/cgroup") -> Optional[float]:
+    """cgroup v2 cpu.max / v1 cfs quota/period → CPU 개수 (무제한이면 None)"""
+    raw = _read_first([f"{root}/cpu.max"])
+    if raw is not None:
+        quota, _, period = raw.partition(" ")
+        if quota != "max":
+            return int(quota) / int(period or 100000)
+        return None
+    quota = _read_first([f"{root}/cpu/cpu.cfs_quota_us", f"{root}/cpu,cpuacct/cpu.cfs_quota_us"])
+    period = _read_first([f"{root}/cpu/cpu.cfs_period_us", f"{root}/cpu,cpuacct/cpu.cfs_period_us"])
+    if quota is None or period is None or int(quota) <= 0:
+        return None
+    return int(quota) / int(period)
+
+def host_resources(meminfo_path: str = "/proc/meminfo", cgroup_root: str = "/sys/fs/cgroup") -> dict:
+    meminfo = read_meminfo(meminfo_path)
+    total = meminfo["MemTotal"]
+    cg_mem = cgroup_memory_limit(cgroup_root)
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    cg_cpu = cgroup_cpu_limit(cgroup_root)
+    return {
+        "mem_total_mib": total // MIB,
+        "mem_available_mib": meminfo.get("MemAvailable", total) // MIB,
+        "cgroup_mem_limit_mib": cg_mem // MIB if cg_mem else None,
+        "effective_mem_mib": min(total, cg_mem or total) // MIB,
+        "cpus": min(cpus, cg_cpu) if cg_cpu else cpus,
+    }
+
+def _align(mib: float) -> int:
+    return max(ALIGN_MIB, int(mib // ALIGN_MIB) * ALIGN_MIB)
+
+def plan_resources(resources: dict, reserve_mib: Optional[int] = None) -> dict:
+    """
+    서비스별 한도/힙 산정
+    반환: {"resources", "reserve_mib", "budget_mib", "services": [...], "env": {변수: 값}, "warnings": [...]}
+    """
+    effective = resources["effective_mem_mib"]
+    if reserve_mib is None:
+        reserve_mib = max(MIN_RESERVE_MIB, int(effective * RESERVE_RATIO))
+    budget = max(0, effective - reserve_mib)
+    warnings = []
+    minimum_total = sum(p[3] for p in SERVICE_PROFILES.values())
+    if budget < minimum_total:
+        warnings.append(
+            f"[WARN] 가용 메모리 {budget}MiB < 서비스 최소 합계 {minimum_total}MiB: "
+            "최소값으로 설정하지만 OOM 위험, 일부 서비스만 기동 권장"
+        )
+    if resources["cpus"] < 2:
+        warnings.append(f"[WARN] CPU {resources['cpus']}개: Elasticsearch/Logstash 동시 기동 시 지연 예상")
+
+    # 가중치 배분 → 최소/최대 적용 → 최소값 때문에 예산을 넘으면 최소 이상인 서비스에서 비례 차감
+    limits = {name: min(max(budget * p[2], p[3]), p[4]) for name, p in SERVICE_PROFILES.items()}
+    for _ in range(len(limits)):
+        over = sum(limits.values()) - budget
+        flexible = {n: limits[n] - SERVICE_PROFILES[n][3] for n in limits if limits[n] > SERVICE_PROFILES[n][3]}
+        if over <= 0 or not flexible:
+            break
+        slack = sum(flexible.values())
+        for name, room in flexible.items():
+            limits[name] -= min(room, over * room / slack)
+
+    services, env = [], {}
+    for name, (limit_var, heap_var, weight, min_mib, max_mib, heap_ratio) in SERVICE_PROFILES.items():
+        limit = _align(limits[name])
+        heap = None
+        if heap_var:
+            heap = _align(limit * heap_ratio)
+            if name == "elasticsearch":
+                heap = min(heap, ES_MAX_HEAP_MIB)
+            env[heap_var] = f"{heap}m"
+        env[limit_var] = f"{limit}m"
+        services.append({"service": name, "limit_mib": limit, "heap_mib": heap,
+                         "limit_var": limit_var, "heap_var": heap_var})
+    allocated = sum(s["limit_mib"] for s in services)
+    if allocated > effective:
+        warnings.append(f"[WARN] 한도 합계 {allocated}MiB가 호스트 메모리 {effective}MiB를 초과")
+    return {"resources": resources, "reserve_mib": reserve_mib, "budget_mib": budget,
+            "allocated_mib": allocated, "services": services, "env": env, "warnings": warnings}
+
+def format_plan(plan: dict) -> str:
+    r = plan["resources"]
+    cg = f", cgroup 한도 {r['cgroup_mem_limit_mib']}MiB" if r["cgroup_mem_limit_mib"] else ""
+    lines = [
+        f"호스트: 메모리 {r['mem_total_mib']}MiB (가용 {r['mem_available_mib']}MiB{cg}), CPU {r['cpus']}",
+        f"배분: 예약 {plan['reserve_mib']}MiB, 서비스 예산 {plan['budget_mib']}MiB, 한도 합계 {plan['allocated_mib']}MiB",
+    ]
+    for s in plan["services"]:
+        heap = f", 힙 {s['heap_var']}={s['heap_mib']}m" if s["heap_var"] else ""
+        lines.append(f"  {s['service']:<14} 한도 {s['limit_var']}={s['limit_mib']}m{heap}")
+    lines.extend(plan["warnings"])
+    return "\n".join(lines)
+
+ENV_LINE = re.compile(r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*=")
+
+def write_env(env_file: Path, values: Dict[str, str]) -> List[str]:
+    """
+    .env 갱신: 관리 변수 줄만 교체/추가, 나머지 줄은 그대로. 반환: 값이 바뀐 변수 목록
+    """
+    env_file = Path(env_file)
+    lines = env_file.read_text(encoding="utf-8").splitlines() if env_file.exists() else []
+    remaining = dict(values)
+    changed = []
+    out = []
+    for line in lines:
+        m = ENV_LINE.match(line)
+        if m and m.group(1) in remaining:
+            key = m.group(1)
+            new_line = f"{key}={remaining.pop(key)}"
+            if line.strip() != new_line:
+                changed.append(key)
+            out.append(new_line)
+        else:
+            out.append(line)
+    if remaining:
+        out.append("# tune-resources 자동 산정값")
+        for key, value in remaining.items():
+            out.append(f"{key}={value}")
+            changed.append(key)
+    if changed:
+        atomic_write(env_file, ("\n".join(out) + "\n").encode("utf-8"), mode=None if env_file.exists() else 0o600,
+                     preserve_owner=True)
+    return changed
@@ -1,5 +1,4 @@
 import os
-import subprocess
 from pathlib import Path
 import yaml
 
@@ -8,18 +7,6 @@ def load_permission_config(config_path):
         cfg = yaml.safe_load(f)
     return cfg
 
-def set_permission_and_mode(target: Path, owner: str, mode: str, logger=print):
-    try:
-        subprocess.run(["sudo", "chown", owner, str(target)], check=True)
-        logger(f"[OK] {target} → chown {owner}")
-    except Exception as e:
-        logger(f"[FAIL] {target} chown: {e}")
-    try:
-        subprocess.run(["sudo", "chmod", mode, str(target)], check=True)
-        logger(f"[OK] {target} → chmod {mode}")
-    except Exception as e:
-        logger(f"[FAIL] {target} chmod: {e}")
-
 def safe_exists(path):
     try:
         return path.exists()
@@ -27,14 +14,79 @@ def safe_exists(path):
         # 권한 없으면 존재는 한다고 간주 (권한 관리 목적으로)
         return True
 
+def select_permission_entries(perm_cfg: dict, services=None):
+    """
+    permissions.yml 항목 중 권한 대상만 (key, item) 순서대로 반환
+    services 지정시 key가 서비스명이거나 '서비스명-'으로 시작하는 항목만
+    """
+    for key, item in perm_cfg.items():
+        if not isinstance(item, dict):
+            continue
+        if "path" not in item and not ("owner" in item and "mode" in item):
+            continue
+        if services and not any(key == s or key.startswith(f"{s}-") for s in services):
+            continue
+        yield key, item
+
+def resolve_permission_target(project_root: Path, key: str, item: dict) -> Path:
+    if "path" in item:
+        # 파일/템플릿/인증서 등 (경로 지정)
+        return project_root / item["path"]
+    # 디렉토리(폴더명은 서비스별 관례에 맞게 직접 경로로 입력)
+    # 예: bitwarden-bw-data → docker/bitwarden/bw-data
+    # 또는 elk → docker/elk 등 실제 경로로 config에 직접 명시 권장
+    # 여기선 키가 상대경로(폴더)라고 가정
+    return project_root / "docker" / key.replace("-", "/")
+
+def build_permission_specs(project_root: Path, perm_cfg: dict, services=None, logger=print):
+    """
+    permission_engine용 spec 목록 생성
+    - recursive: true 디렉토리는 하위 전체 적용 (file_mode 지정시 파일에는 file_mode)
+    - audit_recursive: true 디렉토리는 적용은 디렉토리 자체만, check-permissions 점검은 하위 전체
+    - 별도 항목으로 지정한 경로(인증서, 하위 데이터 디렉토리 등)는 재귀 트리에서 제외 → 서로 덮어쓰며 매번 변경되는 일 방지
+    """
+    from security_infra.permission_engine import parse_mode, parse_owner
+
+    entries = list(select_permission_entries(perm_cfg, services))
+    explicit = [
+        str(resolve_permission_target(project_root, key, item))
+        for key, item in select_permission_entries(perm_cfg)
+    ]
+    specs = []
+    for key, item in entries:
+        target = resolve_permission_target(project_root, key, item)
+        if not safe_exists(target):
+            logger(f"[SKIP] {target} (존재하지 않음)")
+            continue
+        uid, gid = parse_owner(item.get("owner", "1000:1000"))
+        spec = {
+            "name": key,
+            "path": str(target),
+            "uid": uid,
+            "gid": gid,
+            "mode": parse_mode(item.get("mode", "770")),
+            "recursive": bool(item.get("recursive", False)),
+            "audit_recursive": bool(item.get("audit_recursive", False)),
+            "exclude": [p for p in explicit if p != str(target)],
+        }
+        if "file_mode" in item:
+            spec["file_mode"] = parse_mode(item["file_mode"])
+        specs.append(spec)
+    return specs
+
 def set_permissions(
     project_root: Path = None,
     config_file: Path = None,
-    logger=print
-):
+    logger=print,
+    services=None,
+) -> str:
     """
     permissions.yml에 정의된 모든 폴더/파일/템플릿/인증서의 권한을 일괄 변경
+    - 현재 소유자/모드를 stat으로 확인 후 다른 경우에만 os.chown/os.chmod
+    - root가 필요한 경로는 모아서 sudo 1회로 처리
     """
+    from security_infra.permission_engine import apply_specs
+
     if project_root is None:
         project_root = Path(__file__).resolve().parents[2]
     if config_file is None:
@@ -42,28 +94,26 @@ def set_permissions(
     perm_cfg = load_permission_config(config_file)
 
     logger("===[권한 변경(chown & chmod) 시작]===")
+    specs = build_permission_specs(project_root, perm_cfg, services, logger=logger)
+    report = apply_specs(specs, logger=logger)
 
-    for key, item in perm_cfg.items():
-        if isinstance(item, dict) and "path" in item:
-            # 파일/템플릿/인증서 등 (경로 지정)
-            target = project_root / item["path"]
-            owner = item.get("owner", "1000:1000")
-            mode = item.get("mode", "770")
-            if not safe_exists(target):
-                logger(f"[SKIP] {target} (존재하지 않음)")
-                continue
-            set_permission_and_mode(target, owner, mode, logger=logger)
-        elif isinstance(item, dict) and "owner" in item and "mode" in item:
-            # 디렉토리(폴더명은 서비스별 관례에 맞게 직접 경로로 입력)
-            # 예: bitwarden-bw-data → docker/bitwarden/bw-data
-            # 또는 elk → docker/elk 등 실제 경로로 config에 직접 명시 권장
-            # 여기선 키가 상대경로(폴더)라고 가정
-            target = project_root / "docker" / key.replace("-", "/")
-            owner = item.get("owner", "1000:1000")
-            mode = item.get("mode", "770")
-            if not safe_exists(target):
-                logger(f"[SKIP] {target} (존재하지 않음)")
-                continue
-            set_permission_and_mode(target, owner, mode, logger=logger)
-
+    summary = ["권한 변경 요약:"]
+    for spec in specs:
+        counts = report.counts.get(spec["name"])
+        status = "FAIL" if counts["failed"] else "OK"
+        scope = " (재귀)" if spec["recursive"] else ""
+        line = (
+            f"  [{status}] {spec['name']}: {spec['path']}{scope} "
+            f"변경 {counts['changed']}, 유지 {counts['unchanged']}, 실패 {counts['failed']}"
+        )
+        logger(line.strip())
+        summary.append(line)
+        for detail in counts["failed_paths"]:
+            summary.append(f"      - {detail}")
+    totals = report.totals()
+    summary.append(
+        f"합계: 변경 {totals['changed']}, 유지 {totals['unchanged']}, "
+        f"실패 {totals['failed']}, sudo 호출 {report.sudo_calls}회"
+    )
     logger("[완료] 권한 변경 작업 종료.")
+    return "\n".join(summary)
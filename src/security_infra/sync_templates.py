@@ -1,54 +1,184 @@
 # src/security_infra/sync_templates.py
 
-import shutil
+import hashlib
+import json
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-def sync_templates(
+from security_infra.file_utils import atomic_write, file_signature
+from security_infra.template_engine import render_bytes, template_names, template_variables, variables_hash
+
+# 배포 경로 (templates/ 기준 상대경로 → (프로젝트 루트 기준 상대경로, 재시작 대상 서비스))
+# - 목록에 없는 템플릿은 경로를 추측하지 않고 [WARN] 후 건너뜀 → 새 템플릿은 여기 등록
+# - 대상이 None이면 배포하지 않는 참고용 템플릿
+TEMPLATE_DESTINATIONS = {
+    "elk/logstash.conf": ("docker/elk/logstash/pipeline/logstash.conf", "elk"),
+    "vault/vault.hcl": ("docker/vault/config/vault.hcl", "vault"),
+    # Vault Agent 설정: templates/vault/docker-compose.yml의 agent가 ./docker/agent/config를 /agent로 마운트
+    # (루트 docker-compose.yml에는 agent 서비스가 없으므로 재시작 대상 없음)
+    "vault/config.hcl": ("docker/agent/config/config.hcl", ""),
+    # 상대경로(./docker/...) 볼륨을 쓰는 compose 예시 파일 → 복사하면 경로가 깨지므로 배포하지 않음
+    "vault/docker-compose.yml": (None, ""),
+    "bitwarden/docker-compose.override.yml": ("docker/bitwarden/docker-compose.override.yml", "bitwarden"),
+}
+
+# 마지막으로 배포한 내용 해시 + 원본 stat/사용 변수 해시 캐시 (실행 간 렌더링 생략 판단용)
+STATE_FILE = "docker/.template-state.json"
+
+def template_key(project_root: Path, src: Path) -> Optional[str]:
+    """templates/ 기준 상대경로 (숨김 파일/templates 밖 경로는 None)"""
+    try:
+        rel = Path(src).relative_to(project_root / "templates")
+    except ValueError:
+        return None
+    if not rel.parts or any(part.startswith(".") for part in rel.parts):
+        return None
+    return rel.as_posix()
+
+def template_target(project_root: Path, src: Path) -> Optional[Tuple[Path, str]]:
+    """
+    templates/ 아래 원본 1개 → (복사 대상, 서비스). 배포 대상이 아니거나 등록되지 않은 템플릿은 None
+    서비스 = compose --service 값 (재시작 대상, 없으면 "")
+    """
+    key = template_key(project_root, src)
+    dst, service = TEMPLATE_DESTINATIONS.get(key, (None, "")) if key else (None, "")
+    if dst is None:
+        return None
+    return project_root / dst, service
+
+def _warn_unmapped(project_root: Path, src: Path, logger: Callable[[str], None]):
+    key = template_key(project_root, src)
+    if key and key not in TEMPLATE_DESTINATIONS and Path(src).is_file():
+        logger(f"[WARN] 배포 경로가 등록되지 않은 템플릿 건너뜀: templates/{key} (TEMPLATE_DESTINATIONS에 추가 필요)")
+
+def discover_templates(project_root: Path, logger: Callable[[str], None] = print) -> List[Tuple[Path, Path, str]]:
+    """
+    templates/ 아래 배포 대상 파일 → [(원본, 복사 대상, 서비스)] (숨김 파일 제외, 경로순)
+    """
+    found = []
+    for src in sorted((project_root / "templates").rglob("*")):
+        target = template_target(project_root, src)
+        if target and src.is_file():
+            found.append((src, *target))
+        elif not target:
+            _warn_unmapped(project_root, src, logger)
+    return found
+
+def load_state(state_path: Path) -> dict:
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_state(state: dict, state_path: Path):
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+    atomic_write(state_path, data, mode=0o644)
+
+def sync_template_files(
     project_root: Path = None,
-    logger: Callable[[str], None] = print
-) -> str:
+    logger: Callable[[str], None] = print,
+    force: bool = False,
+    state_path: Optional[Path] = None,
+    variables: Optional[Dict[str, str]] = None,
+    only: Optional[Iterable[Path]] = None,
+) -> dict:
     """
-    templates/{elk,vault}/ 설정 파일을 프로젝트 루트 docker/ 경로로 복사.
-    (권한/퍼미션은 건드리지 않음)
+    템플릿 렌더링 후 결과 해시가 바뀐 파일만 원자적 교체로 기록 (변경 없는 파일은 mtime도 건드리지 않음)
+    원본/대상 stat과 사용 변수 해시가 상태 파일과 같으면 원본을 읽거나 렌더링하지 않음
+    variables 미지정 시 config.yml template_vars + SECURITY_INFRA_* 환경변수
+    only 지정 시 해당 원본 파일만 처리 (watch 모드)
+    반환: {"copied": [...], "unchanged": [...], "errors": [...], "services": [재시작 대상 서비스]}
     """
     if project_root is None:
         project_root = Path(__file__).resolve().parents[2]
+    state_path = state_path or project_root / STATE_FILE
+    state = load_state(state_path)
+    if variables is None:
+        variables = template_variables()
+    copied, unchanged, errors, services = [], [], [], set()
 
-    provision_list = [
-        # (템플릿 원본, 복사 대상)
-        (
-            project_root / "templates/elk/logstash.conf",
-            project_root / "docker/elk/logstash/pipeline/logstash.conf"
-        ),
-        (
-            project_root / "templates/vault/vault.hcl",
-            project_root / "docker/vault/config/vault.hcl"
-        ),
-    ]
-
-    copied, errors = [], []
-
-    for src, dst in provision_list:
+    if only is None:
+        templates = discover_templates(project_root, logger)
+    else:
+        templates = []
+        for src in sorted(set(Path(p) for p in only)):
+            target = template_target(project_root, src)
+            if target and src.is_file():
+                templates.append((src, *target))
+            elif not target:
+                _warn_unmapped(project_root, src, logger)
+
+    for src, dst, service in templates:
+        src_rel = src.relative_to(project_root).as_posix()
+        dst_rel = dst.relative_to(project_root).as_posix()
         try:
+            entry = state.get(dst_rel, {})
+            dst_sig = file_signature(dst)
+            src_sig = file_signature(src)
+            if (not force and dst_sig is not None and entry.get("src") == src_rel
+                    and entry.get("src_sig") == src_sig and entry.get("dst_sig") == dst_sig
+                    and entry.get("vars") == variables_hash(entry.get("names") or [], variables)):
+                # 0) 원본/대상/변수 모두 지난 실행과 같음 → 읽기·렌더링 없이 유지
+                unchanged.append(dst_rel)
+                continue
+            source = src.read_bytes()
+            content = render_bytes(source, variables)
+            digest = hashlib.sha256(content).hexdigest()
+            names = list(template_names(source))
+            render_key = {"src_sig": src_sig, "names": names, "vars": variables_hash(names, variables)}
+            if not force and dst_sig is not None:
+                # 1) 캐시와 해시/stat 일치 → 파일을 읽지도 않음
+                # 2) 캐시가 없거나 stat이 다르면 실제 내용 해시 비교
+                same = entry.get("sha256") == digest and entry.get("dst_sig") == dst_sig
+                if same or hashlib.sha256(dst.read_bytes()).hexdigest() == digest:
+                    state[dst_rel] = {"src": src_rel, "sha256": digest, "dst_sig": dst_sig, **render_key}
+                    unchanged.append(dst_rel)
+                    continue
             dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
-            logger(f"[OK] {src.relative_to(project_root)} → {dst.relative_to(project_root)}")
-            copied.append(str(dst.relative_to(project_root)))
+            # 기존 파일은 모드/소유자 유지(set-permissions 결과 보존), 신규는 원본 모드
+            mode = None if dst_sig is not None else src.stat().st_mode & 0o7777
+            atomic_write(dst, content, mode=mode, preserve_owner=True)
+            state[dst_rel] = {"src": src_rel, "sha256": digest, "dst_sig": file_signature(dst), **render_key}
+            logger(f"[OK] {src_rel} → {dst_rel}")
+            copied.append(dst_rel)
+            if service:
+                services.add(service)
         except Exception as e:
             logger(f"[FAIL] {src} → {dst}: {e}")
             errors.append(f"{src} → {dst}: {e}")
 
+    save_state(state, state_path)
+    return {"copied": copied, "unchanged": unchanged, "errors": errors, "services": sorted(services)}
+
+def format_sync_summary(result: dict) -> str:
     summary = []
     summary.append("템플릿 복사 요약:")
-    for f in copied:
+    for f in result["copied"]:
         summary.append(f"  [복사] {f}")
-    if errors:
+    for f in result["unchanged"]:
+        summary.append(f"  [유지] {f}")
+    if result["errors"]:
         summary.append("[경고] 복사 실패:")
-        for err in errors:
+        for err in result["errors"]:
             summary.append(f"  {err}")
-
+    if result["services"]:
+        summary.append(f"재시작 필요 서비스: {', '.join(result['services'])}")
+    else:
+        summary.append("재시작 필요 서비스: 없음")
     return "\n".join(summary)
 
+def sync_templates(
+    project_root: Path = None,
+    logger: Callable[[str], None] = print,
+    force: bool = False,
+) -> str:
+    """
+    templates/ 아래 배포 대상(TEMPLATE_DESTINATIONS) 설정 파일을 렌더링해 프로젝트 루트 docker/ 경로로 복사.
+    렌더 결과가 바뀐 파일만 복사 (권한/퍼미션은 건드리지 않음)
+    """
+    return format_sync_summary(sync_template_files(project_root, logger=logger, force=force))
+
 if __name__ == "__main__":
-    print(provision_templates())
+    print(sync_templates())
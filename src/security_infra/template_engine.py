@@ -0,0 +1,148 @@
+# src/security_infra/template_engine.py
+"""
+templates/ 렌더링 엔진 (표준 라이브러리만 사용)
+- 치환 문법: {{ 이름 }} / {{ 이름 | 기본값 }} (logstash %{...}, HCL ${...}와 충돌 없음)
+- 변수 우선순위: 환경변수 SECURITY_INFRA_<이름 대문자> > config.yml template_vars > 템플릿 기본값
+- 컴파일 결과는 템플릿 해시로, 렌더 결과는 (템플릿 해시, 사용 변수 해시)로 캐시
+  → 여러 호스트를 렌더링해도 같은 템플릿/같은 값 조합은 한 번만 처리
+- RenderCache는 프로세스 내 캐시 (실행 간 재사용은 sync_templates가 상태 파일에
+  원본 stat/사용 변수 해시를 기록해 렌더링 자체를 건너뛰는 방식으로 처리)
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+ENV_PREFIX = "SECURITY_INFRA_"
+CACHE_SIZE = 512
+
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*(?:\|\s*(.*?)\s*)?\}\}")
+
+class CompiledTemplate:
+    """리터럴/변수 조각 목록 (변수 조각 = (이름, 기본값 또는 None))"""
+
+    def __init__(self, parts: List, names: Tuple[str, ...]):
+        self.parts = parts
+        self.names = names
+
+    def variables_hash(self, variables: Dict[str, str]) -> str:
+        return variables_hash(self.names, variables)
+
+    def render(self, variables: Dict[str, str]) -> str:
+        out, missing = [], []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            name, default = part
+            value = variables.get(name, default)
+            if value is None:
+                missing.append(name)
+                continue
+            out.append(str(value))
+        if missing:
+            raise ValueError(f"[ERROR] 템플릿 변수 값 없음: {', '.join(sorted(set(missing)))}")
+        return "".join(out)
+
+def variables_hash(names, variables: Dict[str, str]) -> str:
+    """템플릿이 실제로 참조하는 변수만 해시 (무관한 변수 차이는 캐시 적중에 영향 없음)"""
+    used = {name: variables.get(name) for name in names}
+    return hashlib.sha256(json.dumps(used, sort_keys=True).encode("utf-8")).hexdigest()
+
+def compile_template(text: str) -> CompiledTemplate:
+    parts, names, pos = [], [], 0
+    for m in PLACEHOLDER.finditer(text):
+        if m.start() > pos:
+            parts.append(text[pos:m.start()])
+        parts.append((m.group(1), m.group(2)))
+        if m.group(1) not in names:
+            names.append(m.group(1))
+        pos = m.end()
+    if pos < len(text):
+        parts.append(text[pos:])
+    return CompiledTemplate(parts, tuple(names))
+
+class RenderCache:
+    """컴파일/렌더 결과 LRU 캐시 + 적중 통계 (프로세스 내에서만 유지, 디스크에 저장하지 않음)"""
+
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self.compiled: "OrderedDict[str, CompiledTemplate]" = OrderedDict()
+        self.rendered: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self.stats = {"compile_hits": 0, "compile_misses": 0, "render_hits": 0, "render_misses": 0}
+
+    def _get(self, table: OrderedDict, key, kind: str):
+        if key in table:
+            table.move_to_end(key)
+            self.stats[f"{kind}_hits"] += 1
+            return table[key]
+        self.stats[f"{kind}_misses"] += 1
+        return None
+
+    def _put(self, table: OrderedDict, key, value):
+        table[key] = value
+        if len(table) > self.size:
+            table.popitem(last=False)
+
+    def compile(self, source: bytes) -> Tuple[str, CompiledTemplate]:
+        """원본 바이트 → (템플릿 해시, 컴파일 결과). UTF-8이 아니면 변수 없는 템플릿으로 취급"""
+        template_hash = hashlib.sha256(source).hexdigest()
+        compiled = self._get(self.compiled, template_hash, "compile")
+        if compiled is None:
+            try:
+                compiled = compile_template(source.decode("utf-8"))
+            except UnicodeDecodeError:
+                compiled = CompiledTemplate([], ())
+            self._put(self.compiled, template_hash, compiled)
+        return template_hash, compiled
+
+    def render(self, source: bytes, variables: Dict[str, str]) -> bytes:
+        """
+        원본 바이트 → 렌더 결과 바이트
+        UTF-8이 아니거나 치환 문법이 없는 파일은 원본 그대로 반환
+        """
+        template_hash, compiled = self.compile(source)
+        if not compiled.names:
+            return source
+
+        key = (template_hash, compiled.variables_hash(variables))
+        rendered = self._get(self.rendered, key, "render")
+        if rendered is None:
+            rendered = compiled.render(variables).encode("utf-8")
+            self._put(self.rendered, key, rendered)
+        return rendered
+
+# 프로세스 공용 캐시
+_CACHE = RenderCache()
+
+def render_bytes(source: bytes, variables: Dict[str, str], cache: Optional[RenderCache] = None) -> bytes:
+    return (cache or _CACHE).render(source, variables)
+
+def template_names(source: bytes, cache: Optional[RenderCache] = None) -> Tuple[str, ...]:
+    """템플릿이 참조하는 변수 이름 (등장 순서)"""
+    return (cache or _CACHE).compile(source)[1].names
+
+def template_variables(config: Optional[dict] = None, environ=None) -> Dict[str, str]:
+    """config.yml template_vars + SECURITY_INFRA_* 환경변수 (환경변수 우선)"""
+    if config is None:
+        from security_infra.config_loader import load_config
+        config = load_config() or {}
+    environ = os.environ if environ is None else environ
+    variables = {str(k): str(v) for k, v in (config.get("template_vars") or {}).items()}
+    for key, value in environ.items():
+        if key.startswith(ENV_PREFIX):
+            variables[key[len(ENV_PREFIX):].lower()] = value
+    return variables
+
+def parse_var_overrides(items: List[str]) -> Dict[str, str]:
+    """["이름=값", ...] → dict (CLI --var)"""
+    variables = {}
+    for item in items:
+        name, sep, value = item.partition("=")
+        if not sep or not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", name.strip()):
+            raise ValueError(f"[ERROR] 잘못된 --var 형식: {item} (이름=값)")
+        variables[name.strip()] = value
+    return variables
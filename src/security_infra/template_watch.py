@@ -0,0 +1,198 @@
+# src/security_infra/template_watch.py
+"""
+sync-templates --watch: templates/ 변경 감시 → 바뀐 파일만 즉시 docker/ 경로로 반영
+- Linux inotify(ctypes, 외부 패키지 없음) 사용, 불가하면 stat 폴링으로 대체
+- 대기 중에는 fd에서 블로킹 (idle CPU ≈ 0), 폴링 모드는 interval마다 stat 스캔
+- 연속 저장(에디터 임시파일/rename 등)은 debounce 동안 모아 한 번에 반영
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set
+
+DEFAULT_DEBOUNCE = 0.1          # 초
+DEFAULT_POLL_INTERVAL = 1.0     # 초 (폴링 모드)
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+class InotifyWatcher:
+    """templates/ 트리 inotify 감시 (하위 디렉토리 생성 시 자동 추가)"""
+
+    def __init__(self, root: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self.root = Path(root)
+        self.dirs: Dict[int, Path] = {}
+        self._watch_tree(self.root)
+
+    def _watch_tree(self, top: Path):
+        for dirpath, dirnames, _ in os.walk(top):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            wd = self._add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch 실패: {dirpath}")
+            self.dirs[wd] = Path(dirpath)
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        """이벤트가 올 때까지(최대 timeout초) 블로킹 → 변경된 파일 경로 집합"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="surrogateescape")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # 큐 넘침 → 전체 파일을 변경으로 간주
+                changed.update(p for p in self.root.rglob("*") if p.is_file())
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF):
+                self.dirs.pop(wd, None)
+                continue
+            base = self.dirs.get(wd)
+            if base is None or not name:
+                continue
+            path = base / name
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not name.startswith("."):
+                    self._watch_tree(path)
+                    changed.update(p for p in path.rglob("*") if p.is_file())
+                continue
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """inotify 불가 환경(비 Linux, 네트워크 파일시스템 등)용 stat 폴링"""
+
+    def __init__(self, root: Path, interval: float = DEFAULT_POLL_INTERVAL):
+        self.root = Path(root)
+        self.interval = interval
+        self.signatures = self._scan()
+
+    def _scan(self) -> Dict[Path, tuple]:
+        signatures = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for name in filenames:
+                path = Path(dirpath) / name
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                signatures[path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return signatures
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        current = self._scan()
+        changed = {p for p, sig in current.items() if self.signatures.get(p) != sig}
+        self.signatures = current
+        return changed
+
+    def close(self):
+        pass
+
+def open_watcher(root: Path, polling: bool = False, interval: float = DEFAULT_POLL_INTERVAL, logger=print):
+    if not polling:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            logger(f"[WARN] inotify 사용 불가, 폴링({interval}s)으로 대체: {e}")
+    return PollingWatcher(root, interval)
+
+def watch_templates(
+    project_root: Path = None,
+    logger: Callable[[str], None] = print,
+    debounce: float = DEFAULT_DEBOUNCE,
+    polling: bool = False,
+    interval: float = DEFAULT_POLL_INTERVAL,
+    variables: Optional[Dict[str, str]] = None,
+    reload: Optional[Callable[[str], None]] = None,
+    on_batch: Optional[Callable[[dict], None]] = None,
+    stop: Optional[threading.Event] = None,
+    ready: Optional[threading.Event] = None,
+):
+    """
+    변경 감시 루프 (stop이 set되거나 KeyboardInterrupt까지)
+    - 변경 묶음마다 바뀐 원본만 sync_template_files(only=...)로 반영
+    - reload 지정 시 렌더 결과가 실제로 바뀐 서비스마다 reload(서비스) 호출
+    - on_batch(result): 묶음별 결과 (result["elapsed_ms"] = 첫 이벤트 → 반영 완료)
+    """
+    from security_infra.sync_templates import sync_template_files
+    from security_infra.template_engine import template_variables
+
+    if project_root is None:
+        project_root = Path(__file__).resolve().parents[2]
+    if variables is None:
+        variables = template_variables()
+    watcher = open_watcher(project_root / "templates", polling, interval, logger)
+    mode = "폴링" if isinstance(watcher, PollingWatcher) else "inotify"
+    logger(f"[INFO] templates/ 감시 시작 ({mode}, debounce {int(debounce * 1000)}ms)")
+    if ready is not None:
+        ready.set()
+    # stop 이벤트 확인 주기 (없으면 이벤트가 올 때까지 무기한 블로킹)
+    idle_timeout = None if stop is None else 0.2
+    try:
+        while stop is None or not stop.is_set():
+            changed = watcher.wait(idle_timeout)
+            if not changed:
+                continue
+            started = time.perf_counter()
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            result = sync_template_files(project_root, logger=logger, variables=variables, only=changed)
+            if reload is not None:
+                for service in result["services"]:
+                    try:
+                        reload(service)
+                    except Exception as e:
+                        logger(f"[FAIL] {service} 리로드 실패: {e}")
+            result["elapsed_ms"] = round((time.perf_counter() - started - debounce) * 1000, 1)
+            if result["copied"] or result["errors"]:
+                logger(
+                    f"[INFO] 변경 반영 {len(result['copied'])}개, 실패 {len(result['errors'])}개, "
+                    f"대상 서비스 {', '.join(result['services']) or '없음'} ({result['elapsed_ms']}ms)"
+                )
+            if on_batch is not None:
+                on_batch(result)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        logger("[INFO] templates/ 감시 종료")
@@ -0,0 +1,273 @@
+# src/security_infra/transit_engine.py
+"""
+Vault Transit 배치 가명화 백엔드 (키 원문을 클라이언트로 가져오지 않음)
+- batch_input 1회 요청에 여러 값을 묶어 전송, 묶음 크기는 페이로드 바이트 기준으로 자동 조정
+  (응답이 목표 지연보다 빠르면 2배로 키우고, 느리거나 413이면 절반으로 줄임)
+- 세션 1개(keep-alive 연결 풀)로 여러 배치를 동시에 전송 (max_inflight)
+- 항목별 실패(batch_results[i].error)는 실패한 항목만 모아 재전송, 요청 전체 실패(429/5xx/연결)는 백오프 후 재시도
+- FF3Cipher와 같은 encrypt_batch/decrypt_batch/valid 인터페이스 → pseudonymize_file에 그대로 사용
+
+mode
+- encrypt: 수렴 암호화(convergent) 키 필요 → 같은 값이면 같은 가명, decrypt로 복원 가능
+    vault write -f transit/keys/pseudonymize derived=true convergent_encryption=true
+- hmac: 단방향 가명 (복원 불가, 복호화 권한 없이 연결키 생성용)
+"""
+
+import base64
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+from security_infra.file_utils import file_signature
+from security_infra.pseudonymize_vault_reader import VAULT_ADDR, VAULT_CACERT, VAULT_TOKEN_PATH, get_vault_token
+from security_infra.vault_client import VaultError, VaultSession
+
+MOUNT = "transit"
+KEY_NAME = "pseudonymize"
+CONTEXT = "pseudonymize"          # 수렴 암호화 키 파생 컨텍스트 (바꾸면 기존 가명과 달라짐)
+MAX_INFLIGHT = 4                  # 동시에 전송 중인 배치 수 (= 연결 풀 크기)
+INITIAL_BATCH_BYTES = 64 * 1024
+MIN_BATCH_BYTES = 4 * 1024
+MAX_BATCH_BYTES = 4 * 1024 * 1024  # Vault 기본 max_request_size(32MiB)보다 충분히 작게
+MAX_BATCH_ITEMS = 10000
+TARGET_LATENCY = 0.5              # 배치 1건 목표 응답 시간(초)
+RETRIES = 3
+BACKOFF = 0.2
+RETRY_STATUS = (412, 429, 500, 502, 503, 504)
+ITEM_OVERHEAD = 48                # {"plaintext": "...", "context": "..."} 항목당 JSON 부가 바이트(근사)
+
+class TransitError(RuntimeError):
+    pass
+
+def _b64(text: str) -> str:
+    return base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+class AdaptiveBatcher:
+    """배치 최대 바이트를 응답 시간에 따라 조정 (스레드 안전)"""
+
+    def __init__(
+        self,
+        initial_bytes: int = INITIAL_BATCH_BYTES,
+        min_bytes: int = MIN_BATCH_BYTES,
+        max_bytes: int = MAX_BATCH_BYTES,
+        max_items: int = MAX_BATCH_ITEMS,
+        target_latency: float = TARGET_LATENCY,
+    ):
+        self.limit = max(min_bytes, min(initial_bytes, max_bytes))
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.target_latency = target_latency
+        self._lock = threading.Lock()
+
+    def take(self, sizes: List[int], start: int) -> int:
+        """sizes[start:]에서 현재 한도에 맞는 구간의 끝 인덱스 (최소 1건)"""
+        with self._lock:
+            limit = self.limit
+        end, total = start, 0
+        stop = min(len(sizes), start + self.max_items)
+        while end < stop and (end == start or total + sizes[end] <= limit):
+            total += sizes[end]
+            end += 1
+        return end
+
+    def observe(self, nbytes: int, seconds: float):
+        with self._lock:
+            if seconds > self.target_latency:
+                self.limit = max(self.min_bytes, self.limit // 2)
+            elif seconds < self.target_latency / 2 and nbytes >= self.limit // 2:
+                # 한도 근처까지 채운 배치가 빨리 끝났을 때만 확대 (마지막 자투리 배치는 무시)
+                self.limit = min(self.max_bytes, self.limit * 2)
+
+    def shrink(self):
+        with self._lock:
+            self.limit = max(self.min_bytes, self.limit // 2)
+
+class TransitEngine:
+    """
+    Vault Transit 가명화 엔진 (스레드 안전, 프로세스당 1개 재사용 권장)
+    stats(): requests/items/retried_items/split_batches/request_retries/batch_bytes
+    """
+
+    def __init__(
+        self,
+        vault_addr: str = VAULT_ADDR,
+        token_path: str = VAULT_TOKEN_PATH,
+        cacert=VAULT_CACERT,
+        key_name: str = KEY_NAME,
+        mode: str = "encrypt",
+        context: Optional[str] = CONTEXT,
+        mount: str = MOUNT,
+        max_inflight: int = MAX_INFLIGHT,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        batcher: Optional[AdaptiveBatcher] = None,
+        timeout: float = 30.0,
+    ):
+        if mode not in ("encrypt", "hmac"):
+            raise ValueError(f"[ERROR] 지원하지 않는 transit mode: {mode} (encrypt|hmac)")
+        self.vault = VaultSession(vault_addr, verify=cacert, timeout=timeout, pool_maxsize=max_inflight)
+        self.token_path = token_path
+        self.key_name = key_name
+        self.mode = mode
+        self.context = _b64(context) if context and mode == "encrypt" else None
+        self.mount = mount.strip("/")
+        self.max_inflight = max(1, max_inflight)
+        self.retries = retries
+        self.backoff = backoff
+        self.batcher = batcher or AdaptiveBatcher()
+        self._lock = threading.Lock()
+        self._token = None
+        self._token_sig = None
+        self.counters = {"requests": 0, "items": 0, "retried_items": 0, "split_batches": 0, "request_retries": 0}
+
+    # ── 토큰 (Vault Agent가 갱신하면 파일 변경 시에만 다시 읽음) ──
+    def _current_token(self, force: bool = False) -> str:
+        with self._lock:
+            sig = file_signature(self.token_path)
+            if force or self._token is None or sig != self._token_sig:
+                self._token = get_vault_token(self.token_path)
+                self._token_sig = sig
+            return self._token
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    # ── 요청 1건 (요청 전체 실패만 여기서 재시도) ──
+    def _send(self, path: str, batch: List[dict]) -> List[dict]:
+        reloaded = False
+        for attempt in range(self.retries + 1):
+            self._count("requests")
+            self._count("items", len(batch))
+            try:
+                resp = self.vault.request("POST", path, json={"batch_input": batch}, token=self._current_token())
+                return (resp.get("data") or {}).get("batch_results") or []
+            except VaultError as e:
+                results = (e.data.get("data") or {}).get("batch_results")
+                if e.status == 400 and results:
+                    # 일부 항목 실패 시 Vault는 400과 함께 항목별 결과를 반환
+                    return results
+                if e.status == 403 and not reloaded:
+                    self._current_token(force=True)
+                    reloaded = True
+                    continue
+                if e.status not in RETRY_STATUS or attempt == self.retries:
+                    raise
+            except requests.RequestException as e:
+                if attempt == self.retries:
+                    # 연결 실패도 TransitError(RuntimeError)로 → 호출측은 VaultError/TransitError만 처리
+                    raise TransitError(f"[ERROR] Vault Transit 연결 실패: {path}: {e}") from e
+            self._count("request_retries")
+            time.sleep(self.backoff * 2 ** attempt)
+        raise TransitError(f"[ERROR] Transit 요청 재시도 초과: {path}")
+
+    def _timed_send(self, path: str, batch: List[dict], nbytes: int):
+        started = time.monotonic()
+        results = self._send(path, batch)
+        self.batcher.observe(nbytes, time.monotonic() - started)
+        return results
+
+    def _run(self, path: str, items: List[dict], sizes: List[int], result_key: str) -> List[str]:
+        """items를 배치로 나눠 동시 전송 → 입력 순서대로 결과. 실패 항목만 모아 재전송"""
+        n = len(items)
+        results: List[Optional[str]] = [None] * n
+        attempts: Dict[int, int] = {}
+        errors: Dict[int, str] = {}
+        retry_queue: deque = deque()
+        cursor = 0
+        with ThreadPoolExecutor(max_workers=self.max_inflight) as pool:
+            inflight = {}
+            while cursor < n or retry_queue or inflight:
+                while len(inflight) < self.max_inflight and (retry_queue or cursor < n):
+                    if retry_queue:
+                        idx = retry_queue.popleft()
+                    else:
+                        end = self.batcher.take(sizes, cursor)
+                        idx = list(range(cursor, end))
+                        cursor = end
+                    nbytes = sum(sizes[i] for i in idx)
+                    future = pool.submit(self._timed_send, path, [items[i] for i in idx], nbytes)
+                    inflight[future] = idx
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = inflight.pop(future)
+                    try:
+                        batch_results = future.result()
+                    except VaultError as e:
+                        if e.status == 413 and len(idx) > 1:
+                            # 페이로드 초과 → 한도를 줄이고 반으로 나눠 재전송
+                            self.batcher.shrink()
+                            self._count("split_batches")
+                            half = len(idx) // 2
+                            retry_queue.extend([idx[:half], idx[half:]])
+                            continue
+                        raise
+                    if len(batch_results) != len(idx):
+                        raise TransitError(f"[ERROR] batch_results 개수 불일치: 요청 {len(idx)}건, 응답 {len(batch_results)}건")
+                    failed = []
+                    for i, item in zip(idx, batch_results):
+                        value = item.get(result_key)
+                        if value is not None and not item.get("error"):
+                            results[i] = value
+                            continue
+                        attempts[i] = attempts.get(i, 0) + 1
+                        if attempts[i] > self.retries:
+                            errors[i] = item.get("error") or f"{result_key} 없음"
+                        else:
+                            failed.append(i)
+                    if failed:
+                        self._count("retried_items", len(failed))
+                        retry_queue.append(failed)
+        if errors:
+            first = min(errors)
+            raise TransitError(f"[ERROR] Transit 처리 실패 {len(errors)}건 (첫 항목 #{first}: {errors[first]})")
+        return results
+
+    def _items(self, field: str, values: List[str]) -> List[dict]:
+        if self.context:
+            return [{field: v, "context": self.context} for v in values]
+        return [{field: v} for v in values]
+
+    def encrypt_batch(self, values: Iterable[str]) -> List[str]:
+        """encrypt: vault:v1:... 암호문, hmac: vault:v1:... HMAC"""
+        encoded = [_b64(v) for v in values]
+        sizes = [len(v) + ITEM_OVERHEAD for v in encoded]
+        if self.mode == "hmac":
+            return self._run(f"{self.mount}/hmac/{self.key_name}", self._items("input", encoded), sizes, "hmac")
+        return self._run(f"{self.mount}/encrypt/{self.key_name}", self._items("plaintext", encoded), sizes, "ciphertext")
+
+    def decrypt_batch(self, values: Iterable[str]) -> List[str]:
+        if self.mode == "hmac":
+            raise ValueError("[ERROR] hmac 모드 가명은 복원할 수 없습니다.")
+        values = list(values)
+        sizes = [len(v) + ITEM_OVERHEAD for v in values]
+        out = self._run(f"{self.mount}/decrypt/{self.key_name}", self._items("ciphertext", values), sizes, "plaintext")
+        return [base64.b64decode(v).decode("utf-8") for v in out]
+
+    def encrypt(self, value: str) -> str:
+        return self.encrypt_batch([value])[0]
+
+    def decrypt(self, value: str) -> str:
+        return self.decrypt_batch([value])[0]
+
+    def valid(self, value: str) -> bool:
+        """빈 값은 가명화하지 않음 (그 외 문자열은 모두 처리 가능)"""
+        return bool(value)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.counters, "batch_bytes": self.batcher.limit}
+
+    def close(self):
+        self.vault.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,82 @@
+# src/security_infra/vault_client.py
+"""
+Vault HTTP API 세션 (requests.Session, keep-alive 연결 풀 재사용)
+- 요청마다 TCP/TLS 연결을 새로 맺지 않음 → 주기적 폴링/반복 조회 비용 최소화
+- sys/seal-status, sys/unseal 등 공용 호출만 제공, 오류 응답은 VaultError
+"""
+
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 5.0
+
+class VaultError(RuntimeError):
+    def __init__(self, status: int, errors, data: Optional[dict] = None):
+        super().__init__(f"[ERROR] Vault {status}: {'; '.join(errors) if errors else '응답 오류'}")
+        self.status = status
+        self.errors = list(errors or [])
+        self.data = data or {}      # 오류 응답 본문 (transit 배치 부분 실패의 batch_results 등)
+
+class VaultSession:
+    """
+    verify: CA 인증서 경로 또는 bool (자체서명 + CA 미지정 시 False)
+    pool_maxsize: 동시에 요청하는 스레드 수만큼 (연결 풀 크기)
+    """
+
+    def __init__(
+        self,
+        vault_addr: str,
+        token: Optional[str] = None,
+        verify=False,
+        timeout: float = DEFAULT_TIMEOUT,
+        pool_maxsize: int = 4,
+    ):
+        self.vault_addr = vault_addr.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.verify = verify
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, path: str, json=None, token: Optional[str] = None) -> dict:
+        headers = {}
+        token = token or self.token
+        if token:
+            headers["X-Vault-Token"] = token
+        resp = self.session.request(method, f"{self.vault_addr}/v1/{path.lstrip('/')}",
+                                    json=json, headers=headers, timeout=self.timeout)
+        try:
+            data = resp.json() if resp.content else {}
+        except ValueError:
+            data = {"errors": [resp.text]}
+        if resp.status_code >= 400:
+            if not isinstance(data, dict):
+                data = {}
+            raise VaultError(resp.status_code, data.get("errors"), data)
+        return data
+
+    def seal_status(self) -> dict:
+        """인증 불필요: sealed, t(threshold), n, progress, initialized"""
+        return self.request("GET", "sys/seal-status")
+
+    def unseal(self, key: str) -> dict:
+        return self.request("PUT", "sys/unseal", json={"key": key})
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def shares_needed(status: dict) -> int:
+    """seal-status → 언실까지 남은 키 공유 수 (언실 상태면 0)"""
+    if not status.get("sealed"):
+        return 0
+    return max(1, int(status.get("t") or 1) - int(status.get("progress") or 0))
@@ -1,4 +1,4 @@
-log_level = "trace"
+log_level = "{{ vault_log_level | trace }}"
 
 
 storage "file" {
@@ -0,0 +1,130 @@
+import json
+import logging
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from security_infra import audit_log
+
+
+@pytest.fixture(autouse=True)
+def fresh_context(monkeypatch):
+    monkeypatch.setenv("PS_EXEC_UUID", "exec-1")
+    audit_log.reset_context()
+    yield
+    audit_log.stop_async()
+    audit_log.reset_context()
+
+
+@pytest.fixture
+def file_logger(tmp_path):
+    logger = logging.getLogger(f"audit-test-{tmp_path.name}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    path = tmp_path / "install.log"
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    logger.addHandler(handler)
+    yield logger, path
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+        h.close()
+
+
+def parse(line):
+    return json.loads(line.split("[AUDIT] ", 1)[1])
+
+
+def test_record_format_and_field_override():
+    text = str(audit_log.make_audit_log("compose-성공", service="vault", exec_id="override"))
+    assert text.startswith("[AUDIT] ")
+    data = json.loads(text[len("[AUDIT] "):])
+    assert list(data)[:7] == ["event", "timestamp", "user", "hostname", "cwd", "pid", "exec_id"]
+    assert data["event"] == "compose-성공" and data["service"] == "vault"
+    assert data["exec_id"] == "override"
+
+
+def test_static_context_computed_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(audit_log.socket, "gethostname", lambda: calls.append(1) or "host-a")
+    records = [audit_log.make_audit_log("e", n=i) for i in range(100)]
+    assert len(calls) == 1
+    assert {parse(str(r))["hostname"] for r in records} == {"host-a"}
+    audit_log.set_exec_id("exec-2")
+    assert parse(str(audit_log.make_audit_log("e")))["exec_id"] == "exec-2"
+    assert parse(str(records[0]))["exec_id"] == "exec-1"        # 기록 시점 컨텍스트 유지
+
+
+def test_serialized_once_and_not_on_caller_thread(file_logger):
+    logger, path = file_logger
+    logger.addHandler(logging.FileHandler(path.with_suffix(".copy")))
+    threads = []
+
+    class Marker:
+        def __str__(self):
+            threads.append(threading.current_thread())
+            return "marker"
+
+    audit_log.start_async(logger)
+    logger.info(audit_log.make_audit_log("e", value=Marker()))
+    audit_log.flush_async()
+    assert len(threads) == 1                                 # 핸들러 2개가 같은 문자열 공유
+    assert threads[0] is not threading.current_thread()
+    assert parse(path.read_text())["value"] == "marker"
+
+
+def test_caller_does_not_wait_for_slow_handler(file_logger):
+    logger, path = file_logger
+    gate = threading.Event()
+
+    class SlowHandler(logging.Handler):
+        def emit(self, record):
+            gate.wait(5)
+
+    logger.handlers.insert(0, SlowHandler())                 # 파일 핸들러보다 먼저 실행
+    audit_log.start_async(logger)
+    try:
+        for i in range(500):
+            logger.info(audit_log.make_audit_log("perm", n=i))
+        assert path.read_text() == ""                        # 아직 기록 전이지만 호출은 끝남
+    finally:
+        gate.set()
+    audit_log.flush_async()
+    lines = path.read_text().splitlines()
+    assert [parse(line)["n"] for line in lines] == list(range(500))
+
+
+def test_start_is_idempotent_and_stop_restores_handlers(file_logger):
+    logger, path = file_logger
+    original = list(logger.handlers)
+    listener = audit_log.start_async(logger)
+    assert audit_log.start_async(logger) is listener
+    assert len(logger.handlers) == 1 and isinstance(logger.handlers[0], audit_log.AuditQueueHandler)
+    logger.info("before stop")
+    audit_log.stop_async()
+    assert logger.handlers == original
+    logger.info("after stop")
+    assert path.read_text().splitlines() == ["INFO before stop", "INFO after stop"]
+
+
+def test_queue_drained_at_exit(tmp_path):
+    path = tmp_path / "exit.log"
+    script = f"""
+import logging
+from security_infra.audit_log import make_audit_log, start_async
+logger = logging.getLogger("exit-test")
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.FileHandler({str(path)!r}))
+start_async(logger)
+for i in range(5000):
+    logger.info(make_audit_log("e", n=i))
+raise SystemExit(3)
+"""
+    src = Path(audit_log.__file__).resolve().parents[1]
+    proc = subprocess.run([sys.executable, "-c", script], env={"PYTHONPATH": str(src)}, timeout=60)
+    assert proc.returncode == 3
+    lines = path.read_text().splitlines()
+    assert len(lines) == 5000 and parse(lines[-1])["n"] == 4999
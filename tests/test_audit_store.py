@@ -0,0 +1,123 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from security_infra import audit_store
+from security_infra.audit_store import AuditIndex, parse_audit_line, tail_lines
+
+BASE = datetime(2026, 10, 1, 9, 0, 0)
+
+
+def audit_line(event, exec_id, minutes, **fields):
+    ts = BASE + timedelta(minutes=minutes)
+    body = {"event": event, "timestamp": ts.isoformat(), "exec_id": exec_id, **fields}
+    return f"{ts:%Y-%m-%d %H:%M:%S},000 INFO [AUDIT] {json.dumps(body, ensure_ascii=False)}\n"
+
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / "install.log"
+    lines = []
+    for i in range(300):
+        lines.append(audit_line("compose-실행시도", f"run-{i // 3}", i, service="vault"))
+        if i % 50 == 0:
+            lines.append(audit_line("compose-실패", f"run-{i // 3}", i, error="timeout"))
+        if i % 100 == 0:
+            lines.append("2026-10-01 09:00:00,000 ERROR SysLogHandler 등록 실패: 없음\n")
+    path.write_text("".join(lines), encoding="utf-8")
+    return path
+
+
+def test_parse_audit_line():
+    assert parse_audit_line(audit_line("e", "x", 0))["exec_id"] == "x"
+    assert parse_audit_line("INFO 일반 메시지") is None
+    assert parse_audit_line("INFO [AUDIT] {broken") is None
+
+
+def test_query_filters(log):
+    with AuditIndex(log) as index:
+        assert index.update() == 306
+        failed = index.query(event="compose-실패")
+        assert [r["record"]["exec_id"] for r in failed] == [f"run-{i // 3}" for i in range(0, 300, 50)]
+        assert len(index.query(exec_id="run-0")) == 4
+        assert len(index.query(event="compose-*")) == 306
+        since = (BASE + timedelta(minutes=200)).timestamp()
+        assert [r["record"]["exec_id"] for r in index.query(event="compose-실패", since=since)] == ["run-66", "run-83"]
+        until = (BASE + timedelta(minutes=2)).timestamp()
+        assert len(index.query(until=until)) == 4
+        last = index.query(event="compose-실행시도", last=2)
+        assert [r["record"]["exec_id"] for r in last] == ["run-99", "run-99"]
+        assert last[-1]["line"] == audit_line("compose-실행시도", "run-99", 299, service="vault").rstrip("\n")
+
+
+def test_update_reads_only_appended_bytes(log, monkeypatch):
+    with AuditIndex(log) as index:
+        index.update()
+        size = log.stat().st_size
+        with open(log, "a", encoding="utf-8") as f:
+            f.write(audit_line("compose-실패", "run-new", 400))
+            f.write('2026-10-01 INFO [AUDIT] {"event": "partial"')      # 기록 중인 줄
+        parsed = []
+        original = audit_store.parse_audit_line
+        monkeypatch.setattr(audit_store, "parse_audit_line", lambda line: parsed.append(line) or original(line))
+        assert index.update() == 1
+        assert len(parsed) == 1                                          # 기존 부분은 다시 읽지 않음
+        assert index.stats()["indexed_bytes"] > size
+        with open(log, "a", encoding="utf-8") as f:
+            f.write(', "exec_id": "run-new"}\n')
+        assert index.update() == 1
+        assert [r["record"]["event"] for r in index.query(exec_id="run-new")] == ["compose-실패", "partial"]
+
+
+def test_index_persists_across_instances(log):
+    with AuditIndex(log) as index:
+        index.update()
+    with AuditIndex(log) as index:
+        assert index.update() == 0
+        assert index.stats()["records"] == 306
+    assert audit_store.index_path(log).exists()
+
+
+def test_rotation_and_truncation_rebuild(log):
+    with AuditIndex(log) as index:
+        index.update()
+        log.write_text(audit_line("rotated", "r1", 0), encoding="utf-8")
+        assert index.update() == 1
+        assert [r["record"]["event"] for r in index.query()] == ["rotated"]
+        # 같은 inode, 크기는 더 크지만 앞부분이 바뀐 경우
+        with open(log, "r+", encoding="utf-8") as f:
+            f.write(audit_line("replaced", "r2", 0) + audit_line("replaced", "r2", 1))
+        assert index.update() == 2
+        assert {r["record"]["event"] for r in index.query()} == {"replaced"}
+
+
+def test_tail_lines_reads_from_end(log, monkeypatch):
+    all_lines = log.read_text(encoding="utf-8").splitlines()
+    assert tail_lines(log, 5, block=128) == all_lines[-5:]
+    assert tail_lines(log, 10_000, block=4096) == all_lines
+    assert tail_lines(log, 0) == []
+    reads = []
+    real_open = open
+
+    class Tracking:
+        def __init__(self, f):
+            self.f = f
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.f.close()
+
+        def seek(self, *args):
+            return self.f.seek(*args)
+
+        def read(self, n):
+            reads.append(n)
+            return self.f.read(n)
+
+    monkeypatch.setattr(audit_store, "open", lambda *a, **k: Tracking(real_open(*a, **k)), raising=False)
+    tail_lines(log, 3, block=1024)
+    assert sum(reads) <= 2048 < os.path.getsize(log)
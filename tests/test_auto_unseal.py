@@ -0,0 +1,377 @@
+import http.server
+import io
+import json
+import os
+import socketserver
+import stat
+import sys
+import threading
+import time
+
+import pytest
+
+from security_infra import auto_unseal as au
+
+
+FAKE_BW = r'''#!{python}
+import json, os, sys, time
+appdata = os.environ.get("BITWARDENCLI_APPDATA_DIR", "")
+log = os.path.join(os.environ["FAKE_BW_LOG"], str(os.getpid()))
+with open(log + ".tmp", "w") as f:
+    json.dump({{"args": sys.argv[1:], "appdata": appdata}}, f)
+os.replace(log + ".tmp", log)
+cmd = sys.argv[1]
+
+def items(account):
+    filler = [{{"name": f"item-{{i}}", "fields": [{{"name": "x", "value": "y" * 50}}]}}
+              for i in range(int(os.environ.get("FAKE_BW_FILLER", "0")))]
+    target = {{"name": "vault unseal key", "fields": [{{"name": "Unseal Key", "value": "key-" + account}}]}}
+    return [filler[0]] + [target] + filler[1:] if filler else [{{"name": "other"}}, target]
+
+if cmd == "login":
+    open(os.path.join(appdata, "data.json"), "w").write(sys.argv[2])
+elif cmd == "unlock":
+    print("session-" + open(os.path.join(appdata, "data.json")).read())
+elif cmd in ("get", "list"):
+    account = os.environ.get("FAKE_BW_ACCOUNT") or open(os.path.join(appdata, "data.json")).read()
+    if account.startswith("slow"):
+        time.sleep(30)
+    found = items(account)
+    if cmd == "get":
+        match = [i for i in found if i["name"] == sys.argv[3]]
+        if not match:
+            sys.stderr.write("Not found.")
+            sys.exit(1)
+        print(json.dumps(match[0]))
+    else:
+        if "--search" in sys.argv:
+            search = sys.argv[sys.argv.index("--search") + 1]
+            found = [i for i in found if search in i["name"]]
+        sys.stdout.write("[")
+        for n, item in enumerate(found):
+            sys.stdout.write(("," if n else "") + json.dumps(item))
+        sys.stdout.write("]")
+'''
+
+
+@pytest.fixture
+def fake_bw(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    log_dir = tmp_path / "calls"
+    bin_dir.mkdir()
+    log_dir.mkdir()
+    script = bin_dir / "bw"
+    script.write_text(FAKE_BW.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_BW_LOG", str(log_dir))
+    monkeypatch.delenv("BW_SERVER", raising=False)
+
+    def calls():
+        return [json.loads(p.read_text()) for p in log_dir.iterdir() if p.suffix != ".tmp"]
+    return calls
+
+
+def test_fetch_account_key_uses_isolated_appdata(fake_bw):
+    group = au.BwProcessGroup()
+    keys = {}
+    threads = [threading.Thread(target=lambda a=a: keys.update({a: au.fetch_account_key(a, "pw", group)}))
+               for a in ("alice@x", "bob@x")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert keys == {"alice@x": "key-alice@x", "bob@x": "key-bob@x"}
+    dirs = {c["appdata"] for c in fake_bw()}
+    assert len(dirs) == 2
+    assert all(not os.path.exists(d) for d in dirs)
+
+
+def test_iter_json_array_parses_incrementally():
+    items = [{"name": f"i{n}", "fields": [{"name": "k", "value": "v]},{" * n}]} for n in range(50)]
+    text = json.dumps(items)
+
+    class Reader(io.StringIO):
+        consumed = 0
+
+        def read(self, size=-1):
+            data = super().read(size)
+            Reader.consumed += len(data)
+            return data
+
+    assert list(au.iter_json_array(Reader(text), chunk_size=7)) == items
+    Reader.consumed = 0
+    stream = au.iter_json_array(Reader(text), chunk_size=64)
+    assert next(stream) == items[0]
+    assert Reader.consumed < 200
+    assert list(au.iter_json_array(io.StringIO(" [ ] "))) == []
+    with pytest.raises(ValueError):
+        list(au.iter_json_array(io.StringIO('[{"a": 1}, {"b"')))
+
+
+def test_find_unseal_key_uses_targeted_get(fake_bw, monkeypatch):
+    monkeypatch.setenv("FAKE_BW_ACCOUNT", "alice")
+    assert au.find_unseal_key("s", "vault unseal key") == "key-alice"
+    assert [c["args"][:2] for c in fake_bw()] == [["get", "item"]]
+
+
+def test_find_unseal_key_streams_listing_and_stops_early(fake_bw, monkeypatch):
+    monkeypatch.setenv("FAKE_BW_ACCOUNT", "bob")
+    monkeypatch.setenv("FAKE_BW_FILLER", "200000")
+    t0 = time.perf_counter()
+    assert au.find_unseal_key("s") == "key-bob"
+    assert time.perf_counter() - t0 < 10
+    assert [c["args"] for c in fake_bw()] == [["list", "items", "--session", "s"]]
+
+
+def test_find_unseal_key_never_substitutes_other_item(fake_bw, monkeypatch):
+    monkeypatch.setenv("FAKE_BW_ACCOUNT", "bob")
+    logs = []
+    assert au.find_unseal_key("s", "missing item", logger=logs.append) is None
+    args = sorted(c["args"] for c in fake_bw())
+    assert [a[:2] for a in args] == [["get", "item"], ["list", "items"]]
+    assert "--search" in args[1]                             # 전체 목록 재검색 없음
+    assert "'missing item'" in logs[-1] and logs[-1].startswith("[WARN]")
+    # 검색은 부분 일치 → 이름이 정확히 같은 항목만 사용
+    assert au.find_unseal_key("s", "unseal") is None
+
+
+def test_extract_unseal_key_does_not_print_key(fake_bw, monkeypatch, capsys):
+    monkeypatch.setenv("FAKE_BW_ACCOUNT", "carol")
+    assert au.extract_unseal_key("s", bw_item="nope") is None
+    assert au.extract_unseal_key("s", bw_item="vault unseal key") == "key-carol"
+    out = capsys.readouterr().out
+    assert "key-carol" not in out and "key-ca" not in out
+
+
+def test_process_group_cancel_terminates_running_bw(fake_bw):
+    group = au.BwProcessGroup()
+    errors = []
+
+    def run():
+        try:
+            au.fetch_account_key("slow@x", "pw", group)
+        except Exception as e:
+            errors.append(e)
+
+    t = threading.Thread(target=run)
+    t0 = time.perf_counter()
+    t.start()
+    while not any(c["args"][0] in ("get", "list") for c in fake_bw()):
+        time.sleep(0.01)
+    group.cancel()
+    t.join(5)
+    assert time.perf_counter() - t0 < 5
+    assert isinstance(errors[0], au.BwCancelled)
+    with pytest.raises(au.BwCancelled):
+        group.run(["bw", "logout"], {})
+
+
+def test_concurrent_unseal_cancels_after_threshold():
+    progress = {"n": 0}
+    submitted = []
+
+    def fetch(account, password, group):
+        delay = {"a": 0.0, "b": 0.05, "c": 0.1, "slow": 10}[account]
+        if group.cancelled.wait(delay):
+            raise au.BwCancelled("취소됨")
+        return None if account == "c" else f"key-{account}"
+
+    def submit(key, vault_addr):
+        submitted.append(key)
+        progress["n"] += 1
+        return {"sealed": progress["n"] < 2, "progress": progress["n"] % 2, "t": 2}
+
+    t0 = time.perf_counter()
+    result = au.concurrent_unseal([("slow", ""), ("a", ""), ("b", ""), ("c", "")], "https://vault",
+                                  logger=lambda m: None, fetch=fetch, submit=submit)
+    assert time.perf_counter() - t0 < 2
+    assert result["unsealed"] is True
+    assert submitted == ["key-a", "key-b"]
+    assert result["submitted"] == 2
+    assert 0 < result["time_to_unseal_s"] < 2
+    status = {r["account"]: r["status"] for r in result["accounts"]}
+    assert status["a"] == status["b"] == "OK"
+    assert status["slow"] == "CANCELLED"
+    assert "time-to-unseal" in au.format_unseal_report(result)
+
+
+def test_concurrent_unseal_reports_failures_and_duplicates():
+    def fetch(account, password, group):
+        if account == "bad":
+            raise RuntimeError("login failed")
+        return "same-key"
+
+    result = au.concurrent_unseal([("x", ""), ("y", ""), ("bad", "")], logger=lambda m: None,
+                                  fetch=fetch, submit=lambda k, a: {"sealed": True, "progress": 1, "t": 3})
+    assert result["unsealed"] is False
+    assert result["submitted"] == 1
+    status = sorted(r["status"] for r in result["accounts"])
+    assert status == ["FAIL", "OK", "SKIP"]
+    assert "login failed" in au.format_unseal_report(result)
+
+
+class FakeVault(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, threshold=3, progress=0, sealed=True):
+        self.threshold = threshold
+        self.progress = progress
+        self.sealed = sealed
+        self.initialized = True
+        self.keys = []
+        self.connections = 0
+        self.polls = 0
+        super().__init__(("127.0.0.1", 0), VaultHandler)
+
+    @property
+    def addr(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def status(self):
+        return {"sealed": self.sealed, "t": self.threshold, "n": 5, "progress": self.progress,
+                "initialized": self.initialized}
+
+
+class VaultHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/v1/sys/seal-status":
+            self.server.polls += 1
+            return self.reply(200, self.server.status())
+        self.reply(404, {"errors": []})
+
+    def do_PUT(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if not body.get("key", "").startswith("key-"):
+            return self.reply(400, {"errors": ["invalid key"]})
+        srv = self.server
+        srv.keys.append(body["key"])
+        srv.progress += 1
+        if srv.progress >= srv.threshold:
+            srv.sealed, srv.progress = False, 0
+        self.reply(200, srv.status())
+
+
+@pytest.fixture
+def fake_vault():
+    server = FakeVault()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_vault_session_reuses_connection(fake_vault):
+    from security_infra.vault_client import VaultError, VaultSession, shares_needed
+    with VaultSession(fake_vault.addr) as vault:
+        for _ in range(5):
+            assert shares_needed(vault.seal_status()) == 3
+        with pytest.raises(VaultError) as exc:
+            vault.unseal("bogus")
+        assert exc.value.status == 400
+    assert fake_vault.connections == 1
+
+
+def test_daemon_fetches_only_missing_shares(fake_vault):
+    fake_vault.progress = 1
+    fetched = []
+    stop = threading.Event()
+
+    def fetch(account, password, group):
+        fetched.append(account)
+        return f"key-{account}"
+
+    def logger(message):
+        if "언실 완료" in message:
+            stop.set()
+
+    accounts = [("a", ""), ("b", ""), ("c", ""), ("d", "")]
+    thread = threading.Thread(target=au.unseal_daemon, kwargs=dict(
+        vault_addr=fake_vault.addr, logger=logger, interval=0.01, max_interval=0.05,
+        stop=stop, fetch=fetch, load_accounts=lambda path: accounts))
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert fake_vault.sealed is False
+    assert len(fetched) == 2
+    assert len(fake_vault.keys) == 2
+    assert fake_vault.connections == 1
+
+
+def test_daemon_backs_off_while_unsealed(fake_vault):
+    fake_vault.sealed = False
+    stop = threading.Event()
+
+    def fetch(account, password, group):
+        raise AssertionError("언실 상태에서는 Bitwarden 조회 없음")
+
+    thread = threading.Thread(target=au.unseal_daemon, kwargs=dict(
+        vault_addr=fake_vault.addr, logger=lambda m: None, interval=0.01, max_interval=0.08,
+        stop=stop, fetch=fetch, load_accounts=lambda path: [("a", "")]))
+    thread.start()
+    time.sleep(0.5)
+    stop.set()
+    thread.join(5)
+    # 고정 간격(0.01s)이면 ~50회, 백오프로 간격이 0.08s까지 늘어남
+    assert 3 <= fake_vault.polls < 15
+
+
+def run_daemon_for(fake_vault, fetch, seconds=0.5, **kwargs):
+    stop = threading.Event()
+    thread = threading.Thread(target=au.unseal_daemon, kwargs=dict(
+        vault_addr=fake_vault.addr, logger=lambda m: None, interval=0.01, max_interval=0.08,
+        stop=stop, fetch=fetch, load_accounts=lambda path: [("a", "")], **kwargs))
+    thread.start()
+    time.sleep(seconds)
+    stop.set()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_daemon_backs_off_after_failed_unseal(fake_vault):
+    fetched = []
+
+    def fetch(account, password, group):
+        fetched.append(account)
+        raise RuntimeError("login failed")
+
+    run_daemon_for(fake_vault, fetch, retry_max_interval=0.16)
+    # 고정 간격(0.01s)이면 ~50회 로그인, 실패마다 간격 2배(최대 0.16s)
+    assert 2 <= len(fetched) < 10
+    assert fake_vault.sealed is True
+
+
+def test_daemon_skips_uninitialized_vault(fake_vault):
+    fake_vault.initialized = False
+
+    def fetch(account, password, group):
+        raise AssertionError("미초기화 상태에서는 Bitwarden 조회 없음")
+
+    run_daemon_for(fake_vault, fetch, seconds=0.3)
+    assert fake_vault.keys == []
+    assert fake_vault.polls >= 2
+
+
+def test_auto_unseal_skips_bitwarden_when_unsealed(fake_vault, tmp_path, monkeypatch):
+    fake_vault.sealed = False
+    monkeypatch.setattr(au, "get_bw_accounts_and_passwords",
+                        lambda path: pytest.fail("언실 상태에서는 계정 파일을 읽지 않음"))
+    assert au.auto_unseal(vault_addr=fake_vault.addr, usb_path=str(tmp_path), logger=lambda m: None) is True
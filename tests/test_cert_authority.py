@@ -0,0 +1,87 @@
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography import x509
+
+from security_infra import cert_authority
+from security_infra import cert_manifest
+from security_infra import generate_certificates as gc
+
+
+@pytest.fixture
+def cert_paths(tmp_path, monkeypatch):
+    paths = {name: tmp_path / name / "certs" for name in ("vault", "elk", "keycloak", "bitwarden")}
+    monkeypatch.setattr(gc, "SERVICE_CERT_PATHS", paths)
+    monkeypatch.setattr(cert_manifest, "MANIFEST_PATH", tmp_path / "certs.json")
+    return paths
+
+
+def load_chain(path):
+    return x509.load_pem_x509_certificates(path.read_bytes())
+
+
+def test_ca_mode_issues_all_services_and_hosts(tmp_path, cert_paths):
+    ca_dir = tmp_path / "ca"
+    hosts = [f"node{i}.internal" for i in range(150)] + ["10.0.0.7"]
+    summary = gc.generate_certificates(None, days=30, logger=lambda _: None, ca=True, ca_dir=ca_dir, hosts=hosts)
+
+    root = x509.load_pem_x509_certificate((ca_dir / cert_authority.ROOT_CERT).read_bytes())
+    for service, cert_dir in cert_paths.items():
+        leaf, intermediate = load_chain(cert_dir / f"{service}.crt")
+        leaf.verify_directly_issued_by(intermediate)
+        intermediate.verify_directly_issued_by(root)
+        assert f"[OK] {service}" in summary
+    leaf, _ = load_chain(ca_dir / "hosts" / "10.0.0.7.crt")
+    sans = leaf.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+    assert [str(ip) for ip in sans.get_values_for_type(x509.IPAddress)] == ["10.0.0.7"]
+    assert len(list((ca_dir / "hosts").glob("*.crt"))) == len(hosts)
+
+
+def test_ca_loaded_once_and_reused(tmp_path, cert_paths, monkeypatch):
+    ca_dir = tmp_path / "ca"
+    gc.generate_certificates(["vault"], days=365, logger=lambda _: None, ca=True, ca_dir=ca_dir)
+    root_before = (ca_dir / cert_authority.ROOT_CERT).read_bytes()
+
+    loads = []
+    original = cert_authority.LocalCA.load.__func__
+    monkeypatch.setattr(cert_authority.LocalCA, "load", classmethod(lambda cls, d: loads.append(d) or original(cls, d)))
+    summary = gc.generate_certificates(["vault", "elk"], days=365, logger=lambda _: None, ca=True, ca_dir=ca_dir)
+
+    assert loads == [ca_dir]
+    assert (ca_dir / cert_authority.ROOT_CERT).read_bytes() == root_before
+    assert "[SKIP] vault" in summary
+    assert "[OK] elk" in summary
+
+
+def test_hosts_require_ca_mode(cert_paths):
+    with pytest.raises(ValueError):
+        gc.generate_certificates(["vault"], hosts=["node1"], logger=lambda _: None)
+
+
+def test_missing_intermediate_resigned_with_existing_root(tmp_path):
+    ca_dir = tmp_path / "ca"
+    cert_authority.ensure_local_ca(ca_dir, logger=lambda _: None)
+    root_cert = (ca_dir / cert_authority.ROOT_CERT).read_bytes()
+    root_key = (ca_dir / cert_authority.ROOT_KEY).read_bytes()
+    (ca_dir / cert_authority.INTERMEDIATE_KEY).unlink()
+
+    logs = []
+    ca = cert_authority.ensure_local_ca(ca_dir, logger=logs.append)
+    assert (ca_dir / cert_authority.ROOT_CERT).read_bytes() == root_cert
+    assert (ca_dir / cert_authority.ROOT_KEY).read_bytes() == root_key
+    ca.cert.verify_directly_issued_by(x509.load_pem_x509_certificate(root_cert))
+    assert "Intermediate CA 재발급" in logs[0]
+
+
+def test_root_never_overwritten_without_key(tmp_path):
+    ca_dir = tmp_path / "ca"
+    cert_authority.ensure_local_ca(ca_dir, logger=lambda _: None)
+    root_cert = (ca_dir / cert_authority.ROOT_CERT).read_bytes()
+    (ca_dir / cert_authority.ROOT_KEY).unlink()
+    (ca_dir / cert_authority.INTERMEDIATE_CERT).unlink()
+
+    with pytest.raises(ValueError, match="덮어쓰지 않습니다"):
+        cert_authority.ensure_local_ca(ca_dir, logger=lambda _: None)
+    assert (ca_dir / cert_authority.ROOT_CERT).read_bytes() == root_cert
+    assert not (ca_dir / cert_authority.ROOT_KEY).exists()
@@ -0,0 +1,44 @@
+import ipaddress
+import stat
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+from cryptography.x509.oid import NameOID
+
+from security_infra import cert_engine
+from security_infra.generate_certificates import make_san
+
+
+@pytest.mark.parametrize("key_type", cert_engine.KEY_TYPES)
+def test_native_cert_matches_make_san_layout(tmp_path, key_type):
+    san = make_san("vault", ["DNS:vault.internal", "IP:10.0.0.5"])
+    assert cert_engine.native_generate_cert(tmp_path, "vault", san, 30, service="vault", logger=lambda _: None, key_type=key_type)
+
+    cert = x509.load_pem_x509_certificate((tmp_path / "vault.crt").read_bytes())
+    key = serialization.load_pem_private_key((tmp_path / "vault.key").read_bytes(), password=None)
+    assert cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)[0].value == "vault"
+    sans = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+    assert sans.get_values_for_type(x509.DNSName) == ["localhost", "vault", "vault.internal"]
+    assert sans.get_values_for_type(x509.IPAddress) == [
+        ipaddress.ip_address("127.0.0.1"), ipaddress.ip_address("10.0.0.5"),
+    ]
+    assert cert.public_key() == key.public_key()
+    assert stat.S_IMODE((tmp_path / "vault.key").stat().st_mode) == 0o600
+
+
+def test_native_skips_existing(tmp_path):
+    logs = []
+    san = make_san("elk")
+    assert cert_engine.native_generate_cert(tmp_path, "elk", san, 1, key_type="ec", logger=logs.append)
+    assert not cert_engine.native_generate_cert(tmp_path, "elk", san, 1, key_type="ec", logger=logs.append)
+    assert logs[-1].startswith("[SKIP]")
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_parse_san_rejects_unknown_type():
+    with pytest.raises(ValueError):
+        cert_engine.parse_san("DNS:localhost, URI:https://x")
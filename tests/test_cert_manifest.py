@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from security_infra import cert_manifest
+from security_infra import generate_certificates as gc
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    paths = {name: tmp_path / name / "certs" for name in ("vault", "elk")}
+    monkeypatch.setattr(gc, "SERVICE_CERT_PATHS", paths)
+    monkeypatch.setattr(cert_manifest, "MANIFEST_PATH", tmp_path / "certs.json")
+    return tmp_path
+
+
+def run(services, **kwargs):
+    kwargs.setdefault("backend", "native")
+    kwargs.setdefault("key_type", "ec")
+    kwargs.setdefault("days", 365)
+    return gc.generate_certificates(services, logger=lambda _: None, **kwargs)
+
+
+def test_manifest_records_entries(env):
+    run(["vault"], extra_san=["IP:10.0.0.5"])
+    entry = json.loads((env / "certs.json").read_text())["certs"]["vault"]
+    assert entry["san"] == ["DNS:localhost", "DNS:vault", "IP:10.0.0.5", "IP:127.0.0.1"]
+    assert entry["key_hash"] == entry["cert_key_hash"]
+    assert entry["issuer"] == "CN=vault"
+    assert len(entry["fingerprint_sha256"].split(":")) == 32
+
+
+def test_unchanged_certs_are_skipped(env, monkeypatch):
+    run(["vault", "elk"])
+    parsed = []
+    original = cert_manifest.inspect_cert
+    monkeypatch.setattr(cert_manifest, "inspect_cert", lambda c, k: parsed.append(c) or original(c, k))
+    summary = run(["vault", "elk"])
+    assert "[SKIP] vault" in summary and "[SKIP] elk" in summary
+    assert parsed == []
+
+
+def test_san_change_and_expiry_trigger_reissue(env):
+    run(["vault", "elk"])
+    fingerprint = json.loads((env / "certs.json").read_text())["certs"]["elk"]["fingerprint_sha256"]
+    summary = run(["vault", "elk"], extra_san=["DNS:vault.internal"])
+    assert "재발급: san-mismatch" in summary
+    summary = run(["vault", "elk"], extra_san=["DNS:vault.internal"], days=500, renew_before_days=400)
+    assert "재발급: expiring" in summary
+    assert json.loads((env / "certs.json").read_text())["certs"]["elk"]["fingerprint_sha256"] != fingerprint
+
+
+def test_key_mismatch_detected(env):
+    run(["vault", "elk"])
+    vault_dir, elk_dir = gc.SERVICE_CERT_PATHS["vault"], gc.SERVICE_CERT_PATHS["elk"]
+    (vault_dir / "vault.key").write_bytes((elk_dir / "elk.key").read_bytes())
+    assert [r["status"] for r in cert_manifest.cert_status()] == ["OK", "CHANGED"]
+    summary = run(["vault"])
+    assert "재발급: key-mismatch" in summary
+
+
+def test_cert_status_from_manifest(env):
+    run(["vault"], days=10)
+    rows = cert_manifest.cert_status()
+    assert [(r["name"], r["status"]) for r in rows] == [("vault", "EXPIRING")]
+    assert "[EXPIRING] vault" in cert_manifest.format_cert_status(rows)
+    (gc.SERVICE_CERT_PATHS["vault"] / "vault.crt").unlink()
+    assert cert_manifest.cert_status()[0]["status"] == "MISSING"
+
+
+def test_renew_window_clamped_to_validity(env):
+    logs = []
+    gc.generate_certificates(["vault"], days=10, backend="native", key_type="ec", logger=logs.append)
+    assert any("10일) 이상 → 5일로 조정" in line for line in logs)
+    summary = run(["vault"], days=10)
+    assert "[SKIP] vault" in summary and "재발급:" not in summary
+
+
+def test_without_cryptography_falls_back_to_exists_check(env, monkeypatch):
+    run(["vault"])
+    monkeypatch.setattr(cert_manifest, "manifest_supported", lambda: False)
+    monkeypatch.setattr(cert_manifest, "inspect_cert", lambda c, k: pytest.fail("PEM 파싱 호출"))
+    before = (env / "certs.json").read_text()
+    logs = []
+    summary = gc.generate_certificates(["vault"], days=365, backend="openssl", logger=logs.append)
+    assert "[SKIP] vault" in summary
+    assert any("cryptography 미설치" in line for line in logs)
+    assert (env / "certs.json").read_text() == before
+    with pytest.raises(ValueError, match="cryptography"):
+        run(["vault"])
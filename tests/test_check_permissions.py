@@ -0,0 +1,108 @@
+import io
+import json
+import os
+
+import yaml
+
+from security_infra import check_permissions as cp
+
+
+def make_tree(tmp_path, dirs=20, files=10):
+    root = tmp_path / "docker" / "elk" / "esdata"
+    for d in range(dirs):
+        sub = root / f"indices{d}" / "0"
+        sub.mkdir(parents=True)
+        for f in range(files):
+            path = sub / f"seg{f}"
+            path.write_text("x")
+            os.chmod(path, 0o660)
+        os.chmod(sub, 0o770)
+        os.chmod(sub.parent, 0o770)
+    os.chmod(root, 0o770)
+    os.chmod(root.parent, 0o770)
+    return root
+
+
+def write_config(tmp_path):
+    owner = f"{os.getuid()}:{os.getgid()}"
+    cfg = {"elk": {"owner": owner, "mode": "770", "recursive": True, "file_mode": "660"}}
+    path = tmp_path / "permissions.yml"
+    path.write_text(yaml.safe_dump(cfg))
+    return path
+
+
+def test_no_drift_on_matching_tree(tmp_path):
+    make_tree(tmp_path)
+    records = []
+    stats = cp.check_permissions(tmp_path, write_config(tmp_path), emit=records.append, workers=4, logger=lambda _: None)
+    assert records == []
+    assert stats == {"scanned": 1 + 1 + 20 * 2 + 20 * 10, "drift": 0, "errors": 0}
+
+
+def test_streams_drift_records_as_jsonl(tmp_path):
+    root = make_tree(tmp_path, dirs=3, files=2)
+    drifted = root / "indices1" / "0" / "seg1"
+    os.chmod(drifted, 0o644)
+    before = {p: os.lstat(p).st_mode for p in (drifted, root)}
+
+    out = io.StringIO()
+    stats = cp.check_permissions(
+        tmp_path, write_config(tmp_path), emit=cp.jsonl_emitter(out), workers=3, logger=lambda _: None,
+    )
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert stats["drift"] == 1
+    assert lines == [{
+        "name": "elk",
+        "path": str(drifted),
+        "type": "file",
+        "drift": ["mode"],
+        "expected": {"owner": f"{os.getuid()}:{os.getgid()}", "mode": "0660"},
+        "actual": {"owner": f"{os.getuid()}:{os.getgid()}", "mode": "0644"},
+    }]
+    assert {p: os.lstat(p).st_mode for p in before} == before
+
+
+def test_emit_failure_does_not_hang(tmp_path):
+    root = make_tree(tmp_path, dirs=5, files=3)
+    for path in root.rglob("seg*"):
+        os.chmod(path, 0o600)
+
+    def broken(_):
+        raise BrokenPipeError()
+
+    try:
+        cp.check_permissions(tmp_path, write_config(tmp_path), emit=broken, workers=2, logger=lambda _: None)
+    except BrokenPipeError:
+        pass
+    else:
+        raise AssertionError("BrokenPipeError가 전파되어야 함")
+
+
+def test_shipped_config_reports_nested_drift(tmp_path):
+    root = make_tree(tmp_path, dirs=2, files=2)
+    nested = root / "indices1" / "0" / "seg1"
+    shipped = os.path.join(os.path.dirname(__file__), "..", "config", "permissions.yml")
+    records = []
+    cp.check_permissions(tmp_path, shipped, services=["elk"], emit=records.append, workers=2, logger=lambda _: None)
+    paths = {r["path"] for r in records}
+    assert str(nested) in paths                              # elk-esdata 재귀 점검
+    assert {r["name"] for r in records if r["path"] == str(nested)} == {"elk-esdata"}
+
+
+def test_audit_recursion_is_independent_of_apply(tmp_path):
+    root = make_tree(tmp_path, dirs=2, files=2)
+    os.chmod(root / "indices0" / "0" / "seg0", 0o644)
+    owner = f"{os.getuid()}:{os.getgid()}"
+    path = tmp_path / "permissions.yml"
+
+    def drift_paths(cfg, **kwargs):
+        path.write_text(yaml.safe_dump(cfg))
+        records = []
+        cp.check_permissions(tmp_path, path, emit=records.append, workers=2, logger=lambda _: None, **kwargs)
+        return [r["path"] for r in records]
+
+    top_only = {"elk-esdata": {"owner": owner, "mode": "770", "file_mode": "660"}}
+    assert drift_paths(top_only) == []
+    assert drift_paths(top_only, recursive=True) == [str(root / "indices0" / "0" / "seg0")]
+    audit = {"elk-esdata": {**top_only["elk-esdata"], "audit_recursive": True}}
+    assert drift_paths(audit) == [str(root / "indices0" / "0" / "seg0")]
@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from benchmarks import bench_cli_startup as bench
+
+SUBCOMMANDS = bench.list_subcommands()
+
+# 느슨한 상한 (현재 약 360개 / 200ms): requests 하나만 끌려와도 모듈 수가 100개 이상 늘어남,
+# 시간은 부하가 걸린 CI에서도 흔들리지 않도록 벤치마크 예산(400ms)의 2.5배
+MAX_DISPATCH_MODULES = 400
+MAX_DISPATCH_MS = 1000
+
+
+@pytest.mark.parametrize("subcommand", SUBCOMMANDS)
+def test_dispatch_does_not_import_heavy_modules(subcommand, tmp_path):
+    row = bench.measure_dispatch(subcommand, tmp_path / "install.log")
+    assert row["returncode"] == 0
+    assert row["forbidden"] == [], f"{subcommand}: {row['forbidden']}"
+    assert row["module_count"] <= MAX_DISPATCH_MODULES, f"{subcommand}: {row['module_count']}개 모듈 import"
+    assert row["total_ms"] <= MAX_DISPATCH_MS, f"{subcommand}: import {row['total_ms']}ms"
+
+
+def test_every_subcommand_has_lazy_module():
+    assert set(SUBCOMMANDS) <= set(bench.COMMAND_MODULES)
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json\n"
+        "import time:        30 |        150 | yaml\n"
+    )
+    modules, total = bench.parse_importtime(stderr)
+    assert modules == {"json": 120, "yaml": 30}
+    assert total == 150
+
+
+def test_auto_unseal_import_has_no_side_effects(monkeypatch):
+    import importlib
+    import dotenv
+    calls = []
+    monkeypatch.setattr(dotenv, "load_dotenv", lambda *a, **k: calls.append(a))
+    import security_infra.auto_unseal as mod
+    importlib.reload(mod)
+    assert calls == []
+    mod.load_runtime_env()
+    assert len(calls) == 1
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from security_infra import compose_orchestrator as co
+
+
+class FakeDocker:
+    """start 후 delay초가 지나면 healthy(또는 outcome)가 되는 컨테이너"""
+
+    def __init__(self, specs):
+        self.specs = specs          # service → (delay, health_after)
+        self.ids = {f"{i + 1:012x}": name for i, name in enumerate(specs)}
+        self.started = {}
+        self.lock = threading.Lock()
+
+    def containers(self, labels):
+        service = dict(l.split("=", 1) for l in labels)["com.docker.compose.service"]
+        with self.lock:
+            started = self.started.get(service)
+        if started is None:
+            state, status = "created", "Created"
+        else:
+            delay, outcome = self.specs[service]
+            if time.perf_counter() - started < delay:
+                state, status = "running", "Up 1 second (health: starting)"
+            elif outcome == "none":
+                state, status = "running", "Up 1 second"
+            elif outcome == "exited":
+                state, status = "exited", "Exited (1) 1 second ago"
+            else:
+                state, status = "running", f"Up 1 second ({outcome})"
+        container_id = next(k for k, v in self.ids.items() if v == service)
+        return [{"Id": container_id, "Names": [f"/{service}"], "State": state, "Status": status,
+                 "Labels": {"com.docker.compose.service": service}}]
+
+    def start(self, container_id):
+        with self.lock:
+            self.started[self.ids[container_id]] = time.perf_counter()
+
+
+GRAPH = {
+    "elasticsearch": {},
+    "kibana": {"elasticsearch": "service_healthy"},
+    "logstash": {"elasticsearch": "service_healthy"},
+    "vault": {},
+    "keycloak": {},
+}
+
+
+def run(specs, graph=GRAPH, timeout=5.0):
+    fake = FakeDocker(specs)
+    orchestrator = co.StackOrchestrator(fake, "security-infra", graph, timeout=timeout,
+                                        poll_initial=0.01, poll_max=0.05, logger=lambda _: None)
+    rows = asyncio.run(orchestrator.run(co.resolve_services(graph, [])))
+    return {r["service"]: r for r in rows}, fake
+
+
+def test_independent_groups_start_concurrently_and_dependents_wait():
+    rows, fake = run({
+        "elasticsearch": (0.3, "healthy"), "kibana": (0.05, "healthy"), "logstash": (0.05, "none"),
+        "vault": (0.1, "none"), "keycloak": (0.1, "healthy"),
+    })
+    assert all(r["status"] == "OK" for r in rows.values())
+    for name in ("elasticsearch", "vault", "keycloak"):
+        assert rows[name]["start_s"] < 0.1
+    for name in ("kibana", "logstash"):
+        assert rows[name]["start_s"] >= rows["elasticsearch"]["ready_s"]
+    assert rows["vault"]["ready_s"] < rows["elasticsearch"]["ready_s"]
+    # 전체 시간 ≈ 가장 긴 의존 경로 (순차 합계보다 짧음)
+    assert max(r["ready_s"] for r in rows.values()) < 0.3 + 0.05 + 0.3
+
+
+def test_failed_dependency_skips_dependents():
+    rows, fake = run({
+        "elasticsearch": (0.05, "unhealthy"), "kibana": (0.0, "healthy"), "logstash": (0.0, "healthy"),
+        "vault": (0.0, "none"), "keycloak": (0.0, "exited"),
+    })
+    assert rows["elasticsearch"]["status"] == "FAIL"
+    assert rows["keycloak"]["status"] == "FAIL"
+    assert rows["kibana"]["status"] == rows["logstash"]["status"] == "SKIP"
+    assert "kibana" not in fake.started and "logstash" not in fake.started
+    assert rows["vault"]["status"] == "OK"
+
+
+def test_timeout_is_reported():
+    rows, _ = run({"vault": (10, "healthy")}, graph={"vault": {}}, timeout=0.1)
+    assert rows["vault"]["status"] == "FAIL" and "준비되지 않음" in rows["vault"]["error"]
+
+
+def test_load_dependencies_and_resolve(tmp_path):
+    compose = tmp_path / "docker-compose.yml"
+    compose.write_text(
+        "services:\n"
+        "  es: {image: es}\n"
+        "  ls:\n    depends_on:\n      es:\n        condition: service_healthy\n"
+        "  web:\n    depends_on: [ls]\n"
+    )
+    graph = co.load_dependencies(compose)
+    assert graph == {"es": {}, "ls": {"es": "service_healthy"}, "web": {"ls": "service_started"}}
+    assert co.resolve_services(graph, ["web"]) == ["es", "ls", "web"]
+    with pytest.raises(ValueError):
+        co.resolve_services({"a": {"b": "x"}, "b": {"a": "x"}}, [])
+
+
+def test_format_timeline():
+    rows, _ = run({"elasticsearch": (0.05, "healthy"), "kibana": (0.0, "healthy"), "logstash": (0.0, "none"),
+                   "vault": (0.0, "none"), "keycloak": (0.0, "healthy")})
+    text = co.format_timeline(list(rows.values()))
+    assert text.startswith("서비스 기동 타임라인")
+    assert "logstash" in text and "대기: elasticsearch" in text
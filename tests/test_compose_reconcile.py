@@ -0,0 +1,145 @@
+import json
+
+import pytest
+
+from security_infra import compose_reconcile as cr
+
+COMPOSE = """
+services:
+  logstash:
+    image: logstash:8
+    environment:
+      LS_JAVA_OPTS: "-Xms${LS_MEM} -Xmx${LS_MEM}"
+    volumes:
+      - ./docker/elk/logstash/pipeline:/usr/share/logstash/pipeline
+      - /var/log:/var/log:ro
+  vault:
+    image: vault:latest
+    mem_limit: ${VT_MEM_LIMIT:-640m}
+    volumes:
+      - ./docker/vault/config:/vault/config
+      - ./docker/vault/certs:/vault/certs
+  kibana:
+    image: kibana:8
+"""
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / "docker").mkdir()
+    (tmp_path / "docker-compose.yml").write_text(COMPOSE)
+    (tmp_path / ".env").write_text("LS_MEM=512m\nVT_MEM_LIMIT=640m\n")
+    monkeypatch.delenv("LS_MEM", raising=False)
+    monkeypatch.delenv("VT_MEM_LIMIT", raising=False)
+    monkeypatch.setenv("COMPOSE_PROJECT_NAME", "security-infra")
+    write_templates(tmp_path, logstash="a", vault="b")
+    write_certs(tmp_path, "AA")
+    return tmp_path
+
+
+def write_templates(root, logstash, vault):
+    state = {
+        "docker/elk/logstash/pipeline/logstash.conf": {"sha256": logstash},
+        "docker/vault/config/vault.hcl": {"sha256": vault},
+    }
+    (root / cr.TEMPLATE_STATE_FILE).write_text(json.dumps(state))
+
+
+def write_certs(root, fingerprint):
+    manifest = {"version": 1, "certs": {"vault": {
+        "cert_path": str(root / "docker/vault/certs/vault.crt"),
+        "fingerprint_sha256": fingerprint, "key_hash": "k",
+    }}}
+    (root / cr.CERT_MANIFEST_FILE).write_text(json.dumps(manifest))
+
+
+class FakeClient:
+    def __init__(self):
+        self.restarted = []
+
+    def containers(self, labels):
+        service = dict(l.split("=", 1) for l in labels)["com.docker.compose.service"]
+        return [{"Id": f"{service}-id"}]
+
+    def restart(self, container_id):
+        self.restarted.append(container_id)
+
+
+def run(root, client=None, dry_run=False):
+    commands = []
+    rows = cr.reconcile(root / "docker-compose.yml", None, ["docker"], client=client or FakeClient(),
+                        dry_run=dry_run, logger=lambda _: None,
+                        runner=lambda cmd, check: commands.append(cmd))
+    return {r["service"]: r for r in rows}, commands
+
+
+def test_first_run_records_baseline_without_restarts(project):
+    client = FakeClient()
+    rows, commands = run(project, client)
+    assert {r["action"] for r in rows.values()} == {"baseline"}
+    assert commands == [] and client.restarted == []
+    assert set(json.loads((project / cr.DEPLOY_STATE_FILE).read_text())) == {"logstash", "vault", "kibana"}
+
+    rows, commands = run(project, client)
+    assert {r["action"] for r in rows.values()} == {"none"}
+
+
+def test_config_change_restarts_only_that_service(project):
+    run(project)
+    write_templates(project, logstash="changed", vault="b")
+    client = FakeClient()
+    rows, commands = run(project, client)
+    assert rows["logstash"]["action"] == "restart" and rows["logstash"]["changed"] == ["config"]
+    assert rows["vault"]["action"] == rows["kibana"]["action"] == "none"
+    assert client.restarted == ["logstash-id"] and commands == []
+    assert run(project)[0]["logstash"]["action"] == "none"
+
+
+def test_cert_change_restarts_vault(project):
+    run(project)
+    write_certs(project, "BB")
+    rows, _ = run(project)
+    assert rows["vault"]["action"] == "restart" and rows["vault"]["changed"] == ["certs"]
+    assert rows["logstash"]["action"] == "none"
+
+
+def test_env_and_definition_changes_recreate(project):
+    run(project)
+    (project / ".env").write_text("LS_MEM=1g\nVT_MEM_LIMIT=640m\n")
+    (project / "docker-compose.yml").write_text(COMPOSE.replace("kibana:8", "kibana:8.13"))
+    rows, commands = run(project)
+    assert rows["logstash"]["changed"] == ["env"]
+    assert rows["kibana"]["changed"] == ["definition"]
+    assert rows["vault"]["action"] == "none"
+    assert commands == [["docker", "compose", "-f", str(project / "docker-compose.yml"),
+                         "up", "-d", "--no-deps", "--force-recreate", "logstash", "kibana"]]
+
+
+def test_dry_run_does_not_record(project):
+    run(project)
+    write_templates(project, logstash="x", vault="y")
+    before = (project / cr.DEPLOY_STATE_FILE).read_text()
+    rows, commands = run(project, dry_run=True)
+    assert rows["vault"]["action"] == "restart" and commands == []
+    assert (project / cr.DEPLOY_STATE_FILE).read_text() == before
+
+
+def test_failed_restart_keeps_old_hash(project):
+    run(project)
+    write_templates(project, logstash="new", vault="b")
+
+    class Broken(FakeClient):
+        def restart(self, container_id):
+            raise RuntimeError("boom")
+
+    rows, _ = run(project, Broken())
+    assert rows["logstash"]["status"] == "FAIL"
+    assert run(project)[0]["logstash"]["action"] == "restart"
+
+
+def test_mark_deployed_sets_baseline_for_started_services(project):
+    cr.mark_deployed(project / "docker-compose.yml", ["vault"])
+    write_certs(project, "CC")
+    rows, _ = run(project)
+    assert rows["vault"]["action"] == "restart"
+    assert rows["logstash"]["action"] == "baseline"
@@ -0,0 +1,216 @@
+import http.server
+import json
+import os
+import socketserver
+import threading
+
+import pytest
+
+from security_infra import debug_vault_token as dvt
+
+
+class FakeVault(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        self.tokens = {"t1": 3600}
+        self.lookups = 0
+        self.connections = 0
+        super().__init__(("127.0.0.1", 0), LookupHandler)
+
+    @property
+    def addr(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class LookupHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        srv = self.server
+        if self.path != "/v1/auth/token/lookup-self":
+            return self.reply(404, {"errors": []})
+        srv.lookups += 1
+        token = self.headers.get("X-Vault-Token")
+        if token not in srv.tokens:
+            return self.reply(403, {"errors": ["permission denied"]})
+        self.reply(200, {"data": {
+            "ttl": srv.tokens[token], "renewable": True, "display_name": "approle",
+            "policies": ["default", "pseudonymize"], "identity_policies": ["pseudonymize", "audit"],
+            "expire_time": "2026-10-17T12:00:00Z", "id": token}})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def vault(tmp_path):
+    server = FakeVault()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    token_file = tmp_path / "vault-token"
+    token_file.write_text("t1\n")
+    yield server, token_file
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, token_file, clock, **kwargs):
+    return dvt.TokenStatusClient(server.addr, str(token_file), cacert=False, clock=clock, **kwargs)
+
+
+def test_status_fields_and_cache(vault):
+    server, token_file = vault
+    clock = Clock()
+    with make_client(server, token_file, clock) as client:
+        first = client.status()
+        clock.now += 3
+        second = client.status()
+    assert first["ok"] and first["healthy"] and not first["cached"]
+    assert first["ttl"] == 3600 and first["renewable"] is True
+    assert first["policies"] == ["audit", "default", "pseudonymize"]
+    assert "id" not in first and "t1" not in json.dumps(first)
+    assert second["cached"] and second["ttl"] == 3597
+    assert server.lookups == 1
+
+
+def test_cache_expires_after_ttl(vault):
+    server, token_file = vault
+    clock = Clock()
+    with make_client(server, token_file, clock, cache_ttl=5) as client:
+        for _ in range(10):
+            client.status()
+        clock.now += 6
+        assert not client.status()["cached"]
+        assert client.stats() == {"lookups": 2, "hits": 9}
+    assert server.lookups == 2
+    assert server.connections == 1
+
+
+def test_token_file_change_invalidates_cache(vault):
+    server, token_file = vault
+    server.tokens["t2"] = 30
+    clock = Clock()
+    with make_client(server, token_file, clock) as client:
+        client.status()
+        token_file.write_text("t2-longer\n")
+        stat = os.stat(token_file)
+        os.utime(token_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        status = client.status()
+        assert not status["ok"] and status["status"] == 403 and not status["healthy"]
+        token_file.write_text("t2\n")
+        status = client.status()
+    assert status["ok"] and status["ttl"] == 30
+    assert not status["healthy"]                     # 남은 TTL < min_ttl(60)
+    assert server.lookups == 3
+
+
+def test_cache_never_outlives_token(vault):
+    server, token_file = vault
+    server.tokens["t1"] = 2
+    clock = Clock()
+    with make_client(server, token_file, clock, cache_ttl=10, min_ttl=0) as client:
+        client.status()
+        clock.now += 3
+        assert not client.status()["cached"]
+
+
+def test_missing_token_file_and_unreachable_vault(tmp_path):
+    clock = Clock()
+    with dvt.TokenStatusClient("http://127.0.0.1:1", str(tmp_path / "none"), cacert=False, clock=clock) as client:
+        status = client.status()
+        assert not status["ok"] and "토큰 파일" in status["error"]
+    token_file = tmp_path / "vault-token"
+    token_file.write_text("t1\n")
+    with dvt.TokenStatusClient("http://127.0.0.1:1", str(token_file), cacert=False, clock=clock) as client:
+        status = client.status()
+    assert not status["ok"] and "연결 실패" in status["error"]
+
+
+def test_token_status_reuses_client(vault, monkeypatch):
+    server, token_file = vault
+    monkeypatch.setattr(dvt, "_status_clients", {})
+    for _ in range(5):
+        assert dvt.token_status(server.addr, str(token_file), cacert=False)["ok"]
+    assert server.lookups == 1
+
+
+def test_token_status_applies_options_per_call(vault, monkeypatch):
+    server, token_file = vault
+    monkeypatch.setattr(dvt, "_status_clients", {})
+    ttl = dvt.token_status(server.addr, str(token_file), cacert=False)["ttl"]
+    assert dvt.token_status(server.addr, str(token_file), cacert=False, min_ttl=ttl + 100)["healthy"] is False
+    assert dvt.token_status(server.addr, str(token_file), cacert=False, min_ttl=1)["healthy"] is True
+    assert server.lookups == 1
+    dvt.token_status(server.addr, str(token_file), cacert=False, cache_ttl=0)
+    assert server.lookups == 2 and len(dvt._status_clients) == 2
+
+
+def test_state_file_shares_cache_between_processes(vault, tmp_path):
+    server, token_file = vault
+    state = tmp_path / "state" / "token-status.json"
+    with make_client(server, token_file, Clock(), state_file=state) as client:
+        assert not client.status()["cached"]
+    assert os.stat(state.parent).st_mode & 0o777 == 0o700 and os.stat(state).st_mode & 0o777 == 0o600
+    assert "t1" not in state.read_text()
+    with make_client(server, token_file, Clock(), state_file=state) as client:   # 새 프로세스 (새 클라이언트)
+        status = client.status()
+    assert status["cached"] and status["ok"] and 3590 < status["ttl"] <= 3600
+    assert server.lookups == 1
+
+    saved = json.loads(state.read_text())
+    saved["expires_at"] = saved["result"]["checked_at"] - 1                     # 만료된 상태 파일
+    state.write_text(json.dumps(saved))
+    with make_client(server, token_file, Clock(), state_file=state) as client:
+        assert not client.status()["cached"]
+    assert server.lookups == 2
+
+
+def test_state_file_ignores_symlink_and_other_targets(vault, tmp_path):
+    server, token_file = vault
+    state = tmp_path / "state" / "token-status.json"
+    with make_client(server, token_file, Clock(), state_file=state) as client:
+        client.status()
+    decoy = tmp_path / "decoy.json"
+    decoy.write_bytes(state.read_bytes())
+    state.unlink()
+    state.symlink_to(decoy)
+    with make_client(server, token_file, Clock(), state_file=state) as client:
+        assert not client.status()["cached"]
+    assert not state.is_symlink()                                               # 링크를 따라 쓰지 않고 교체
+    other = tmp_path / "other-token"
+    other.write_text("t1\n")
+    with make_client(server, other, Clock(), state_file=state) as client:       # 다른 토큰 파일의 결과는 재사용 안 함
+        assert not client.status()["cached"]
+    assert server.lookups == 3
+
+
+def test_no_subprocess_in_status_path(vault, monkeypatch):
+    server, token_file = vault
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError("subprocess 호출")
+
+    monkeypatch.setattr(dvt.subprocess, "run", forbidden)
+    with make_client(server, token_file, Clock()) as client:
+        assert client.status()["ok"]
@@ -0,0 +1,203 @@
+import json
+import os
+import stat
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from security_infra import compose_manager as cm
+from security_infra import docker_api
+
+
+def container(name, service, status, state="running", project="security-infra"):
+    return {
+        "Id": f"{name}0123456789abcdef",
+        "Names": [f"/{name}"],
+        "Image": f"{service}:latest",
+        "State": state,
+        "Status": status,
+        "Labels": {"com.docker.compose.project": project, "com.docker.compose.service": service},
+        "Ports": [{"IP": "0.0.0.0", "PrivatePort": 8200, "PublicPort": 8200, "Type": "tcp"}] if service == "vault" else [],
+    }
+
+
+CONTAINERS = [
+    container("vault", "vault", "Up 2 minutes (healthy)"),
+    container("elasticsearch", "elasticsearch", "Up 1 minute (health: starting)"),
+    container("logstash", "logstash", "Up 1 minute"),
+    container("kibana", "kibana", "Exited (1) 3 seconds ago", state="exited"),
+    container("other", "web", "Up 1 hour", project="other"),
+]
+
+
+class FakeDocker(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        self.connections = 0
+        self.requests = []
+        super().__init__(path, Handler)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, body, content_type="application/json"):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.server.requests.append(("GET", url.path))
+        if url.path.endswith("/_ping"):
+            return self.reply(200, b"OK", "text/plain")
+        if url.path.endswith("/containers/json"):
+            labels = json.loads(parse_qs(url.query).get("filters", ["{}"])[0]).get("label", [])
+            rows = [c for c in CONTAINERS
+                    if all(c["Labels"].get(k) == v for k, _, v in (l.partition("=") for l in labels))]
+            return self.reply(200, rows)
+        self.reply(404, {"message": "page not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        self.server.requests.append(("POST", url.path + "?" + url.query))
+        if "/containers/missing/" in url.path:
+            return self.reply(404, {"message": "No such container: missing"})
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def fake_docker(tmp_path, monkeypatch):
+    path = str(tmp_path / "docker.sock")
+    server = FakeDocker(path)
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    monkeypatch.setenv("DOCKER_HOST", f"unix://{path}")
+    monkeypatch.setenv("COMPOSE_PROJECT_NAME", "security-infra")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class AuditLogger:
+    def __init__(self):
+        self.records = []
+
+    def info(self, msg):
+        self.records.append(msg)
+
+    error = info
+
+
+def audit(event, **fields):
+    return json.dumps({"event": event, **fields})
+
+
+def test_one_pooled_connection_for_many_requests(fake_docker):
+    with docker_api.DockerClient() as client:
+        assert client.ping()
+        for _ in range(20):
+            client.containers()
+    assert fake_docker.connections == 1
+    assert len(fake_docker.requests) == 21
+
+
+def test_status_returns_structured_rows_without_subprocess(fake_docker, monkeypatch):
+    monkeypatch.setattr(cm.subprocess, "run", lambda *a, **k: pytest.fail("subprocess 호출 금지"))
+    started = time.perf_counter()
+    rows = cm.compose_command("status", "elk", "/srv/security-infra/docker-compose.yml", AuditLogger(), audit)
+    assert time.perf_counter() - started < 0.5
+    assert [(r["service"], r["state"], r["health"]) for r in rows] == [
+        ("elasticsearch", "running", "starting"),
+        ("kibana", "exited", "-"),
+        ("logstash", "running", "none"),
+    ]
+
+    rows = cm.compose_command("health", "all", "/srv/x/docker-compose.yml", AuditLogger(), audit)
+    assert {r["container"] for r in rows} == {"vault", "elasticsearch", "logstash", "kibana"}
+    vault = next(r for r in rows if r["service"] == "vault")
+    assert vault["health"] == "healthy" and vault["ports"] == ["0.0.0.0:8200->8200/tcp"]
+    assert vault["id"] == "vault0123456"
+
+
+def test_api_errors_are_raised(fake_docker):
+    with docker_api.DockerClient() as client:
+        with pytest.raises(docker_api.DockerAPIError, match="No such container"):
+            client.kill("missing")
+        client.kill("vault", "HUP")
+    assert ("POST", "/v1.41/containers/vault/kill?signal=HUP") in fake_docker.requests
+
+
+def test_reload_service_uses_api(fake_docker):
+    logs = []
+    assert cm.reload_service("vault", logger=logs.append) == ["vault"]
+    assert cm.reload_service("bitwarden", logger=logs.append) == []
+    assert ("POST", "/v1.41/containers/vault/kill?signal=HUP") in fake_docker.requests
+
+
+def test_sudoers_probe_is_cached(monkeypatch, tmp_path):
+    calls = []
+
+    class Result:
+        returncode = 0
+        stderr = b""
+
+    monkeypatch.setattr(cm, "_SUDOERS_CACHE", {})
+    state = tmp_path / "state" / "sudoers-ok"
+    monkeypatch.setattr(cm, "SUDOERS_STATE_FILE", state)
+    monkeypatch.setattr(cm.subprocess, "run", lambda cmd, **k: calls.append(cmd) or Result())
+    monkeypatch.setattr(cm.docker_api, "socket_accessible", lambda *a: False)
+    for _ in range(3):
+        assert cm.docker_cli_prefix(AuditLogger()) == ["sudo", "docker"]
+    assert calls == [["sudo", "-n", "docker", "ps"]]
+
+    # 다음 CLI 실행(프로세스 캐시 없음)도 TTL 안에서는 상태 파일로 재사용
+    cm._SUDOERS_CACHE.clear()
+    assert cm.docker_cli_prefix(AuditLogger()) == ["sudo", "docker"]
+    assert len(calls) == 1
+    cm._SUDOERS_CACHE.clear()
+    expired = time.time() - cm.SUDOERS_STATE_TTL - 1
+    os.utime(state, (expired, expired))
+    assert cm.docker_cli_prefix(AuditLogger()) == ["sudo", "docker"]
+    assert len(calls) == 2
+    assert stat.S_IMODE(os.lstat(state.parent).st_mode) == 0o700
+    assert stat.S_IMODE(os.lstat(state).st_mode) == 0o600
+
+
+def test_sudoers_state_rejects_symlink_and_shared_dir(monkeypatch, tmp_path):
+    state_dir = tmp_path / "state"
+    state_dir.mkdir(mode=0o700)
+    state = state_dir / "sudoers-ok"
+    monkeypatch.setattr(cm, "SUDOERS_STATE_FILE", state)
+    decoy = tmp_path / "recent-file"
+    decoy.write_text("x")                                    # 최근 수정된 본인 소유 파일
+    state.symlink_to(decoy)
+    assert cm._sudoers_recently_ok() is False
+    cm._mark_sudoers_ok()                                    # 링크를 따라가지 않고 새 파일로 교체
+    assert not state.is_symlink() and decoy.read_text() == "x"
+    assert cm._sudoers_recently_ok() is True
+    os.chmod(state_dir, 0o755)                               # 다른 사용자가 접근 가능한 디렉토리는 불신
+    assert cm._sudoers_recently_ok() is False
+
+
+def test_parse_health():
+    assert docker_api.parse_health("Up 3 seconds (unhealthy)", "running") == "unhealthy"
+    assert docker_api.parse_health("Up 3 seconds", "running") == "none"
+    assert docker_api.parse_health("Created", "created") == "-"
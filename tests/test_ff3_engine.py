@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from security_infra import ff3_engine
+from security_infra.ff3_engine import DIGITS, FF3Cipher
+
+KEY128 = "EF4359D8D580AA4F7F036D6F04FC6A94"
+KEY192 = KEY128 + "2B7E151628AED2A6"
+KEY256 = KEY192 + "ABF7158809CF4F3C"
+
+# NIST SP 800-38G 샘플 (FF3, 64비트 tweak) + ACVP FF3-1 (56비트 tweak)
+VECTORS = [
+    (KEY128, "D8E7920AFA330A73", 10, "890121234567890000", "750918814058654607"),
+    (KEY128, "9A768A92F60E12D8", 10, "890121234567890000", "018989839189395384"),
+    (KEY128, "D8E7920AFA330A73", 10, "89012123456789000000789000000", "48598367162252569629397416226"),
+    (KEY128, "0000000000000000", 10, "89012123456789000000789000000", "34695224821734535122613701434"),
+    (KEY128, "9A768A92F60E12D8", 26, "0123456789abcdefghi", "g2pk40i992fn20cjakb"),
+    (KEY192, "D8E7920AFA330A73", 10, "890121234567890000", "646965393875028755"),
+    (KEY192, "9A768A92F60E12D8", 10, "890121234567890000", "961610514491424446"),
+    (KEY256, "D8E7920AFA330A73", 10, "890121234567890000", "922011205562777495"),
+    (KEY256, "9A768A92F60E12D8", 10, "890121234567890000", "504149865578056140"),
+    ("2DE79D232DF5585D68CE47882AE256D6", "CBD09280979564", 10, "3992520240", "8901801106"),
+]
+
+
+@pytest.mark.parametrize("key,tweak,radix,plaintext,ciphertext", VECTORS)
+def test_nist_vectors(key, tweak, radix, plaintext, ciphertext):
+    cipher = FF3Cipher(key, tweak, alphabet=DIGITS[:radix], legacy_ff3=len(tweak) == 16)
+    assert cipher.encrypt(plaintext) == ciphertext
+    assert cipher.decrypt(ciphertext) == plaintext
+
+
+def test_batch_matches_single_and_round_trips():
+    rng = random.Random(7)
+    values = ["".join(rng.choice("0123456789") for _ in range(rng.randint(6, 20))) for _ in range(1000)]
+    cipher = FF3Cipher(KEY128, "CBD09280979564", chunk_size=97)
+    encrypted = cipher.encrypt_batch(values)
+    assert encrypted == [FF3Cipher(KEY128, "CBD09280979564").encrypt(v) for v in values[:50]] + encrypted[50:]
+    assert [len(e) for e in encrypted] == [len(v) for v in values]
+    assert cipher.decrypt_batch(encrypted) == values
+
+
+def test_patient_numbers_keep_format():
+    cipher = FF3Cipher(KEY256, "CBD09280979564")
+    values = [f"{n:08d}" for n in range(0, 10_000_000, 99_991)]
+    encrypted = cipher.encrypt_batch(values)
+    assert all(len(e) == 8 and e.isdigit() for e in encrypted)
+    assert len(set(encrypted)) == len(values)
+    assert cipher.decrypt_batch(encrypted) == values
+
+
+def test_custom_alphabet_round_trip():
+    cipher = FF3Cipher(KEY128, "CBD09280979564", alphabet="ABCDEFGHJKLMNPQRSTUVWXYZ")
+    values = ["HELLWARLD", "ABCDEFGH", "ZZZZZZZZZZZZ"]
+    encrypted = cipher.encrypt_batch(values)
+    assert all(set(e) <= set(cipher.alphabet) for e in encrypted)
+    assert cipher.decrypt_batch(encrypted) == values
+
+
+def test_custom_radix10_alphabet_round_trip():
+    # 10자 alphabet이라도 0-9가 아니면 숫자 빠른 경로를 쓰지 않음
+    cipher = FF3Cipher(KEY128, "CBD09280979564", alphabet="ABCDEFGHIJ")
+    digits = FF3Cipher(KEY128, "CBD09280979564")
+    values = ["ABCDEFGHIJ", "JJJJJJ", "AAAAAAAA"]
+    encrypted = cipher.encrypt_batch(values)
+    assert all(set(e) <= set("ABCDEFGHIJ") for e in encrypted)
+    assert cipher.decrypt_batch(encrypted) == values
+    # 숫자 alphabet 결과와 문자만 다르고 같은 값
+    table = str.maketrans("0123456789", "ABCDEFGHIJ")
+    assert encrypted[0] == digits.encrypt("0123456789").translate(table)
+
+
+@pytest.mark.parametrize("value", ["12345", "12a45678", "1" * 57])
+def test_rejects_out_of_domain(value):
+    with pytest.raises(ValueError):
+        FF3Cipher(KEY128, "CBD09280979564").encrypt(value)
+
+
+def test_rejects_bad_key_and_tweak():
+    with pytest.raises(ValueError):
+        FF3Cipher("00" * 10, "CBD09280979564")
+    with pytest.raises(ValueError):
+        FF3Cipher(KEY128, "CBD092809795")
+    with pytest.raises(ValueError):
+        FF3Cipher("not-hex", "CBD09280979564")
+    with pytest.raises(ValueError, match="폐기된 FF3"):
+        FF3Cipher(KEY128, "D8E7920AFA330A73")                     # 64비트 tweak은 legacy_ff3 없이는 거부
+
+
+def test_cipher_from_vault_uses_key_client():
+    class Client:
+        def get_keys(self):
+            return KEY128, "CBD09280979564"
+
+    cipher = ff3_engine.cipher_from_vault(Client())
+    assert cipher.decrypt(cipher.encrypt("12345678")) == "12345678"
@@ -0,0 +1,35 @@
+import shutil
+
+import pytest
+
+from security_infra import cert_manifest
+from security_infra import generate_certificates as gc
+
+pytestmark = pytest.mark.skipif(shutil.which("openssl") is None, reason="openssl 미설치")
+
+
+@pytest.fixture
+def cert_paths(tmp_path, monkeypatch):
+    paths = {name: tmp_path / name / "certs" for name in ("vault", "elk", "keycloak")}
+    monkeypatch.setattr(gc, "SERVICE_CERT_PATHS", paths)
+    monkeypatch.setattr(cert_manifest, "MANIFEST_PATH", tmp_path / "certs.json")
+    return paths
+
+
+def test_parallel_results_keep_service_order(cert_paths):
+    logs = []
+    summary = gc.generate_certificates(["keycloak", "vault", "elk"], days=1, logger=logs.append, jobs=3)
+    lines = summary.splitlines()
+    assert [line.split()[1] for line in lines[:3]] == ["keycloak", "vault", "elk"]
+    assert all(line.startswith("[OK]") for line in lines[:3])
+    for path in cert_paths.values():
+        assert (path / f"{path.parent.name}.crt").exists()
+    ok_logs = [line for line in logs if line.startswith("[OK]")]
+    assert ["keycloak" in ok_logs[0], "vault" in ok_logs[1], "elk" in ok_logs[2]] == [True] * 3
+
+
+def test_skip_and_warn_statuses(cert_paths):
+    gc.generate_certificates(["vault"], days=365, logger=lambda _: None)
+    summary = gc.generate_certificates(["vault", "nope"], days=365, logger=lambda _: None, jobs=2)
+    assert "[WARN] 지원하지 않는 서비스: nope" in summary
+    assert "[SKIP] vault" in summary
@@ -0,0 +1,148 @@
+import io
+import json
+import socketserver
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from security_infra import docker_api
+from security_infra import log_stream as ls
+
+LOGS = {
+    "es": [
+        (1, "2025-07-01T00:00:01.5Z", '{"level":"INFO","message":"started"}'),
+        (1, "2025-07-01T00:00:03.000000001Z", "[WARN ][o.e.c.r] disk watermark exceeded"),
+        (2, "2025-07-01T00:00:05.25Z", "[ERROR][o.e.b] shard failed"),
+    ],
+    "ls": [
+        (1, "2025-07-01T00:00:02Z", "[INFO ] pipeline started"),
+        (2, "2025-07-01T00:00:04.999999999Z", "[ERROR] connection refused es:9200"),
+        (1, "2025-07-01T00:00:06Z", "\tat org.logstash.Foo(Foo.java:1)"),
+    ],
+}
+
+
+def frames(container):
+    out = b""
+    for stream, ts, message in LOGS[container]:
+        payload = f"{ts} {message}\n".encode()
+        out += struct.pack(">BxxxL", stream, len(payload)) + payload
+    return out
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, body, content_type="application/json"):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.split("/")
+        if url.path.endswith("/logs"):
+            self.server.log_params.append(parse_qs(url.query))
+            return self.reply(frames(parts[3]), "application/vnd.docker.raw-stream")
+        if url.path.endswith("/json"):
+            return self.reply({"Config": {"Tty": False}})
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = str(tmp_path / "docker.sock")
+    server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    server.daemon_threads = True
+    server.log_params = []
+    threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+    with docker_api.DockerClient(path) as c:
+        c.server = server
+        yield c
+    server.shutdown()
+    server.server_close()
+
+
+ROWS = [{"id": "es", "service": "elasticsearch", "container": "elasticsearch"},
+        {"id": "ls", "service": "logstash", "container": "logstash"}]
+
+
+def collect(client, **kwargs):
+    out = []
+    stats = ls.stream_logs(client, ROWS, kwargs.pop("log_filter", ls.LogFilter()), out.append, **kwargs)
+    return out, stats
+
+
+def test_merges_containers_by_timestamp(client):
+    out, stats = collect(client, tail=100)
+    assert [r["ts"][17:19] for r in out] == ["01", "02", "03", "04", "05", "06"]
+    assert [r["service"][0] for r in out] == ["e", "l", "e", "l", "e", "l"]
+    assert out[3]["stream"] == "stderr" and out[0]["level"] == "info"
+    assert stats == {"read": 6, "emitted": 6}
+    assert client.server.log_params[0]["tail"] == ["100"]
+    assert client.server.log_params[0]["timestamps"] == ["1"]
+
+
+def test_level_regex_and_time_filters(client):
+    out, _ = collect(client, log_filter=ls.LogFilter(min_level="warn"))
+    assert [r["level"] for r in out] == ["warn", "error", "error"]
+
+    out, _ = collect(client, log_filter=ls.LogFilter(pattern=r"es:9200|shard"))
+    assert [r["service"] for r in out] == ["logstash", "elasticsearch"]
+
+    since = ls.parse_time_arg("2025-07-01T00:00:03Z")
+    until = ls.parse_time_arg("2025-07-01T00:00:05Z")
+    out, stats = collect(client, log_filter=ls.LogFilter(since=since, until=until), since=since, until=until)
+    assert [r["ts"][17:19] for r in out] == ["03", "04"]
+    assert float(client.server.log_params[-1]["since"][0]) == since
+
+
+def test_follow_rejects_until(client):
+    with pytest.raises(ValueError, match="--until"):
+        collect(client, follow=True, until=ls.parse_time_arg("2025-07-01T00:00:05Z"))
+    assert client.server.log_params == []
+
+
+def test_follow_merge_reorders_within_window():
+    def source(items, delay):
+        for ns, name in items:
+            time.sleep(delay)
+            yield {"_ns": ns, "name": name}
+
+    sources = [source([(1, "a1"), (4, "a4")], 0.0), source([(2, "b2"), (3, "b3")], 0.02)]
+    names = [r["name"] for r in ls.follow_records(sources, window=0.2)]
+    assert names == ["a1", "b2", "b3", "a4"]
+
+
+def test_follow_buffer_is_bounded():
+    def source():
+        for i in range(50):
+            yield {"_ns": 1000 - i}
+
+    started = time.monotonic()
+    out = list(ls.follow_records([source()], window=10, max_buffer=5))
+    assert len(out) == 50 and time.monotonic() - started < 5
+    # 버퍼 상한(5줄)을 넘으면 재정렬 창이 끝나기 전이라도 가장 이른 줄부터 출력
+    assert out[0]["_ns"] == 995
+
+
+def test_json_output_and_helpers():
+    buf = io.StringIO()
+    emit = ls.line_emitter(ls.record_json, buf)
+    emit({"_ns": 1, "ts": "t", "service": "s", "container": "c", "stream": "stdout", "level": None, "message": "m"})
+    assert json.loads(buf.getvalue()) == {"ts": "t", "service": "s", "container": "c", "stream": "stdout",
+                                          "level": None, "message": "m"}
+    assert ls.parse_time_arg("10m", now=1000.0) == 400.0
+    assert ls.parse_docker_timestamp("1970-01-01T00:00:01.5Z") == 1_500_000_000
+    assert ls.detect_level('{"log.level": "WARNING"}') == "warn"
+    with pytest.raises(ValueError):
+        ls.parse_time_arg("yesterday")
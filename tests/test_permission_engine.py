@@ -0,0 +1,101 @@
+import os
+import stat
+
+import pytest
+import yaml
+
+from security_infra import permission_engine as engine
+from security_infra.set_permissions import build_permission_specs, load_permission_config, set_permissions
+
+
+def mode_of(path):
+    return stat.S_IMODE(os.lstat(path).st_mode)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "docker" / "elk"
+    (root / "esdata" / "nodes").mkdir(parents=True)
+    for i in range(5):
+        (root / "esdata" / "nodes" / f"seg{i}").write_text("x")
+    (root / "logstash.conf").write_text("input {}")
+    os.chmod(root / "logstash.conf", 0o600)
+    return tmp_path
+
+
+def spec_for(path, **kwargs):
+    uid, gid = os.getuid(), os.getgid()
+    return {"name": "elk", "path": str(path), "uid": uid, "gid": gid, "mode": 0o770, **kwargs}
+
+
+def test_applies_only_differences(tree):
+    root = tree / "docker" / "elk"
+    spec = spec_for(root, recursive=True, file_mode=0o640, exclude=[str(root / "logstash.conf")])
+    report = engine.apply_specs([spec], privileged=True)
+    counts = report.counts["elk"]
+    assert counts["failed"] == 0
+    assert counts["changed"] + counts["unchanged"] == 8
+    assert mode_of(root / "esdata" / "nodes") == 0o770
+    assert mode_of(root / "esdata" / "nodes" / "seg0") == 0o640
+    assert mode_of(root / "logstash.conf") == 0o600
+
+    again = engine.apply_specs([spec], privileged=True).counts["elk"]
+    assert again["changed"] == 0 and again["unchanged"] == 8
+
+
+def test_permission_errors_escalate_once(tree, monkeypatch):
+    root = tree / "docker" / "elk"
+    denied = {str(root / "esdata"), str(root / "logstash.conf")}
+    real_chmod = os.chmod
+
+    def chmod(path, mode, *a, **k):
+        if str(path) in denied:
+            raise PermissionError(1, "Operation not permitted")
+        return real_chmod(path, mode, *a, **k)
+
+    calls = []
+    monkeypatch.setattr(engine.os, "chmod", chmod)
+    monkeypatch.setattr(engine, "run_as_root", lambda specs: calls.append(specs) or {
+        "elk": {"changed": len(specs), "unchanged": 0, "failed": 0, "failed_paths": []}
+    })
+    report = engine.apply_specs([spec_for(root, recursive=True)], privileged=False, logger=lambda _: None)
+
+    assert len(calls) == 1
+    assert sorted(s["path"] for s in calls[0]) == sorted(denied)
+    assert [s["recursive"] for s in calls[0] if s["path"].endswith("esdata")] == [True]
+    assert report.sudo_calls == 1
+    assert report.counts["elk"]["changed"] >= 2
+
+
+def test_parse_owner_and_mode():
+    assert engine.parse_owner("1000:1001") == (1000, 1001)
+    assert engine.parse_owner("root:root") == (0, 0)
+    assert engine.parse_mode("770") == 0o770
+    assert engine.parse_mode("0o640") == 0o640
+
+
+def test_set_permissions_summary(tree):
+    cfg = {
+        "elk": {"owner": f"{os.getuid()}:{os.getgid()}", "mode": "750", "recursive": True, "file_mode": "640"},
+        "elk-logstash-template": {"path": "docker/elk/logstash.conf", "owner": f"{os.getuid()}:{os.getgid()}", "mode": "660"},
+        "vault": {"owner": "101:101", "mode": "770"},
+    }
+    config_file = tree / "permissions.yml"
+    config_file.write_text(yaml.safe_dump(cfg))
+    summary = set_permissions(project_root=tree, config_file=config_file, logger=lambda _: None, services=["elk"])
+    assert "[OK] elk:" in summary and "(재귀)" in summary
+    assert "[OK] elk-logstash-template:" in summary
+    assert "vault" not in summary
+    assert mode_of(tree / "docker" / "elk" / "logstash.conf") == 0o660
+    assert "실패 0, sudo 호출 0회" in summary
+
+
+def test_shipped_config_recurses_only_data_volumes(tree):
+    config_file = os.path.join(os.path.dirname(__file__), "..", "config", "permissions.yml")
+    specs = {s["name"]: s for s in build_permission_specs(
+        tree, load_permission_config(config_file), services=["elk"], logger=lambda _: None)}
+    esdata = str(tree / "docker" / "elk" / "esdata")
+    assert specs["elk-esdata"]["path"] == esdata and specs["elk-esdata"]["recursive"]
+    assert specs["elk-esdata"]["file_mode"] == 0o660
+    assert not specs["elk"]["recursive"]
+    assert esdata in specs["elk"]["exclude"]           # 상위 트리를 재귀로 바꿔도 데이터 볼륨 설정 우선
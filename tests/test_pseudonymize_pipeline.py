@@ -0,0 +1,142 @@
+import csv
+import functools
+import io
+import json
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from security_infra import pseudonymize_pipeline as pp
+from security_infra.ff3_engine import FF3Cipher
+
+KEY = "2DE79D232DF5585D68CE47882AE256D6"
+TWEAK = "CBD09280979564"
+FACTORY = functools.partial(FF3Cipher, KEY, TWEAK)
+
+
+def write_csv(path, n):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["patient_id", "name", "note"])
+        for i in range(n):
+            note = "줄바꿈\n포함, \"따옴표\"" if i % 7 == 0 else f"note {i}"
+            writer.writerow([f"{20240000 + i:08d}", f"환자{i}", note])
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_iter_record_chunks_respects_quoted_newlines():
+    data = b'a,b\n1,"x\ny"\n2,z\n\n3,"q""\n"\n'
+    chunks = list(pp.iter_record_chunks(io.BytesIO(data), 2, quoted=True))
+    assert [c[1] for c in chunks] == [2, 2, 1]                # 빈 줄도 CSV 레코드
+    assert b"".join(c[0] for c in chunks) == data
+    assert chunks[-1][2] == len(data)
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_csv_round_trip_preserves_order(tmp_path, workers):
+    src, enc, dec = tmp_path / "in.csv", tmp_path / "enc.csv", tmp_path / "dec.csv"
+    write_csv(src, 1000)
+    stats = pp.pseudonymize_file(src, enc, ["patient_id"], FACTORY, workers=workers, chunk_rows=64)
+    assert stats["rows"] == 1000 and stats["rows_per_s"] > 0 and stats["bytes"] == src.stat().st_size - len("patient_id,name,note\n")
+    original, encrypted = read_csv(src), read_csv(enc)
+    assert encrypted[0] == original[0]
+    assert [r[1:] for r in encrypted] == [r[1:] for r in original]
+    cipher = FACTORY()
+    assert [r[0] for r in encrypted[1:]] == cipher.encrypt_batch([r[0] for r in original[1:]])
+    pp.pseudonymize_file(enc, dec, ["patient_id"], FACTORY, operation="decrypt", workers=workers, chunk_rows=100)
+    assert read_csv(dec) == original
+    assert not (tmp_path / "enc.csv.ckpt.json").exists()
+
+
+def test_jsonl_columns_and_invalid_policy(tmp_path):
+    src, out = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    rows = [{"pid": f"{i:08d}", "n": i} for i in range(20)]
+    rows[3]["pid"] = "12"
+    rows[4]["pid"] = None
+    rows[5]["pid"] = 12345678
+    src.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    with pytest.raises(ValueError, match="4번째 레코드 'pid'"):
+        pp.pseudonymize_file(src, out, ["pid"], FACTORY, workers=0, chunk_rows=8)
+    assert not (tmp_path / "out.jsonl.ckpt.json").exists()   # 첫 청크에서 실패 → 기록된 진행 없음
+    stats = pp.pseudonymize_file(src, out, ["pid"], FACTORY, workers=0, chunk_rows=8, on_invalid="blank")
+    result = [json.loads(line) for line in out.read_text().splitlines()]
+    assert stats["invalid"] == 1
+    assert result[3]["pid"] == "" and result[4]["pid"] is None
+    assert result[5]["pid"] == int(FACTORY().encrypt("12345678"))
+    assert [r["n"] for r in result] == list(range(20))
+
+
+def test_csv_keeps_blank_rows_and_input_line_endings(tmp_path):
+    src, enc, dec = tmp_path / "in.csv", tmp_path / "enc.csv", tmp_path / "dec.csv"
+    src.write_bytes(b'pid,note\r\n20240001,a\r\n\r\n20240002,"x\r\ny"\r\n\r\n20240003,b\r\n')
+    stats = pp.pseudonymize_file(src, enc, ["pid"], FACTORY, workers=0, chunk_rows=2)
+    assert stats["rows"] == 5
+    data = enc.read_bytes()
+    assert data.count(b"\r\n") == src.read_bytes().count(b"\r\n") and b"\r\n\r\n" in data
+    assert b"\n" not in data.replace(b"\r\n", b"")
+    pp.pseudonymize_file(enc, dec, ["pid"], FACTORY, operation="decrypt", workers=0, chunk_rows=2)
+    assert dec.read_bytes() == src.read_bytes()
+
+
+def test_jsonl_integer_values_keep_their_type(tmp_path):
+    src, enc, dec = tmp_path / "in.jsonl", tmp_path / "enc.jsonl", tmp_path / "dec.jsonl"
+    rows = [{"pid": 12345678}, {"pid": 10000005}, {"pid": "20240001"}]
+    src.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    pp.pseudonymize_file(src, enc, ["pid"], FACTORY, workers=0)
+    result = [json.loads(line)["pid"] for line in enc.read_text().splitlines()]
+    cipher = FACTORY()
+    assert result[0] == int(cipher.encrypt("12345678"))
+    assert result[1] == cipher.encrypt("10000005") and result[1].startswith("0")   # 앞자리 0 → 문자열 유지
+    assert result[2] == cipher.encrypt("20240001")
+    pp.pseudonymize_file(enc, dec, ["pid"], FACTORY, operation="decrypt", workers=0)
+    assert [json.loads(line)["pid"] for line in dec.read_text().splitlines()] == [12345678, "10000005", "20240001"]
+
+
+def test_resume_after_crash(tmp_path):
+    src, out, full = tmp_path / "in.csv", tmp_path / "out.csv", tmp_path / "full.csv"
+    write_csv(src, 500)
+    pp.pseudonymize_file(src, full, ["patient_id"], FACTORY, workers=0, chunk_rows=50)
+
+    class Crash(Exception):
+        pass
+
+    def crash(stats):
+        if stats["rows"] >= 200:
+            raise Crash()
+
+    with pytest.raises(Crash):
+        pp.pseudonymize_file(src, out, ["patient_id"], FACTORY, workers=2, chunk_rows=50, progress=crash)
+    checkpoint = pp.load_checkpoint(tmp_path / "out.csv.ckpt.json")
+    assert checkpoint["rows"] == 200
+    with open(out, "ab") as f:
+        f.write(b"partial,garbage")          # 체크포인트 이후 불완전한 출력
+    with pytest.raises(ValueError, match="체크포인트"):
+        pp.pseudonymize_file(src, out, ["patient_id"], FACTORY, workers=0)
+    stats = pp.pseudonymize_file(src, out, ["patient_id"], FACTORY, workers=2, chunk_rows=50, resume=True)
+    assert stats["resumed_from"] == 200 and stats["rows"] == 300
+    assert out.read_bytes() == full.read_bytes()
+
+
+def test_checkpoint_rejects_changed_input(tmp_path):
+    src, out = tmp_path / "in.csv", tmp_path / "out.csv"
+    write_csv(src, 100)
+    with pytest.raises(RuntimeError):
+        pp.pseudonymize_file(src, out, ["patient_id"], FACTORY, workers=0, chunk_rows=10,
+                             progress=lambda s: (_ for _ in ()).throw(RuntimeError()))
+    write_csv(src, 101)
+    with pytest.raises(ValueError, match="input_signature"):
+        pp.pseudonymize_file(src, out, ["patient_id"], FACTORY, workers=0, resume=True)
+
+
+def test_missing_column_and_same_path(tmp_path):
+    src = tmp_path / "in.csv"
+    write_csv(src, 3)
+    with pytest.raises(ValueError, match="헤더에 없는 컬럼"):
+        pp.pseudonymize_file(src, tmp_path / "o.csv", ["ssn"], FACTORY, workers=0)
+    with pytest.raises(ValueError, match="입력 파일과 달라야"):
+        pp.pseudonymize_file(src, src, ["patient_id"], FACTORY, workers=0)
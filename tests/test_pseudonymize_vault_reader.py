@@ -0,0 +1,204 @@
+import http.server
+import json
+import socketserver
+import threading
+import time
+
+import pytest
+
+from security_infra import pseudonymize_vault_reader as pvr
+
+
+class FakeKV(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        self.token = "t1"
+        self.ttl = "10m"
+        self.version = 1
+        self.reads = 0
+        self.omit = set()
+        self.tokens = []
+        self.connections = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        super().__init__(("127.0.0.1", 0), KVHandler)
+
+    @property
+    def addr(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class KVHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        srv = self.server
+        srv.gate.wait(5)
+        srv.tokens.append(self.headers.get("X-Vault-Token"))
+        if self.path != "/v1/pseudonymize/data/ff3":
+            return self.reply(404, {"errors": []})
+        if self.headers.get("X-Vault-Token") != srv.token:
+            return self.reply(403, {"errors": ["permission denied"]})
+        srv.reads += 1
+        custom = {"ttl": srv.ttl} if srv.ttl else None
+        data = {"KEY": f"key-v{srv.version}", "TWEAK": f"tweak-v{srv.version}"}
+        self.reply(200, {"lease_duration": 0, "data": {
+            "data": {k: v for k, v in data.items() if k not in srv.omit},
+            "metadata": {"version": srv.version, "custom_metadata": custom}}})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def kv(tmp_path):
+    server = FakeKV()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    token_file = tmp_path / "vault-token"
+    token_file.write_text("t1\n")
+    yield server, token_file
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, token_file, clock, **kwargs):
+    return pvr.PseudonymizeKeyClient(server.addr, str(token_file), cacert=False, clock=clock, **kwargs)
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("300", 300.0), (600, 600.0), ("10m", 600.0), ("1h30m", 5400.0), ("0", None), ("soon", None), (None, None),
+])
+def test_parse_ttl(value, expected):
+    assert pvr.parse_ttl(value) == expected
+
+
+def test_cache_hits_within_ttl(kv):
+    server, token_file = kv
+    clock = Clock()
+    with make_client(server, token_file, clock) as client:
+        for _ in range(1000):
+            assert client.get_keys() == ("key-v1", "tweak-v1")
+        stats = client.stats()
+    assert server.reads == 1
+    assert stats["misses"] == 1 and stats["hits"] == 999
+    assert stats["token_reloads"] == 1
+    assert stats["ttl_s"] == 600.0
+
+
+def test_expiry_refetches_and_default_ttl(kv):
+    server, token_file = kv
+    server.ttl = None
+    clock = Clock()
+    with make_client(server, token_file, clock, default_ttl=30) as client:
+        client.get_keys()
+        server.version = 2
+        clock.now += 31
+        assert client.get_keys() == ("key-v2", "tweak-v2")
+        stats = client.stats()
+    assert stats["misses"] == 2 and stats["ttl_s"] == 30
+    assert server.reads == 2
+    assert server.connections == 1
+
+
+def test_background_refresh_before_expiry(kv):
+    server, token_file = kv
+    clock = Clock()
+    with make_client(server, token_file, clock) as client:
+        client.get_keys()
+        server.version = 2
+        server.gate.clear()
+        clock.now += 500                      # 10분 TTL의 80% 이후
+        assert client.get_keys() == ("key-v1", "tweak-v1")   # 갱신을 기다리지 않음
+        assert client.get_keys() == ("key-v1", "tweak-v1")
+        server.gate.set()
+        client.wait_refresh(5)
+        assert client.get_keys() == ("key-v2", "tweak-v2")
+        stats = client.stats()
+    assert stats["refreshes"] == 1
+    assert stats["misses"] == 1
+    assert server.reads == 2
+
+
+def test_token_reloaded_only_when_file_changes(kv):
+    server, token_file = kv
+    clock = Clock()
+    with make_client(server, token_file, clock, default_ttl=1) as client:
+        server.ttl = None
+        client.get_keys()
+        clock.now += 2
+        client.get_keys()
+        assert client.stats()["token_reloads"] == 1
+
+        server.token = "token-2"
+        token_file.write_text("token-2\n")
+        clock.now += 2
+        client.get_keys()
+        assert client.stats()["token_reloads"] == 2
+    assert server.tokens[-1] == "token-2"
+
+
+def test_forbidden_forces_token_reread(kv, monkeypatch):
+    server, token_file = kv
+    clock = Clock()
+    with make_client(server, token_file, clock) as client:
+        client._current_token()
+        server.token = "rotated"
+        token_file.write_text("rotated\n")
+        # mtime/크기 변경을 감지하지 못한 경우에도 403이면 다시 읽음
+        monkeypatch.setattr(pvr, "file_signature", lambda path: client._token_sig)
+        assert client.get_keys() == ("key-v1", "tweak-v1")
+    assert server.tokens == ["t1", "rotated"]
+
+
+def test_missing_field_raises_and_is_not_cached(kv):
+    server, token_file = kv
+    server.omit = {"TWEAK"}
+    with make_client(server, token_file, Clock()) as client:
+        with pytest.raises(pvr.VaultError, match="TWEAK"):
+            client.get_keys()
+        assert client.stats()["cached"] is False
+        server.omit = set()
+        assert client.get_keys() == ("key-v1", "tweak-v1")
+    assert server.reads == 2
+
+
+def test_concurrent_cold_misses_fetch_once(kv):
+    server, token_file = kv
+    server.gate.clear()
+    results = []
+    with make_client(server, token_file, Clock()) as client:
+        threads = [threading.Thread(target=lambda: results.append(client.get_keys())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        deadline = time.monotonic() + 5
+        while client.stats()["misses"] < 8 and time.monotonic() < deadline:
+            time.sleep(0.01)                   # 모두 캐시 미스 상태로 대기할 때까지
+        server.gate.set()
+        for t in threads:
+            t.join(5)
+        stats = client.stats()
+    assert results == [("key-v1", "tweak-v1")] * 8
+    assert server.reads == 1
+    assert stats["misses"] == 8 and stats["coalesced"] == 7
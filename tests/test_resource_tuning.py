@@ -0,0 +1,63 @@
+import pytest
+
+from security_infra import resource_tuning as rt
+
+
+def fake_host(tmp_path, mem_kb, cgroup_max=None, cpu_max=None):
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text(f"MemTotal:       {mem_kb} kB\nMemFree:        1000 kB\nMemAvailable:   {mem_kb // 2} kB\n")
+    cgroup = tmp_path / "cgroup"
+    cgroup.mkdir()
+    if cgroup_max is not None:
+        (cgroup / "memory.max").write_text(f"{cgroup_max}\n")
+    if cpu_max is not None:
+        (cgroup / "cpu.max").write_text(f"{cpu_max}\n")
+    return rt.host_resources(str(meminfo), str(cgroup))
+
+
+def mib(value):
+    return int(value.rstrip("m"))
+
+
+def test_es_heap_at_most_half_of_limit_and_budget_respected(tmp_path):
+    resources = fake_host(tmp_path, 16 * 1024 * 1024)
+    plan = rt.plan_resources(resources)
+    env = plan["env"]
+    assert mib(env["ES_MEM"]) <= mib(env["ES_MEM_LIMIT"]) // 2
+    assert mib(env["LS_MEM"]) <= mib(env["LS_MEM_LIMIT"]) // 2
+    assert mib(env["KC_HEAP"]) <= mib(env["KC_MEM_LIMIT"]) * 0.7
+    assert plan["allocated_mib"] <= plan["budget_mib"]
+    assert all(mib(v) % rt.ALIGN_MIB == 0 for v in env.values())
+    assert set(env) == {"ES_MEM", "ES_MEM_LIMIT", "LS_MEM", "LS_MEM_LIMIT", "KB_MEM_LIMIT",
+                        "KC_HEAP", "KC_MEM_LIMIT", "VT_MEM_LIMIT", "LD_MEM_LIMIT"}
+
+
+def test_cgroup_limits_cap_memory_and_cpu(tmp_path):
+    resources = fake_host(tmp_path, 64 * 1024 * 1024, cgroup_max=8 * 1024 ** 3, cpu_max="150000 100000")
+    assert resources["effective_mem_mib"] == 8192
+    assert resources["cgroup_mem_limit_mib"] == 8192
+    assert resources["cpus"] <= 1.5
+    plan = rt.plan_resources(resources)
+    assert plan["allocated_mib"] <= 8192 - plan["reserve_mib"]
+
+
+def test_large_host_caps_es_heap(tmp_path):
+    plan = rt.plan_resources(fake_host(tmp_path, 512 * 1024 * 1024))
+    assert mib(plan["env"]["ES_MEM"]) <= rt.ES_MAX_HEAP_MIB
+
+
+def test_small_host_warns_and_uses_minimums(tmp_path):
+    plan = rt.plan_resources(fake_host(tmp_path, 3 * 1024 * 1024))
+    assert any("OOM" in w for w in plan["warnings"])
+    assert mib(plan["env"]["ES_MEM_LIMIT"]) == 1024
+
+
+def test_write_env_preserves_other_lines(tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("# 호스트 설정\nTZ=Asia/Seoul\nES_MEM=512m\nexport LS_MEM=256m\n")
+    changed = rt.write_env(env_file, {"ES_MEM": "1024m", "LS_MEM": "256m", "KC_HEAP": "448m"})
+    assert changed == ["ES_MEM", "LS_MEM", "KC_HEAP"]
+    assert env_file.read_text() == (
+        "# 호스트 설정\nTZ=Asia/Seoul\nES_MEM=1024m\nLS_MEM=256m\n# tune-resources 자동 산정값\nKC_HEAP=448m\n"
+    )
+    assert rt.write_env(env_file, {"ES_MEM": "1024m", "LS_MEM": "256m", "KC_HEAP": "448m"}) == []
@@ -0,0 +1,189 @@
+import os
+
+import pytest
+import yaml
+
+from security_infra import sync_templates as st
+from security_infra.template_engine import render_bytes, template_variables
+
+
+def make_project(tmp_path):
+    (tmp_path / "templates/elk").mkdir(parents=True)
+    (tmp_path / "templates/vault").mkdir(parents=True)
+    (tmp_path / "templates/bitwarden").mkdir(parents=True)
+    (tmp_path / "templates/elk/logstash.conf").write_text("input {}\n")
+    (tmp_path / "templates/vault/vault.hcl").write_text('ui = true\n')
+    (tmp_path / "templates/bitwarden/docker-compose.override.yml").write_text("services: {}\n")
+    (tmp_path / "templates/vault/.vault.hcl.swp").write_text("junk")
+    return tmp_path
+
+
+def sync(root, **kwargs):
+    return st.sync_template_files(root, logger=lambda _: None, **kwargs)
+
+
+def test_discovers_all_templates_with_overrides(tmp_path):
+    root = make_project(tmp_path)
+    result = sync(root)
+    assert sorted(result["copied"]) == [
+        "docker/bitwarden/docker-compose.override.yml",
+        "docker/elk/logstash/pipeline/logstash.conf",
+        "docker/vault/config/vault.hcl",
+    ]
+    assert result["services"] == ["bitwarden", "elk", "vault"]
+    assert result["errors"] == []
+    assert (root / "docker/vault/config/vault.hcl").read_text() == "ui = true\n"
+
+
+def test_unchanged_templates_are_not_rewritten(tmp_path):
+    root = make_project(tmp_path)
+    sync(root)
+    dst = root / "docker/elk/logstash/pipeline/logstash.conf"
+    before = os.stat(dst).st_mtime_ns
+
+    result = sync(root)
+    assert result["copied"] == [] and result["services"] == []
+    assert os.stat(dst).st_mtime_ns == before
+
+
+def test_only_changed_template_is_copied(tmp_path):
+    root = make_project(tmp_path)
+    sync(root)
+    vault_dst = root / "docker/vault/config/vault.hcl"
+    os.chmod(vault_dst, 0o640)
+    (root / "templates/vault/vault.hcl").write_text('ui = false\n')
+
+    result = sync(root)
+    assert result["copied"] == ["docker/vault/config/vault.hcl"]
+    assert result["services"] == ["vault"]
+    assert vault_dst.read_text() == 'ui = false\n'
+    assert os.stat(vault_dst).st_mode & 0o777 == 0o640
+
+
+def test_externally_modified_destination_is_restored(tmp_path):
+    root = make_project(tmp_path)
+    sync(root)
+    dst = root / "docker/elk/logstash/pipeline/logstash.conf"
+    dst.write_text("edited by hand\n")
+
+    assert sync(root)["copied"] == ["docker/elk/logstash/pipeline/logstash.conf"]
+    assert dst.read_text() == "input {}\n"
+
+
+def test_missing_state_with_identical_content_is_not_copied(tmp_path):
+    root = make_project(tmp_path)
+    sync(root)
+    (root / st.STATE_FILE).unlink()
+
+    assert sync(root)["copied"] == []
+    assert sync(root, force=True)["services"] == ["bitwarden", "elk", "vault"]
+
+
+def test_renders_variables_and_skips_unchanged_output(tmp_path):
+    root = make_project(tmp_path)
+    (root / "templates/elk/logstash.conf").write_text("port => {{ beats_port | 5044 }}\n")
+    dst = root / "docker/elk/logstash/pipeline/logstash.conf"
+
+    sync(root, variables={})
+    assert dst.read_text() == "port => 5044\n"
+    assert sync(root, variables={"beats_port": "5044", "unrelated": "x"})["copied"] == []
+
+    result = sync(root, variables={"beats_port": "5045"})
+    assert result["copied"] == ["docker/elk/logstash/pipeline/logstash.conf"]
+    assert dst.read_text() == "port => 5045\n"
+
+
+def test_unchanged_run_skips_rendering_via_state_file(tmp_path, monkeypatch):
+    root = make_project(tmp_path)
+    src = root / "templates/elk/logstash.conf"
+    src.write_text("port => {{ beats_port | 5044 }}\n")
+    sync(root, variables={"beats_port": "5045"})
+
+    rendered = []
+    monkeypatch.setattr(st, "render_bytes", lambda source, variables: rendered.append(source) or render_bytes(source, variables))
+    # 새 실행(프로세스 캐시 없음)이어도 원본/대상 stat과 사용 변수가 같으면 렌더링하지 않음
+    result = sync(root, variables={"beats_port": "5045", "unrelated": "x"})
+    assert result["copied"] == [] and len(result["unchanged"]) == 3 and rendered == []
+
+    assert sync(root, variables={"beats_port": "5046"})["copied"] == ["docker/elk/logstash/pipeline/logstash.conf"]
+    assert len(rendered) == 1
+    src.write_text("port => {{ beats_port | 5044 }} # edited\n")
+    assert sync(root, variables={"beats_port": "5046"})["copied"] == ["docker/elk/logstash/pipeline/logstash.conf"]
+    assert len(rendered) == 2
+
+
+def test_missing_variable_is_reported_per_file(tmp_path):
+    root = make_project(tmp_path)
+    (root / "templates/vault/vault.hcl").write_text("ui = {{ vault_ui }}\n")
+    result = sync(root, variables={})
+    assert len(result["errors"]) == 1 and "vault_ui" in result["errors"][0]
+    assert "docker/elk/logstash/pipeline/logstash.conf" in result["copied"]
+
+
+def test_unmapped_and_reference_templates_are_not_deployed(tmp_path):
+    root = make_project(tmp_path)
+    (root / "templates/vault/config.hcl").write_text("vault { address = \"https://vault:8200\" }\n")
+    (root / "templates/vault/docker-compose.yml").write_text("services: {}\n")
+    (root / "templates/keycloak").mkdir()
+    (root / "templates/keycloak/realm.json").write_text("{}")
+    messages = []
+    result = st.sync_template_files(root, logger=messages.append)
+    assert "docker/agent/config/config.hcl" in result["copied"]
+    assert not (root / "docker/vault/config.hcl").exists()
+    assert not (root / "docker/vault/docker-compose.yml").exists()
+    assert not (root / "docker/keycloak/realm.json").exists()
+    assert result["services"] == ["bitwarden", "elk", "vault"]
+    warnings = [m for m in messages if m.startswith("[WARN]")]
+    assert len(warnings) == 1 and "templates/keycloak/realm.json" in warnings[0]
+
+
+def test_repository_templates_are_all_registered():
+    root = st.Path(st.__file__).resolve().parents[2]
+    keys = {st.template_key(root, p) for p in (root / "templates").rglob("*") if p.is_file()}
+    assert keys - {None} <= set(st.TEMPLATE_DESTINATIONS)
+
+
+def assert_balanced(text, path):
+    """HCL/logstash 설정: 문자열/주석 밖 중괄호·대괄호 짝과 문자열 닫힘만 확인 (파서 의존성 없이)"""
+    stack, quote, escaped, comment = [], None, False, False
+    for ch in text:
+        if comment:
+            comment = ch != "\n"
+        elif quote:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch == "#":
+            comment = True
+        elif ch in "{[":
+            stack.append(ch)
+        elif ch in "}]":
+            assert stack and stack.pop() == "{["["}]".index(ch)], f"{path}: 괄호 짝 불일치"
+    assert quote is None, f"{path}: 닫히지 않은 문자열"
+    assert not stack, f"{path}: 닫히지 않은 괄호"
+
+
+REPO_ROOT = st.Path(st.__file__).resolve().parents[2]
+SHIPPED_VARS = yaml.safe_load((REPO_ROOT / "config/config.yml").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("config", [{}, SHIPPED_VARS], ids=["defaults", "config.yml"])
+def test_repository_templates_are_valid_after_rendering(config):
+    variables = template_variables(config, environ={})
+    paths = sorted(p for p in (REPO_ROOT / "templates").rglob("*") if p.is_file() and not p.name.startswith("."))
+    assert paths
+    for path in paths:
+        text = path.read_text(encoding="utf-8")
+        if st.template_target(REPO_ROOT, path) is not None:
+            text = render_bytes(text.encode("utf-8"), variables).decode("utf-8")
+        # 배포(렌더링)하지 않는 참고 파일은 원본 그대로 유효해야 함 (변수 사용 불가)
+        assert "{{" not in text, f"{path}: 렌더링되지 않은 변수"
+        if path.suffix in (".yml", ".yaml"):
+            assert isinstance(yaml.safe_load(text), dict), path
+        else:
+            assert_balanced(text, path)
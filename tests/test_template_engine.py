@@ -0,0 +1,43 @@
+import pytest
+
+from security_infra import template_engine as te
+
+
+def test_render_with_defaults_and_overrides():
+    source = b'port => {{ port | 5044 }}\nhosts => ["{{ es }}"]\nkeep => %{[field]} ${VAR}\n'
+    out = te.render_bytes(source, {"es": "es01:9200"}, cache=te.RenderCache())
+    assert out == b'port => 5044\nhosts => ["es01:9200"]\nkeep => %{[field]} ${VAR}\n'
+
+
+def test_missing_variable_raises():
+    with pytest.raises(ValueError, match="vault_port"):
+        te.render_bytes(b"{{ vault_port }}", {}, cache=te.RenderCache())
+
+
+def test_cache_keyed_on_template_and_used_variables():
+    cache = te.RenderCache()
+    source = b"user: {{ uid | 1001 }}"
+    for host in range(10):
+        assert cache.render(source, {"uid": "1001", "hostname": f"host{host}"}) == b"user: 1001"
+    assert cache.render(source, {"uid": "2000"}) == b"user: 2000"
+    assert cache.stats == {"compile_hits": 10, "compile_misses": 1, "render_hits": 9, "render_misses": 2}
+
+
+def test_plain_and_binary_files_pass_through():
+    cache = te.RenderCache()
+    assert cache.render(b"no placeholders", {}) == b"no placeholders"
+    assert cache.render(b"\xff\xfe{{ x }}", {}) == b"\xff\xfe{{ x }}"
+
+
+def test_environment_overrides_config():
+    variables = te.template_variables(
+        {"template_vars": {"vault_log_level": "trace", "vault_host_port": 8200}},
+        environ={"SECURITY_INFRA_VAULT_LOG_LEVEL": "info", "HOME": "/root"},
+    )
+    assert variables == {"vault_log_level": "info", "vault_host_port": "8200"}
+
+
+def test_parse_var_overrides():
+    assert te.parse_var_overrides(["a=1", "b=x=y"]) == {"a": "1", "b": "x=y"}
+    with pytest.raises(ValueError):
+        te.parse_var_overrides(["novalue"])
@@ -0,0 +1,92 @@
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+from security_infra import sync_templates as st
+from security_infra import template_watch as tw
+
+
+def make_project(tmp_path):
+    (tmp_path / "templates/elk").mkdir(parents=True)
+    (tmp_path / "templates/vault").mkdir(parents=True)
+    (tmp_path / "templates/elk/logstash.conf").write_text("port => {{ port | 5044 }}\n")
+    (tmp_path / "templates/vault/vault.hcl").write_text("ui = true\n")
+    st.sync_template_files(tmp_path, logger=lambda _: None, variables={})
+    return tmp_path
+
+
+def start_watch(root, **kwargs):
+    batches, reloaded = queue.Queue(), []
+    stop, ready = threading.Event(), threading.Event()
+    thread = threading.Thread(
+        target=tw.watch_templates,
+        kwargs=dict(project_root=root, logger=lambda _: None, variables={}, on_batch=batches.put,
+                    reload=reloaded.append, stop=stop, ready=ready, **kwargs),
+        daemon=True,
+    )
+    thread.start()
+    assert ready.wait(5)
+    return batches, reloaded, stop, thread
+
+
+@pytest.mark.parametrize("polling", [False, True])
+def test_pushes_only_changed_file(tmp_path, polling):
+    root = make_project(tmp_path)
+    vault_dst = root / "docker/vault/config/vault.hcl"
+    vault_mtime = os.stat(vault_dst).st_mtime_ns
+    batches, reloaded, stop, thread = start_watch(root, polling=polling, interval=0.05, debounce=0.05)
+    try:
+        time.sleep(0.1)
+        (root / "templates/elk/logstash.conf").write_text("port => 5045\n")
+        result = batches.get(timeout=5)
+    finally:
+        stop.set()
+        thread.join(5)
+
+    assert result["copied"] == ["docker/elk/logstash/pipeline/logstash.conf"]
+    assert reloaded == ["elk"]
+    assert (root / "docker/elk/logstash/pipeline/logstash.conf").read_text() == "port => 5045\n"
+    assert os.stat(vault_dst).st_mtime_ns == vault_mtime
+
+
+def test_burst_of_writes_is_debounced_into_one_batch(tmp_path):
+    root = make_project(tmp_path)
+    batches, reloaded, stop, thread = start_watch(root, debounce=0.5)
+    try:
+        src = root / "templates/vault/vault.hcl"
+        for i in range(5):
+            src.write_text(f"ui = true\n# {i}\n")
+            time.sleep(0.01)
+        tmp = root / "templates/vault/.vault.hcl.swp"
+        tmp.write_text("editor junk")
+        result = batches.get(timeout=5)
+        time.sleep(1.0)
+        assert batches.empty()
+    finally:
+        stop.set()
+        thread.join(5)
+
+    assert result["copied"] == ["docker/vault/config/vault.hcl"]
+    assert reloaded == ["vault"]
+    assert (root / "docker/vault/config/vault.hcl").read_text() == "ui = true\n# 4\n"
+    assert not (root / "docker/vault/.vault.hcl.swp").exists()
+
+
+def test_new_subdirectory_is_watched(tmp_path, monkeypatch):
+    root = make_project(tmp_path)
+    monkeypatch.setitem(st.TEMPLATE_DESTINATIONS, "keycloak/realm.json", ("docker/keycloak/realm.json", "keycloak"))
+    batches, _, stop, thread = start_watch(root, debounce=0.05)
+    try:
+        (root / "templates/keycloak").mkdir()
+        time.sleep(0.1)
+        (root / "templates/keycloak/realm.json").write_text("{}")
+        copied = set()
+        while "docker/keycloak/realm.json" not in copied:
+            copied.update(batches.get(timeout=5)["copied"])
+    finally:
+        stop.set()
+        thread.join(5)
+    assert (root / "docker/keycloak/realm.json").read_text() == "{}"
@@ -0,0 +1,272 @@
+import base64
+import hashlib
+import http.server
+import json
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+
+from security_infra import transit_engine as te
+from security_infra.pseudonymize_pipeline import pseudonymize_file
+
+
+class FakeTransit(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        self.token = "t1"
+        self.delay = 0.0
+        self.max_body = None
+        self.fail_once = set()          # 첫 시도만 실패할 평문
+        self.fail_always = set()
+        self.unavailable = 0            # 남은 503 응답 수
+        self.requests = []              # 요청별 항목 수
+        self.connections = 0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), TransitHandler)
+
+    @property
+    def addr(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+def fake_cipher(plaintext, context):
+    return "vault:v1:" + base64.b64encode(context.encode() + b":" + base64.b64decode(plaintext)[::-1]).decode()
+
+
+class TransitHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        srv = self.server
+        raw = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("X-Vault-Token") != srv.token:
+            return self.reply(403, {"errors": ["permission denied"]})
+        if srv.max_body and len(raw) > srv.max_body:
+            return self.reply(413, {"errors": ["request body too large"]})
+        with srv.lock:
+            if srv.unavailable:
+                srv.unavailable -= 1
+                return self.reply(503, {"errors": ["Vault is sealed"]})
+            srv.active += 1
+            srv.peak = max(srv.peak, srv.active)
+        try:
+            time.sleep(srv.delay)
+            items = json.loads(raw)["batch_input"]
+            with srv.lock:
+                srv.requests.append(len(items))
+            op = self.path.split("/")[3]
+            results = []
+            for item in items:
+                context = base64.b64decode(item.get("context", "")).decode()
+                if op == "decrypt":
+                    _, _, payload = item["ciphertext"].partition("vault:v1:")
+                    prefix, _, body = base64.b64decode(payload).partition(b":")
+                    if prefix.decode() != context:
+                        results.append({"error": "cipher: message authentication failed"})
+                    else:
+                        results.append({"plaintext": base64.b64encode(body[::-1]).decode()})
+                    continue
+                value = item.get("plaintext") or item.get("input")
+                text = base64.b64decode(value).decode()
+                with srv.lock:
+                    failed = text in srv.fail_always or text in srv.fail_once
+                    srv.fail_once.discard(text)
+                if failed:
+                    results.append({"error": "internal error"})
+                elif op == "hmac":
+                    results.append({"hmac": "vault:v1:" + hashlib.sha256(value.encode()).hexdigest()})
+                else:
+                    results.append({"ciphertext": fake_cipher(value, context)})
+            status = 400 if any("error" in r for r in results) else 200
+            self.reply(status, {"data": {"batch_results": results}})
+        finally:
+            with srv.lock:
+                srv.active -= 1
+
+
+@pytest.fixture
+def transit(tmp_path):
+    server = FakeTransit()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    token_file = tmp_path / "vault-token"
+    token_file.write_text("t1\n")
+    yield server, token_file
+    server.shutdown()
+    server.server_close()
+
+
+def make_engine(server, token_file, **kwargs):
+    kwargs.setdefault("backoff", 0.01)
+    return te.TransitEngine(server.addr, str(token_file), cacert=False, **kwargs)
+
+
+def test_roundtrip_preserves_order_and_is_deterministic(transit):
+    server, token_file = transit
+    values = [f"{i:08d}" for i in range(3000)]
+    with make_engine(server, token_file) as engine:
+        out = engine.encrypt_batch(values)
+        assert out == engine.encrypt_batch(values)
+        assert engine.decrypt_batch(out) == values
+        assert engine.encrypt("홍길동") == engine.encrypt("홍길동")
+    assert out[0] == fake_cipher(base64.b64encode(b"00000000").decode(), "pseudonymize")
+    assert len(set(out)) == len(values)
+    # 값마다 요청하지 않고 배치로 묶어 전송
+    assert len(server.requests) < 30
+
+
+def test_batches_in_flight_over_pooled_session(transit):
+    server, token_file = transit
+    server.delay = 0.05
+    batcher = te.AdaptiveBatcher(initial_bytes=4096, min_bytes=4096, max_bytes=4096)
+    with make_engine(server, token_file, max_inflight=4, batcher=batcher) as engine:
+        engine.encrypt_batch(f"{i:08d}" for i in range(2000))
+    assert len(server.requests) > 8
+    assert 1 < server.peak <= 4
+    assert server.connections <= 4
+
+
+def test_only_failed_items_are_retried(transit):
+    server, token_file = transit
+    values = [f"{i:08d}" for i in range(1000)]
+    server.fail_once = {"00000007", "00000500", "00000999"}
+    with make_engine(server, token_file) as engine:
+        out = engine.encrypt_batch(values)
+        stats = engine.stats()
+    sent = list(server.requests)
+    assert engine_decrypts(server, token_file, out) == values
+    assert stats["retried_items"] == 3
+    assert sum(sent) == len(values) + 3
+    assert sent[-1] == 3
+
+
+def engine_decrypts(server, token_file, values):
+    with make_engine(server, token_file) as engine:
+        return engine.decrypt_batch(values)
+
+
+def test_persistent_item_failure_raises(transit):
+    server, token_file = transit
+    server.fail_always = {"00000003"}
+    with make_engine(server, token_file, retries=2) as engine:
+        with pytest.raises(te.TransitError, match="실패 1건"):
+            engine.encrypt_batch([f"{i:08d}" for i in range(10)])
+    assert server.requests == [10, 1, 1]
+
+
+def test_payload_too_large_splits_batch(transit):
+    server, token_file = transit
+    server.max_body = 8000
+    values = [f"{i:08d}" for i in range(1000)]
+    with make_engine(server, token_file) as engine:
+        out = engine.encrypt_batch(values)
+        stats = engine.stats()
+    assert engine_decrypts(server, token_file, out) == values
+    assert stats["split_batches"] > 0
+    assert stats["batch_bytes"] < te.INITIAL_BATCH_BYTES
+
+
+def test_unavailable_retries_whole_request(transit):
+    server, token_file = transit
+    server.unavailable = 2
+    with make_engine(server, token_file) as engine:
+        assert len(engine.encrypt_batch(["1234", "5678"])) == 2
+        assert engine.stats()["request_retries"] == 2
+
+
+def test_connection_failure_raises_transit_error(tmp_path):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    token_file = tmp_path / "vault-token"
+    token_file.write_text("t1\n")
+    with te.TransitEngine(f"http://127.0.0.1:{port}", str(token_file), cacert=False,
+                          retries=1, backoff=0.01) as engine:
+        with pytest.raises(te.TransitError, match="연결 실패"):
+            engine.encrypt_batch(["1234"])
+        assert engine.stats()["request_retries"] == 1
+
+
+def test_token_file_reread_on_forbidden(transit):
+    server, token_file = transit
+    with make_engine(server, token_file) as engine:
+        engine.encrypt("1")
+        server.token = "t2"
+        token_file.write_text("t2\n")
+        engine._token_sig = te.file_signature(str(token_file))     # 변경 감지 실패 가정
+        assert engine.encrypt("1").startswith("vault:v1:")
+
+
+def test_hmac_mode_is_one_way(transit):
+    server, token_file = transit
+    with make_engine(server, token_file, mode="hmac") as engine:
+        out = engine.encrypt_batch(["a", "b", "a"])
+        assert out[0] == out[2] != out[1]
+        with pytest.raises(ValueError):
+            engine.decrypt_batch(out)
+    with pytest.raises(ValueError):
+        make_engine(server, token_file, mode="fpe")
+
+
+def test_adaptive_batcher_grows_and_shrinks():
+    batcher = te.AdaptiveBatcher(initial_bytes=1000, min_bytes=500, max_bytes=4000, max_items=50, target_latency=1.0)
+    assert batcher.take([100] * 30, 0) == 10
+    assert batcher.take([100] * 30, 25) == 30
+    assert batcher.take([5000], 0) == 1                  # 한도보다 큰 값도 최소 1건
+    batcher.observe(1000, 0.1)
+    assert batcher.limit == 2000
+    batcher.observe(100, 0.1)                            # 자투리 배치는 확대 근거로 쓰지 않음
+    assert batcher.limit == 2000
+    batcher.observe(2000, 2.0)
+    batcher.observe(1000, 2.0)
+    batcher.observe(500, 2.0)
+    assert batcher.limit == 500
+    assert batcher.take([1] * 100, 0) == 50              # 항목 수 상한
+
+
+def test_pipeline_with_transit_backend(transit, tmp_path):
+    server, token_file = transit
+    src = tmp_path / "in.csv"
+    dst = tmp_path / "out.csv"
+    src.write_text("id,name\n" + "".join(f"{i:08d},n{i}\n" for i in range(500)) + ",blank\n")
+    factory = lambda: make_engine(server, token_file)  # noqa: E731 (workers=0: pickle 불필요)
+    stats = pseudonymize_file(src, dst, ["id"], factory, workers=0, chunk_rows=100, on_invalid="keep")
+    assert stats["rows"] == 501
+    lines = dst.read_text().splitlines()
+    assert lines[1].startswith("vault:v1:") and lines[1].endswith(",n0")
+    assert lines[-1] == ",blank"
+
+
+def test_transit_throughput(transit):
+    """20ms 지연 fake Vault: 값별 요청이면 ~50 values/s, 배치+동시 전송은 수천 values/s"""
+    server, token_file = transit
+    server.delay = 0.02
+    values = [f"{i:08d}" for i in range(20000)]
+    with make_engine(server, token_file) as engine:
+        started = time.perf_counter()
+        out = engine.encrypt_batch(values)
+        elapsed = time.perf_counter() - started
+    assert len(out) == len(values)
+    assert len(values) / elapsed > 2000
+    assert len(server.requests) < len(values) / 100